@@ -197,6 +197,7 @@ def run_code(
     if output=='dummy':
         class DummyOutputDriver(yex.output.Output):
             def __init__(self):
+                super().__init__(doc=doc, filename=None)
                 self.found = None
             def render(self):
                 self.found = doc.contents
@@ -722,13 +723,15 @@ def check_svg(
                 'svg',
                 'title',
                 'style',
-                'g',
+                'defs',
                 ]
 
         def __init__(self):
             self.tag_count = -1
             self.latest_rect = None
             self.result = []
+            self.symbols = set()
+            self.in_defs = True
 
         def startElement(self, tag, attributes):
             self.tag_count += 1
@@ -740,15 +743,28 @@ def check_svg(
             except IndexError:
                 pass
 
+            if self.in_defs:
+                if tag=='symbol':
+                    self.symbols.add(attributes['id'])
+                    return
+                elif tag=='image':
+                    return
+
+                assert tag=='g'
+                self.in_defs = False
+                return
+
             if tag=='rect':
                 if 'charbox' in attributes['class']:
                     assert self.latest_rect is None
                     self.latest_rect = attributes
-            elif tag=='image':
+            elif tag=='use':
                 assert self.latest_rect is not None
                 for name in ['width', 'height', 'x', 'y']:
                     assert self.latest_rect[name] == attributes[name]
 
+                assert attributes['xlink:href'][1:] in self.symbols
+
                 self.result.append(
                     on_char(attributes),
                     )
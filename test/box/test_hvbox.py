@@ -980,3 +980,52 @@ def test_size_of_empty_box():
         assert float(box.height)==0, box
         assert float(box.width)==0, box
         assert float(box.depth)==0, box
+
+def test_hvbox_dimensions_kept_up_to_date():
+
+    def box(n):
+        return yex.box.Box(width=n, height=n*2, depth=n*3)
+
+    hb = yex.box.HBox()
+    vb = yex.box.VBox()
+
+    for b in [hb, vb]:
+        b.append(box(10))
+        b.extend([box(30), box(20)])
+
+    assert (hb.width, hb.height, hb.depth)==(60, 60, 90)
+    assert (vb.width, vb.height, vb.depth)==(30, 20+30+60+90+40, 60)
+
+    for b in [hb, vb]:
+        b.insert(0, box(40))
+
+    assert (hb.width, hb.height, hb.depth)==(100, 80, 120)
+    assert (vb.width, vb.height, vb.depth)==(40,
+            80+120+20+30+60+90+40, 60)
+
+    for b in [hb, vb]:
+        b.pop()
+        b.remove(b.contents[0])
+
+    assert (hb.width, hb.height, hb.depth)==(40, 60, 90)
+    assert (vb.width, vb.height, vb.depth)==(30, 20+30+60, 90)
+
+    # Changing a child in place goes unnoticed until we invalidate.
+    child = hb.contents[0]
+    child.width = yex.value.Dimen(15, 'pt')
+    assert hb.width==40
+    hb.invalidate()
+    assert hb.width==45
+
+def test_hvbox_slice_dimensions():
+    hb = yex.box.HBox.from_contents(
+            contents=[
+                yex.box.Box(width=width, height=width, depth=1)
+                for width in [1, 2, 3, 4]
+                ],
+            )
+
+    assert hb.width==10
+    assert hb[1:3].width==5
+    assert hb[1:3].height==3
+    assert hb.width==10
@@ -133,3 +133,19 @@ def test_wordbox_remembers_ligature():
             if 'tenrm' in x]
 
     assert found==['a', '| (ligature ---)', 'b', r'\ (ligature ``)', 'c']
+
+def test_wordbox_lig_kern_table():
+    font = yex.font.Font.from_name(None)
+    lig_kern = font.metrics.lig_kern
+
+    assert len(lig_kern)==256
+
+    for pair, kern in font.metrics.kerns.items():
+        assert lig_kern[ord(pair[0])][ord(pair[1])]==(kern, None), pair
+
+    for pair, ligature in font.metrics.ligatures.items():
+        if pair in font.metrics.kerns:
+            continue
+        assert lig_kern[ord(pair[0])][ord(pair[1])]==(None, ligature), pair
+
+    assert lig_kern[ord('B')] is None
@@ -1,3 +1,4 @@
+import pytest
 from test import *
 import yex
 
@@ -11,3 +12,58 @@ def test_register_array_name_in_params():
             find='ch',
             )
     assert found=='177'
+
+def test_register_array_gives_out_the_same_register():
+    doc = yex.Document()
+
+    count = doc.controls[r'\count']
+
+    assert count.get_element(23) is count.get_element(23)
+    assert count.get_element(23) is not count.get_element(24)
+
+def test_register_array_packed():
+    doc = yex.Document()
+
+    run_code(
+            r'\count1=100 \advance\count1 by 23 '
+            r'\dimen2=3pt \advance\dimen2 by 1.5pt ',
+            doc=doc,
+            find='ch',
+            )
+
+    assert doc[r'\count1']==123
+    assert doc[r'\dimen2']==yex.value.Dimen(4.5, 'pt')
+
+    assert doc.controls[r'\count'].contents[1]==123
+    assert doc.controls[r'\dimen'].contents[2]==int(4.5*65536)
+
+    assert dict(doc.controls[r'\count'].items())=={
+            r'\count1': 123,
+            }
+
+    with pytest.raises(ValueError):
+        doc[r'\count1'] = 2**32
+
+def test_register_array_packed_indirect_index():
+    doc = yex.Document()
+    run_code(r'\count1=5 \count\count1=7', doc=doc, find='ch')
+    assert doc[r'\count5']==7
+
+    doc = yex.Document()
+    run_code(r'\countdef\c=1 \c=5 \advance\count\c by 3',
+            doc=doc, find='ch')
+    assert doc[r'\count1']==5
+    assert doc[r'\count5']==3
+
+    doc = yex.Document()
+    run_code(r'\count1=2 \dimen\count1=3pt', doc=doc, find='ch')
+    assert doc[r'\dimen2']==yex.value.Dimen(3, 'pt')
+
+def test_register_array_packed_in_group():
+    found = run_code(
+            r'\count1=10 '
+            r'{\count1=20 \advance\count1 by 5 \global\count2=\count1}'
+            r'\the\count1,\the\count2',
+            find='ch',
+            )
+    assert found=='10,25'
@@ -438,3 +438,24 @@ def test_conditional_compare_two_undefined():
             r'\ifx\wombat\spong1\else0\fi',
             find = 'ch',
             )=="1", 'Undefined values should compare equal'
+
+def test_conditional_skipping():
+    assert run_code(
+            (
+                r"\let\myfi=\fi "
+                r"a\iffalse \undefined b \relax\def\x{c}\myfi z"
+                ),
+            find = "chars") =='az'
+
+    doc = yex.Document()
+    unskippable = doc.controls.unskippable
+
+    assert r'\fi' in unskippable
+    assert r'\message' in unskippable
+    assert r'\relax' not in unskippable
+
+    run_code(r"\let\myfi=\fi", doc=doc)
+    assert r'\myfi' in unskippable
+
+    run_code(r"\def\myfi{}", doc=doc)
+    assert r'\myfi' not in unskippable
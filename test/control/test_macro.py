@@ -145,3 +145,47 @@ def test_macro_delimited_with_name_of_another():
                 ),
             find='ch',
             )=='such blessed peace and such blessed quiet'
+
+def test_macro_delimiter_partial_matches():
+
+    # These keep nearly matching the delimiter "abacab", so we need
+    # to fall back to the right place each time.
+    for text, expected in [
+            ('abaabacabqs', '(aba)[q]'),
+            ('xabacaabacabyqs', '(xabaca)[yq]'),
+            ]:
+        assert run_code(
+                r'\x '+text,
+                setup=(
+                    r'\def\x#1abacab#2s{(#1)[#2]}'
+                    ),
+                find='chars',
+                )==expected, text
+
+    # A group straight after part of the delimiter is argument text.
+    assert run_code(
+            r'\x ab{c}abcd',
+            setup=(
+                r'\def\x#1abc#2d{(#1)[#2]}'
+                ),
+            find='chars',
+            )=='(ab{c})[]'
+
+def test_macro_delimiter_fallback_table():
+    delimiter = yex.control.macro._Delimiter(list('abacab'))
+    assert delimiter.fallback == [0, 0, 1, 0, 1, 2]
+
+def test_macro_definition_shares_tokens():
+    doc = yex.Document()
+    run_code(r'\def\a{aXa}', doc=doc, find='ch')
+
+    macro = doc[r'\a']
+
+    # The tokens are the shared ones, which have no locations...
+    assert macro.definition[1] is yex.parse.Token.get(
+            'X', yex.parse.Token.LETTER)
+
+    # ...but the macro still knows where each one came from.
+    where = [yex.parse.Location.from_packed(n).column
+            for n in macro._locations]
+    assert where==[8, 9, 10]
@@ -7,6 +7,7 @@ import yex.control.keyword.parameter
 import pytest
 import os
 import pickle
+import io
 import pytest
 
 def test_document_simple_create():
@@ -101,11 +102,7 @@ def test_control_symbols():
         assert handler.horizontal, f"{name} is a valid horizontal control"
 
 def _normalise_value(v):
-
-    if hasattr(v, '__getstate__'):
-        return v.__getstate__()
-
-    return v
+    return yex.util.serialise(v)
 
 def test_document_serialisation_by_lookup():
 
@@ -153,6 +150,29 @@ def test_document_getstate():
 
     _serialisation_test(run)
 
+def test_document_getstate_only_visits_changes():
+
+    doc = yex.Document()
+    run_code(
+            r'\hsize=495pt \let\wombat=\hsize \parindent=3pt',
+            doc=doc,
+            )
+
+    assert doc.controls.get(r'\hsize', param_control=True).changed
+    assert not doc.controls.get(r'\vsize', param_control=True).changed
+    assert r'\wombat' in doc.controls.changed
+
+    found = doc.__getstate__(full=False)
+    del found['_created']
+
+    # \hsize was set, but to its initial value, so it doesn't appear.
+    assert found == {
+            '_format': 1,
+            '_full': False,
+            r'\parindent': {'control': 'parindent', 'value': 3*65536},
+            r'\wombat': {'control': 'hsize'},
+            }
+
 @pytest.mark.xfail
 def test_document_pickle():
 
@@ -187,6 +207,75 @@ def test_document_pickle():
 
     _serialisation_test(run)
 
+def test_document_format():
+
+    def run(
+            setup,
+            expected,
+            ):
+
+        original_doc = yex.Document()
+        run_code(setup,
+                mode='vertical',
+                doc=original_doc)
+
+        f = io.BytesIO()
+        original_doc.dump_format(f)
+        f.seek(0)
+
+        new_doc = yex.Document()
+        new_doc.load_format(f)
+
+        for f, v in expected.items():
+            found = _normalise_value(new_doc[f])
+
+            assert found==v, setup
+
+    _serialisation_test(run)
+
+    run(
+            setup = (
+                r'\catcode`\@=11 '
+                r'\chardef\wombat=65 '
+                r'\countdef\spong=23 \spong=177 '
+                r'\parindent=3pt '
+                r'\def\a{\b\c}'
+                ),
+            expected = {
+                r'\catcode64': 11,
+                r'\wombat': 'A',
+                r'\count23': 177,
+                r'\parindent': 3*65536,
+                r'\a': {
+                    'macro': 'a',
+                    'definition': [[r'\b'], [r'\c']],
+                    'starts_at': '<str>:1:89',
+                    },
+                },
+            )
+
+    with pytest.raises(ValueError):
+        yex.Document().load_format(io.BytesIO(b'wombat'))
+
+def test_document_dump(yex_test_fs):
+
+    doc = yex.Document()
+    run_code(
+            r'\def\wombat{spong}\dump\def\wombat{ignored}',
+            doc=doc,
+            )
+
+    new_doc = yex.Document()
+    with open('texput.fmt', 'rb') as f:
+        new_doc.load_format(f)
+
+    assert new_doc[r'\wombat'].__getstate__()['definition']=='spong'
+
+    with pytest.raises(yex.exception.DumpInsideGroupError):
+        run_code(r'{\dump}',
+                doc=yex.Document(),
+                )
+
 def _serialisation_test(run):
     run(
             setup = r'\count23=12',
@@ -266,3 +355,27 @@ def test_document_delitem():
 
     with pytest.raises(KeyError):
         del doc[NAME]
+
+def test_document_lookup():
+
+    doc = yex.Document()
+
+    assert doc.lookup(r'\foo') is None
+
+    doc.begin_group()
+    run_code(r'\def\foo{x}', doc=doc, mode='dummy', auto_save=False)
+    found = doc.lookup(r'\foo')
+    assert isinstance(found, yex.control.Macro)
+    assert doc.lookup(r'\foo') is found
+
+    doc.end_group()
+    assert doc.lookup(r'\foo') is None
+
+    relax = doc.lookup(r'\relax')
+    doc[r'\foo'] = relax
+    assert doc.lookup(r'\foo') is relax
+
+    del doc[r'\foo']
+    assert doc.lookup(r'\foo') is None
+
+    assert doc.lookup(r'\count23').value==0
@@ -59,10 +59,13 @@ def html_driver():
 
 def test_output_html_init(html_driver):
     h = html_driver()
+    h.render()
 
-    # h.result is BeautifulSoup
+    with open(h.filename, 'r') as f:
+        results = BeautifulSoup(f.read(), features='lxml')
 
-    assert h.result.find('title').string=='Yex output'
+    assert results.find('title').string=='Yex output'
+    assert results.find('main') is not None
 
 def test_output_html_can_handle():
     assert yex.output.html.Html.can_handle('html')
@@ -73,8 +76,10 @@ def test_output_html_render(html_driver):
 
     STRING = "Where have all the flowers gone?"
 
+    # run_code() saves the document, which renders it
     h = html_driver(STRING)
 
+    # Rendering again mustn't replace what was written
     h.render()
 
     with open(h.filename, 'r') as f:
@@ -89,6 +94,10 @@ def test_output_html_render(html_driver):
             'Where', 'have', 'all', 'the', '\nowers', 'gone?',
             ]
 
+    # The styles come after the pages, because only then do we know
+    # which classes were used.
+    assert results.find('style', string=lambda s: 'br.b0' in s) is not None
+
 def make_example_lines(
         para_indent,
         first_line_spacing,
@@ -30,3 +30,49 @@ def test_get_driver_for():
     with pytest.raises(yex.exception.YexError):
         run(filename='wombat.html', format='this-is-a-silly-format',
                 expected=None)
+
+def test_output_pages_arrive_as_they_are_finished():
+
+    class Recorder(yex.output.Output):
+        def __init__(self, doc):
+            super().__init__(doc=doc, filename=None)
+            self.calls = []
+
+        def begin(self):
+            self.calls.append('begin')
+
+        def page(self, page):
+            self.calls.append(
+                    ''.join([box.ch for box in page
+                        if isinstance(box, yex.box.HBox)]))
+
+        def end(self):
+            self.calls.append('end')
+
+    doc = yex.Document()
+
+    def line(s):
+        wordbox = yex.box.WordBox(doc['_font'])
+        for c in s:
+            wordbox.append(c)
+        return yex.box.HBox.from_contents([wordbox])
+
+    def new_page():
+        return yex.box.Penalty(-10000)
+
+    # A page finished before there's an output driver waits for one.
+    doc.shipout([line('a'), new_page()])
+    assert len(doc.contents)==1
+
+    recorder = Recorder(doc)
+    doc['_output'] = recorder
+    doc.shipout([line('b'), new_page()])
+
+    assert recorder.calls==['begin', 'a', 'b']
+    assert doc.contents==[]
+
+    doc.shipout(line('c'))
+    assert recorder.calls==['begin', 'a', 'b']
+
+    doc.save()
+    assert recorder.calls==['begin', 'a', 'b', 'c', 'end']
@@ -0,0 +1,23 @@
+import yex
+from test import *
+
+def test_output_svg_shares_glyphs(yex_test_fs):
+
+    FILENAME = 'wombat.svg'
+
+    doc = yex.Document()
+    run_code(r'\shipout\hbox{banana}',
+            output = yex.output.Output.driver_for(doc, FILENAME),
+            doc = doc,
+            )
+    doc.save()
+
+    assert ''.join(check_svg(FILENAME))=='banana'
+
+    with open(FILENAME, 'r') as f:
+        svg = f.read()
+
+    # one <symbol> each for "b", "a", and "n"
+    assert svg.count('<symbol ')==3
+    assert svg.count('<use ')==6
+    assert svg.count('data:image/png')==3
@@ -395,20 +395,19 @@ def test_expansion_with_control_at_start_of_params():
                 find='chars',
             )==r"wombat 9"
 
-def test_call_stack():
-    STRING = (
-            # 123456789012345
-            r"\def\a{aXa}" "\r"        # 1
-            r"" "\r"                   # 2
-            r"\def\b#1{b\a b}" "\r"    # 3
-            r"" "\r"                   # 4
-            r"\def\c{c\b1 c}" "\r"     # 5
-            r"" "\r"                   # 6
-            r"\c"                      # 7
-            )
+CALL_STACK_STRING = (
+        # 123456789012345
+        r"\def\a{aXa}" "\r"        # 1
+        r"" "\r"                   # 2
+        r"\def\b#1{b\a b}" "\r"    # 3
+        r"" "\r"                   # 4
+        r"\def\c{c\b1 c}" "\r"     # 5
+        r"" "\r"                   # 6
+        r"\c"                      # 7
+        )
 
-    doc = Document()
-    e = doc.open(STRING, on_eof='exhaust')
+def _run_to_X(doc):
+    e = doc.open(CALL_STACK_STRING, on_eof='exhaust')
     for t in e:
         try:
             if t.ch=='X':
@@ -416,6 +415,14 @@ def test_call_stack():
         except AttributeError:
             continue
 
+    return e
+
+def test_call_stack():
+
+    doc = Document()
+    doc[r'\tracingmacros'] = 1
+    e = _run_to_X(doc)
+
     assert e.location.line==1
     assert e.location.column==9
 
@@ -446,6 +453,31 @@ File "<str>", line 7, in bare code:
 Error: Hello
 """.lstrip()
 
+def test_call_stack_without_tracing():
+
+    doc = Document()
+    e = _run_to_X(doc)
+
+    # Without \tracingmacros, we don't keep the arguments,
+    # but everything else is the same.
+    found = [(x.callee, x.args,
+        x.location.line, x.location.column) for x in doc.call_stack]
+
+    assert found==[
+            ('c', None, 7, 3),
+            ('b', None, 5, 11),
+            ('a', None, 3, 13),
+            ]
+
+    assert doc.call_stack[-1].callee=='a'
+    with pytest.raises(IndexError):
+        doc.call_stack[3]
+
+    for t in e:
+        pass
+
+    assert len(doc.call_stack)==0
+
 def test_expander_delegate_simple():
 
     doc = Document()
@@ -511,6 +543,27 @@ def test_expander_with_doc_specified():
     exp1a = exp2.another(level='deep', doc=doc1)
     assert exp1a.doc == doc1
 
+def test_expander_another_reuses_variants():
+    doc = Document()
+    e = doc.open('ABC', on_eof='none')
+
+    assert e.another() is e
+    assert e.another(on_eof='none') is e
+
+    deep = e.another(level='deep')
+    assert deep is not e
+    assert deep.level==yex.parse.RunLevel.DEEP
+    assert e.another(level='deep') is deep, 'unbounded variants are reused'
+
+    bounded = e.another(level='deep', bounded='single', on_eof='exhaust')
+    assert bounded is not deep
+    assert e.another(level='deep', bounded='single',
+            on_eof='exhaust') is not bounded, 'bounded ones are not'
+
+    deep.delegate = doc.open('PQR', on_eof='exhaust')
+    assert e.another(level='deep') is not deep, (
+            'variants with delegates are not reused')
+
 def test_expander_with_source():
     doc = Document()
     e1 = yex.parse.Expander(source='apples', doc=doc, on_eof='exhaust')
@@ -685,6 +738,26 @@ def test_expander_invalid_char(caplog):
     assert len(caplog.record_tuples)==1
     assert caplog.record_tuples[0][2] == "Invalid character found: '*'"
 
+def test_expander_tracing_checked_on_creation(caplog):
+
+    def traced_lines(doc):
+        caplog.clear()
+        e = yex.parse.Expander('abc', doc=doc, on_eof='exhaust',
+                level='reading')
+        caplog.set_level(logging.DEBUG, logger='yex.general')
+        assert ''.join(str(t) for t in e).strip()=='abc'
+        return len(caplog.records)
+
+    doc = Document()
+
+    caplog.set_level(logging.INFO, logger='yex.general')
+    quiet = traced_lines(doc)
+
+    caplog.set_level(logging.DEBUG, logger='yex.general')
+    loud = traced_lines(doc)
+
+    assert loud > quiet
+
 def test_expander_if_in_number():
     with pytest.raises(ValueError):
         run_code(
@@ -43,3 +43,21 @@ def test_location_read_only():
 
     with pytest.raises(AttributeError):
         something.column = 1
+
+def test_location_packed():
+
+    something = make_location()
+
+    packed = yex.parse.Location.pack(
+            yex.parse.Location.filename_id(something.filename),
+            something.line,
+            something.column,
+            )
+
+    assert isinstance(packed, int)
+    assert yex.parse.Location.from_packed(packed)==something
+
+    assert yex.parse.Location.filename_id('banana.tex')==\
+            yex.parse.Location.filename_id('banana.tex')
+    assert yex.parse.Location.filename_id('banana.tex')!=\
+            yex.parse.Location.filename_id('apple.tex')
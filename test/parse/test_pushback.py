@@ -120,3 +120,26 @@ def test_pushback_clear():
     pb.push('wil')
     drain(pb, expected=['w', 'i', 'l'],
             why='clear() empties the pushback')
+
+def test_pushback_push_segment():
+    pb = make_pushback()
+
+    segment = yex.parse.Segment([
+        yex.parse.BeginningGroup('{'),
+        yex.parse.Letter('a'),
+        yex.parse.BeginningGroup('{'),
+        ])
+    assert segment.group_delta==2
+
+    pb.push(segment)
+    assert pb.group_depth==-2
+
+    pb.push('b')
+    drain(pb, expected=['b'] + segment.items,
+            why='segments are read through in order')
+
+    pb.push(segment)
+    pb.push(segment)
+    assert pb.group_depth==-6
+    drain(pb, expected=segment.items*2,
+            why='the same segment can be pushed twice')
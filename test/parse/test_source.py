@@ -68,6 +68,8 @@ def test_source_location(fs):
             assert source.location.filename==name, line_name
             assert source.location.line==line, line_name
             assert source.location.column==column, line_name
+            assert yex.parse.Location.from_packed(
+                    source.packed_location)==source.location, line_name
 
             assert str(source)=='[%s;%s;l=%d;c=%d]' % (
                     flavour, name, line, column,), line_name
@@ -199,3 +201,26 @@ def test_source_listsource_can_take_tuples():
     for arg in [LIST, TUPLE]:
         source = yex.parse.source.ListSource(arg)
         assert _swallow(source, interstitial='/')==EXPECTED, type(arg)
+
+def test_source_recent_lines():
+    lines = yex.parse.source.RecentLines(size=3)
+
+    for i in range(10):
+        lines.append(f'line {i}')
+
+    assert len(lines)==10
+    assert lines[9]=='line 9'
+    assert lines[7]=='line 7'
+    assert lines[-1]=='line 9'
+
+    for number in [0, 6, 10]:
+        with pytest.raises(IndexError):
+            lines[number]
+
+def test_source_forgets_old_lines():
+    source = yex.parse.source.StringSource(
+            '\n'.join(['x']*(yex.parse.source.LINE_WINDOW*2)))
+
+    _swallow(source)
+
+    assert len(source.lines._lines)==yex.parse.source.LINE_WINDOW
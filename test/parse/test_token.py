@@ -16,6 +16,18 @@ def test_token_location():
     assert t is not None
     assert t.location==('foo', 1, 2)
 
+def test_token_interned():
+    t = Token.get('q', Token.LETTER)
+    assert t is Token.get('q', Token.LETTER)
+    assert t is not Token.get('q', Token.OTHER)
+    assert t.location is None
+
+    located = Token.get('q', Token.LETTER, location=('foo', 1, 2))
+    assert located is not t
+    assert located==t
+
+    assert not hasattr(t, '__dict__')
+
 def test_token_cats():
 
     somewhere = yex.parse.Location(
@@ -403,6 +403,34 @@ four""",
                         'EOL causes the rest of the line to be ignored'
                         )
 
+def test_tokeniser_catcode_changes_mid_line():
+
+    assert run_code(
+            find = 'ch',
+            call = r"ab\catcode`b=14 ab this is a comment" "\n" "cd",
+            )=='abacd'
+
+    doc = yex.document.Document()
+    t = Tokeniser(doc=doc, source='abab')
+
+    found = []
+    for item in t:
+        if item is None:
+            break
+
+        found.append((item.ch, item.category))
+
+        if len(found)==2:
+            doc[r'\catcode98'] = 12 # "b" is now "other"
+
+    assert found == [
+            ('a', 11),
+            ('b', 11),
+            ('a', 11),
+            ('b', 12),
+            (' ', 10),
+            ]
+
 def test_tokeniser_group_depth():
 
     S = [
@@ -4,6 +4,7 @@ import pytest
 import io
 import os
 import unittest.mock
+import importlib.resources
 import logging
 
 logger = logging.getLogger('yex.general')
@@ -119,6 +120,102 @@ def test_font_glyph_image(yex_test_fs):
 
             assert found==expected, f"{x}, {y}"
 
+def test_font_glyph_bitmap():
+    # A character whose raster is a plain bitmap (dyn_f=14) rather
+    # than run-length encoded. Rows aren't padded to whole bytes.
+    packet = bytes([
+        0xE0, # flags: dyn_f=14, short format
+        10, # packet length
+        ord('x'), # character code
+        0, 0, 0, # TFM width
+        3, # dm
+        3, 3, # width, height
+        0, 0, # offsets
+        0b10101010, 0b10000000, # raster
+        ])
+
+    ch = yex.font.pk.Char(yex.font.pk._Source(io.BytesIO(packet)))
+
+    assert ch.charcode==ord('x')
+    assert ch.ascii_art()==[
+            'X.X',
+            '.X.',
+            'X.X',
+            ]
+
+def test_font_metrics_are_shared(fs):
+
+    calls = []
+
+    def parser(f):
+        calls.append(getattr(f, 'name', None))
+        return f.read()
+
+    fs.create_file('/wombat.tfm', contents=b'spong')
+
+    with open('/wombat.tfm', 'rb') as f:
+        first = yex.font.font.parse_once(f, parser)
+
+    with open('/wombat.tfm', 'rb') as f:
+        second = yex.font.font.parse_once(f, parser)
+
+    assert first==second==b'spong'
+    assert calls==['/wombat.tfm']
+
+    # If the file changes, we parse it again.
+    os.utime('/wombat.tfm', ns=(0, 0))
+    with open('/wombat.tfm', 'rb') as f:
+        yex.font.font.parse_once(f, parser)
+
+    assert calls==['/wombat.tfm']*2
+
+    # Files without names are parsed every time.
+    yex.font.font.parse_once(io.BytesIO(b'spong'), parser)
+    yex.font.font.parse_once(io.BytesIO(b'spong'), parser)
+
+    assert len(calls)==4
+
+def test_font_bundle():
+
+    cmr10 = str(importlib.resources.files(yex) / "res" / "fonts" / "cmr10.tfm")
+
+    with open(cmr10, 'rb') as f:
+        parsed = yex.font.tfm.Metrics(f)
+
+    b = io.BytesIO()
+    assert yex.font.bundle.write([cmr10], b)==1
+
+    bundle = yex.font.bundle.Bundle(b.getvalue())
+    assert 'cmr10.tfm' in bundle
+    assert 'cmr12.tfm' not in bundle
+
+    bundled = bundle.metrics('cmr10.tfm')
+    assert bundle.metrics('cmr10.tfm') is bundled
+
+    for field in [
+            'first_char', 'last_char', 'param_count', 'checksum',
+            'design_size', 'character_coding_scheme', 'font_identifier',
+            'seven_bit_safe', 'parc_face_byte',
+            'width_table', 'height_table', 'depth_table',
+            'italic_correction_table', 'kern_table',
+            'kerns', 'ligatures', 'dimens',
+            ]:
+        assert getattr(bundled, field)==getattr(parsed, field), field
+
+    for code, metric in parsed.char_table.items():
+        found = bundled.get_character(code)
+        assert found.word==metric.word
+        assert found.width==metric.width
+
+    with pytest.raises(ValueError):
+        yex.font.bundle.Bundle(b'wombat' + bytes(20))
+
+def test_font_from_name_uses_bundle():
+    font = yex.font.Font.from_name('cmr10')
+    assert font.name == 'cmr10'
+    assert isinstance(font.metrics, yex.font.bundle.BundledMetrics)
+    assert font['A'].metrics.width == yex.value.Dimen(491521, 'sp')
+
 def test_font_identifier(yex_test_fs):
 
     cmr10 = yex.font.Font.from_name('cmr10')
@@ -176,21 +273,23 @@ def test_font_from_name_resolve(fs,
                 return cls(active=is_active)
 
             return factory
-        def __truediv__(self, _):
-            return self
-        def iterdir(self):
-            class FakeFile:
-                name = 'wombat.tfm'
+        class FakeFile:
+            name = 'wombat.tfm'
 
-                def open(self, _):
-                    logger.debug("our debugging fake font was found "
-                            "in the resources")
-                    raise FoundSomething('resources')
+            def open(self, _):
+                logger.debug("our debugging fake font was found "
+                        "in the resources")
+                raise FoundSomething('resources')
 
+        def __truediv__(self, name):
+            if name==self.FakeFile.name:
+                return self.FakeFile()
+            return self
+        def iterdir(self):
             if self.active:
                 logger.debug("fake resource: active; returning font")
                 return [
-                        FakeFile(),
+                        self.FakeFile(),
                         ]
             else:
                 logger.debug("fake resource: inactive; returning nothing")
@@ -234,11 +333,17 @@ def test_font_from_name_resolve(fs,
         logger.debug("%s: here we go!", which)
         found = None
         try:
+            # The list of fonts in the resources is cached, so make sure
+            # it's built from our fake resources.
+            yex.font.font._resource_fonts.cache_clear()
+
             with unittest.mock.patch('importlib.resources.files',
                     FakeImportlibResourcesFiles.create_factory(
                         is_active = 'resources' in which)):
 
-                with unittest.mock.patch('yex.font.tfm.Tfm', FakeTfm):
+                with unittest.mock.patch('yex.font.tfm.Tfm', FakeTfm), \
+                        unittest.mock.patch('yex.font.bundle.get_bundle',
+                                lambda: None):
                     font = yex.font.Font.from_name('wombat')
         except FoundSomething as e:
             found = e.what
@@ -248,6 +353,8 @@ def test_font_from_name_resolve(fs,
                     break
         except ValueError:
             found = 'nil'
+        finally:
+            yex.font.font._resource_fonts.cache_clear()
 
         logger.debug("%s: found: %s; expected: %s",
                 which, found, expected)
@@ -416,3 +416,15 @@ def test_dimen_is_immutable():
     assert d.value==5*65536
     with pytest.raises(AttributeError):
         d.value=1234
+
+def test_dimen_from_sp():
+    d = Dimen.from_sp(65536*3)
+    assert d==Dimen(3, 'pt')
+    assert d.infinity==0
+    assert d.unit_cls==Dimen
+
+    fil = Dimen.from_sp(65536*2, infinity=2)
+    assert fil==Dimen(2, 'fill', can_use_fil=True)
+
+    assert Dimen(123, 'sp').value==123
+    assert Dimen(0).value==0
@@ -185,3 +185,21 @@ def test_glue_actual_value():
     found = yex.value.Glue.from_tokens(e)
 
     assert found.space==yex.value.Dimen(123, 'pt')
+
+def test_glue_from_sp():
+    glue = Glue.from_sp(
+            space = 65536*10,
+            stretch = 65536*2, stretch_infinity = 1,
+            shrink = 65536,
+            )
+
+    assert glue==Glue(space=10, space_unit='pt',
+            stretch=2, stretch_unit='fil',
+            shrink=1, shrink_unit='pt',
+            )
+    assert glue.sp==(65536*10, 65536*2, 1, 65536, 0)
+    assert glue.space==Dimen(10, 'pt')
+    assert glue.stretch==Dimen(2, 'fil', can_use_fil=True)
+    assert glue.space is glue.space
+
+    assert Glue.from_another(glue).sp==glue.sp
@@ -58,6 +58,44 @@ def test_badness_p97():
     # all overfull boxes have a badness of one million
     badness_from_fit_to(0, boxes, 1000000)
 
+def test_subsequence_cache_is_overfull():
+
+    def boxes(shrink, shrink_unit='pt'):
+        return [
+            yex.box.Breakpoint(),
+            yex.box.Box(width=1, height=1, depth=0),
+            yex.box.Leader(space=10,
+                stretch=0,
+                shrink=shrink,
+                shrink_unit=shrink_unit,
+                ),
+            yex.box.Box(width=1, height=1, depth=0),
+            yex.box.Breakpoint(),
+            ]
+
+    subsequences = yex.wrap.wrapping.Subsequence_Cache(
+            items = boxes(shrink=10))
+
+    for width_pt, expected in [
+            (12, False),
+            (3, False),
+            (2, False),
+            (1, True),
+            (0, True),
+            ]:
+        found = subsequences.is_overfull(0, 4, width=Dimen(width_pt))
+        assert found==expected, f'{width_pt}pt'
+
+        if found:
+            assert subsequences.lookup(0, 4,
+                    width=Dimen(width_pt)).badness==1000000
+
+    # Infinite shrink can always fit.
+    subsequences = yex.wrap.wrapping.Subsequence_Cache(
+            items = boxes(shrink=1, shrink_unit='fil'))
+
+    assert not subsequences.is_overfull(0, 4, width=Dimen(0))
+
 def test_glue_p69():
 
     def nice_box(
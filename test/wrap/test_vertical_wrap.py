@@ -179,3 +179,53 @@ def test_wrap_with_width_of_inherit():
     run_code(
             r"\vbox{\hbox{a}\hrule height-10sp\hbox{b}}",
             find='ch')
+
+def test_page_badness():
+    from yex.wrap.paragraphs import badness
+
+    assert badness(0, 0)==0
+    assert badness(1, 0)==10000
+    assert badness(65536, 65536)==100
+    assert badness(65536, 131072)==12
+    assert badness(65536*5, 65536)==10000
+
+def test_page_running_totals():
+
+    doc = yex.Document()
+    fl = FakeLogControl()
+
+    doc.controls |= {
+            r'\tracingpages': fl,
+            }
+    fl.value = 1
+
+    doc[r'\vsize'] = yex.value.Dimen(100, 'pt')
+    doc[r'\maxdepth'] = yex.value.Dimen(4, 'pt')
+    doc[r'\topskip'] = yex.value.Glue(space=10, space_unit='pt')
+
+    pages = []
+    paragraphs = yex.wrap.Paragraphs(doc, produce_page=pages.append)
+
+    def pt(n):
+        return yex.value.Dimen(n, 'pt')
+
+    for item in [
+            yex.box.Box(height=pt(6), depth=pt(2)),
+            yex.box.Leader(space=pt(5), stretch=pt(3), vertical=True),
+            yex.box.Box(height=pt(20), depth=pt(6)),
+            yex.box.Penalty(0),
+            yex.box.Leader(space=pt(60), stretch=1, stretch_unit='fil',
+                shrink=pt(2), vertical=True),
+            yex.box.Penalty(-10000),
+            ]:
+        paragraphs.add(item)
+
+    assert fl.received[1:]==[
+            '% t=10.0 g=100.0 b=10000 p=0 c=100000#',
+            '% t=37.0 plus 3.0 g=100.0 b=10000 p=0 c=100000',
+            '% t=101.0 plus 3.0 plus 1.0fil minus 2.0 g=100.0 b=12 p=0 c=12#',
+            ('% t=101.0 plus 3.0 plus 1.0fil minus 2.0 g=100.0 b=12 '
+                'p=-10000 c=-10000#'),
+            '% t=10.0 g=100.0 b=10000 p=0 c=100000#',
+            ]
+    assert len(pages)==1
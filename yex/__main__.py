@@ -34,6 +34,9 @@ def main():
             help='directory with fonts in')
     parser.add_argument('--output', '-o',
             help='output filename')
+    parser.add_argument('--format', '-F',
+            default=None,
+            help=r'format file to load first, as written by \dump')
 
 
     debugging_group = parser.add_argument_group(
@@ -78,8 +81,21 @@ def _parse_output_filename(source, output):
     return output_format, output_filename
 
 def run():
+    # Set up logging before anything else: the tokeniser and expander
+    # check the logging level when they're created, and won't trace
+    # if it wasn't DEBUG at the time.
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+    if args.verbose>1:
+        logger.setLevel(logging.DEBUG)
+    elif args.verbose>0:
+        logger.setLevel(logging.INFO)
+
     s = yex.Document()
 
+    if args.format:
+        with open(args.format, 'rb') as f:
+            s.load_format(f)
+
     if args.logfile:
         s.controls[r'\tracingonline'].logging_filename = args.logfile
         s.controls[r'\tracingonline'] = 0
@@ -91,12 +107,6 @@ def run():
 
     s['_font'].fonts_dir = args.fonts_dir
 
-    logger.addHandler(logging.StreamHandler(sys.stdout))
-    if args.verbose>1:
-        logger.setLevel(logging.DEBUG)
-    elif args.verbose>0:
-        logger.setLevel(logging.INFO)
-
     try:
         with open(args.source, 'r') as f:
             result = yex(f,
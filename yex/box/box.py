@@ -124,6 +124,13 @@ class Box(Gismo):
 
         return result
 
+    def __copy__(self):
+        # We must say this explicitly, because otherwise copy.copy()
+        # would use __getstate__(), which is for serialisation.
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        return result
+
     def _showbox_one_line(self):
         return '\\'+self.__class__.__name__.lower()
 
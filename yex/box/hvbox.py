@@ -12,6 +12,18 @@ LOOSE = 1
 DECENT = 2
 TIGHT = 3
 
+# Indexes into HVBox._sizes.
+WIDTH = 0
+HEIGHT = 1
+DEPTH = 2
+
+def _sp(d):
+    # Lengths of "inherit" (as on rules) take up no room.
+    if isinstance(d, yex.value.Dimen):
+        return d.value
+    else:
+        return 0
+
 class HVBox(Box):
     """
     A Box which contains some number of Gismos, in some order.
@@ -33,6 +45,13 @@ class HVBox(Box):
         LOOSE: for lines with too much space between the words
         DECENT: for lines with sensible amounts of space between the words
         TIGHT: for lines with too little space between the words
+
+    The width, height, and depth are kept up to date as items are
+    added and removed through the methods here, so looking at them
+    doesn't involve looking at the contents. If you change
+    the contents some other way, or change the size of something
+    which is already inside the box, call `invalidate()`; the
+    dimensions will be worked out again next time someone asks.
     """
 
     def __init__(self, *args,
@@ -44,12 +63,21 @@ class HVBox(Box):
         if args:
             raise yex.exception.ConstructorError()
 
+        # The width, height, and depth, in sp, as ints.
+        self._sizes = [0, 0, 0]
+        # The width, height, and depth as Dimens, made when needed.
+        self._dimens = [None, None, None]
+        self._stale = False
+
         super().__init__(
                 height = height,
                 width = width,
                 depth = depth,
                 )
 
+        # Where the sizes start from, before we add any contents.
+        self._initial_sizes = tuple(self._sizes)
+
         self.to = require_dimen(to)
         self.spread = require_dimen(spread)
         self.shifted_by = yex.value.Dimen(0)
@@ -60,63 +88,152 @@ class HVBox(Box):
         self.glue_set = glue_set
         self._ch_cache = None
 
-    def _length_in_dominant_direction(self):
+    def _get_dimen(self, which):
+        if self._stale:
+            self._recalculate()
+
+        result = self._dimens[which]
+
+        if result is None:
+            result = yex.value.Dimen.from_sp(self._sizes[which])
+            self._dimens[which] = result
+
+        return result
+
+    def _set_dimen(self, which, value):
+        if self._stale:
+            self._recalculate()
+
+        value = require_dimen(value)
+        self._sizes[which] = _sp(value)
+        self._dimens[which] = value
+
+    @property
+    def width(self):
+        return self._get_dimen(WIDTH)
+
+    @width.setter
+    def width(self, value):
+        self._set_dimen(WIDTH, value)
+
+    @property
+    def height(self):
+        return self._get_dimen(HEIGHT)
+
+    @height.setter
+    def height(self, value):
+        self._set_dimen(HEIGHT, value)
+
+    @property
+    def depth(self):
+        return self._get_dimen(DEPTH)
+
+    @depth.setter
+    def depth(self, value):
+        self._set_dimen(DEPTH, value)
+
+    def invalidate(self):
         """
-        Width for a horizontal box, or full height for a vertical box.
+        Marks our dimensions as needing to be worked out again.
+
+        Call this if you change our contents without going through
+        our own methods, or change the size of something inside us.
+        If we're inside another box, you'll need to invalidate that too.
         """
+        self._stale = True
+        self._ch_cache = None
 
-        lengths = [
-            self.dominant_accessor(n)
-            for n in
-            self.contents
-            ]
+    def _recalculate(self):
+        # Make new lists rather than changing the old ones, which
+        # may be shared with a copy of this box.
+        self._sizes = list(self._initial_sizes)
+        self._dimens = [None, None, None]
+        self._stale = False
 
-        result = sum(lengths, start=yex.value.Dimen())
+        for item in self.contents:
+            self._adjust_dimens_for_item(item)
 
-        logger.debug(
-                '%s: lengths in dominant direction (sum=%s): %s',
-                self, result, lengths)
+    def _adjust_dimens_for_item(self, item):
+        """
+        Updates our dimensions for an item added at the end of our contents.
 
-        return result
+        The item should already be in our contents.
+        """
+        raise NotImplementedError()
 
-    def _length_in_non_dominant_direction(self, c_accessor,
-            shifting_polarity):
+    def append(self, item):
         """
-        Full height for a horizontal box, or width for a vertical box.
+        Adds an item to the end of this box.
 
         Args:
-            c_accessor: function which takes a Gismo and returns
-                the length of that Gismo.
+            item (`Gismo`): the item to add.
+        """
+        self.contents.append(item)
+        self._ch_cache = None
 
-                This is needed because the full height of any box
-                is composed of a height and a depth. So, when we're working
-                out the full height of a VBox, we have to look both up
-                for each of its children.
+        if not self._stale:
+            self._adjust_dimens_for_item(item)
 
-                It isn't needed with _length_in_dominant_direction(),
-                because the full width of an HBox is visible with only
-                one accessor.
+    def extend(self, items):
+        """
+        Adds some items to the end of this box.
 
-            shifting_polarity (int): -1 if `child.shifted_by` decreases
-                the result, 0 if it makes no difference, and 1 if it increases.
+        Args:
+            items (list of `Gismo`): the items to add.
         """
+        for item in items:
+            self.append(item)
 
-        lengths = [
-            c_accessor(n) + n.shifted_by*shifting_polarity
-            for n in
-            self.contents
-            ]
+    def insert(self, where, item):
+        """
+        Inserts an item into this box.
 
-        result = max(lengths, default=yex.value.Dimen())
+        Args:
+            where (int or None): the index to insert before, as for
+                `list.insert`. If this is None, the item goes at the end.
+            item (`Gismo`): the item to add.
+        """
+        if where is None or where>=len(self.contents):
+            HVBox.append(self, item)
+            return
 
-        logger.debug(
-                '%s: lengths in non-dominant direction (max=%s): %s',
-                self, result, lengths)
+        self.contents.insert(where, item)
+        self.invalidate()
 
+    def pop(self, where=-1):
+        """
+        Removes an item from this box, and returns it.
+
+        Args:
+            where (int): the index of the item, as for `list.pop`.
+
+        Returns:
+            the item.
+        """
+        result = self.contents.pop(where)
+        self.invalidate()
         return result
 
-    def _adjust_dimens_for_item(self, item):
-        raise NotImplementedError()
+    def remove(self, item):
+        """
+        Removes an item from this box.
+
+        Args:
+            item (`Gismo`): the item.
+
+        Raises:
+            `ValueError`: if the item isn't in this box.
+        """
+        self.contents.remove(item)
+        self.invalidate()
+
+    def __getitem__(self, n):
+        result = super().__getitem__(n)
+
+        if isinstance(n, slice):
+            result.invalidate()
+
+        return result
 
     def _showbox_one_line(self,
             name=None):
@@ -241,6 +358,7 @@ class HVBox(Box):
         result.contents = contents
         for item in contents:
             result._adjust_dimens_for_item(item)
+        result._ch_cache = None
 
         logger.debug(
                 '%s: created with contents=%s and width=%s (%ssp)',
@@ -259,21 +377,19 @@ class HBox(HVBox):
     """
 
     inside_mode = 'Restricted_Horizontal'
-    dominant_accessor = lambda self, c: c.width
 
     def _offset_fn(self, c):
         return c.width
 
     def _adjust_dimens_for_item(self, item):
-        self.width += item.width
-        self.height = max(
-                self.height,
-                item.height - item.shifted_by,
-                )
-        self.depth = max(
-                self.depth,
-                item.depth + item.shifted_by,
-                )
+        sizes = self._sizes
+        shifted_by = item.shifted_by.value
+
+        sizes[WIDTH] += _sp(item.width)
+        sizes[HEIGHT] = max(sizes[HEIGHT], _sp(item.height) - shifted_by)
+        sizes[DEPTH] = max(sizes[DEPTH], _sp(item.depth) + shifted_by)
+
+        self._dimens = [None, None, None]
 
     @property
     def demerits(self):
@@ -324,23 +440,22 @@ class VBox(HVBox):
     """
 
     inside_mode = 'Internal_Vertical'
-    dominant_accessor = lambda self, c: c.height+c.depth
 
     def _offset_fn(self, c):
         return yex.value.Dimen(), c.height+c.depth
 
     def _adjust_dimens_for_item(self, item):
+        sizes = self._sizes
 
-        if item.width!='inherit':
-            self.width = max(
-                    self.width,
-                    item.width,
-                    )
+        width = item.width
+        if isinstance(width, yex.value.Dimen):
+            sizes[WIDTH] = max(sizes[WIDTH], width.value)
 
-        self.height += self.depth # i.e. of the previous item
-        self.height += item.height
+        # The depth of the previous item becomes part of our height.
+        sizes[HEIGHT] += sizes[DEPTH] + _sp(item.height)
+        sizes[DEPTH] = _sp(item.depth)
 
-        self.depth = item.depth
+        self._dimens = [None, None, None]
 
     def insert(self, where, thing):
 
@@ -349,7 +464,10 @@ class VBox(HVBox):
                 raise yex.exception.BoxMergingError()
 
             self.contents.extend(thing.contents)
-            self._adjust_dimens_for_item(thing)
+            self._ch_cache = None
+
+            if not self._stale:
+                self._adjust_dimens_for_item(thing)
 
             logger.debug(
                 '%s: extended our contents by %s; now: %s',
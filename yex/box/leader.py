@@ -61,11 +61,6 @@ class Leader(Gismo):
         else:
             raise TypeError(glue)
 
-        for name in [
-                'space', 'stretch', 'shrink',
-                ]:
-            setattr(self, name, getattr(self.glue, name))
-
     @classmethod
     def from_another(cls, another):
         result = cls.__new__(cls)
@@ -83,6 +78,18 @@ class Leader(Gismo):
     def contents(self):
         return []
 
+    @property
+    def space(self):
+        return self.glue.space
+
+    @property
+    def stretch(self):
+        return self.glue.stretch
+
+    @property
+    def shrink(self):
+        return self.glue.shrink
+
     @property
     def width(self):
         if self.vertical:
@@ -34,6 +34,12 @@ class WordBox(HBox):
         self.font = font
         self.source_index = None
 
+        # The sizes we had before the last character was
+        # appended, so that we can go back to them if that character
+        # turns into part of a ligature. The first item is the index
+        # of that character in self.contents.
+        self._before_last = None
+
     def append(self, ch):
         if not isinstance(ch, str):
             raise TypeError(
@@ -49,8 +55,6 @@ class WordBox(HBox):
                 font = self.font,
                 )
 
-        font_metrics = self.font.metrics
-
         previous = None
         try:
             previous = self.contents[-1].ch
@@ -59,53 +63,56 @@ class WordBox(HBox):
         except AttributeError as e:
             pass
 
-        if previous is not None:
-            pair = previous + ch
+        kern_size = ligature = None
 
-            kern_size = font_metrics.kerns.get(pair, None)
+        if previous is not None:
+            lig_kern = self.font.metrics.lig_kern
+            left = ord(previous)
 
-            if kern_size is not None:
-                new_kern = Kern(width=kern_size)
-                logger.debug("%s: adding kern: %s",
-                        self, new_kern)
+            if left<len(lig_kern) and lig_kern[left] is not None:
+                kern_size, ligature = lig_kern[left].get(ord(ch),
+                        (None, None))
 
-                self.contents.append(new_kern)
-                self._adjust_dimens_for_item(new_kern)
-                logger.debug("%s: added kern: %s", self, new_kern)
+        if kern_size is not None:
+            new_kern = Kern(width=kern_size)
+            logger.debug("%s: adding kern: %s",
+                    self, new_kern)
 
-            else:
+            super().append(new_kern)
+            logger.debug("%s: added kern: %s", self, new_kern)
 
-                ligature = font_metrics.ligatures.get(pair, None)
+        elif ligature is not None:
 
-                if ligature is not None:
+            left_hand = self.contents[-1]
 
-                    left_hand = self.contents.pop()
+            new_char = CharBox(
+                    ch = ligature,
+                    font = self.font,
+                    )
 
-                    new_char = CharBox(
-                            ch = ligature,
-                            font = self.font,
-                            )
+            new_char.from_ligature = (
+                left_hand.from_ligature or previous) + ch
 
-                    new_char.from_ligature = (
-                        left_hand.from_ligature or previous) + ch
+            if self._before_last is not None and \
+                    self._before_last[0]==len(self.contents)-1:
+                self.contents.pop()
+                self._sizes = list(self._before_last[1])
+                self._dimens = [None, None, None]
+            else:
+                self.pop()
 
-                    self.width -= left_hand.width
-                    self.height = max([n.height-n.shifted_by
-                        for n in self.contents],
-                        default=yex.value.Dimen())
-                    self.depth = max([n.depth+n.shifted_by
-                        for n in self.contents],
-                        default=yex.value.Dimen())
+            logger.debug(
+                "%s: adding ligature: briefly w=%s, h=%s, d=%s",
+                self,
+                self.width, self.height, self.depth,
+                )
 
-                    logger.debug(
-                        "%s: adding ligature: briefly w=%s, h=%s, d=%s",
-                        self,
-                        self.width, self.height, self.depth,
-                        )
+        if self._stale:
+            self._before_last = None
+        else:
+            self._before_last = (len(self.contents), tuple(self._sizes))
 
-        self.contents.append(new_char)
-        self._adjust_dimens_for_item(new_char)
-        self._ch_cache = None
+        super().append(new_char)
         logger.debug("%s: adding %s after %s: now w=%s, h=%s, d=%s",
                 self, str(new_char), str(previous),
                 self.width, self.height, self.depth,
@@ -18,6 +18,7 @@ __all__ = [
         'Macro',
         'MuglueParameter',
         'NumberParameter',
+        'PackedArray',
         'Register',
         'TimeParameter',
         'TokenlistParameter',
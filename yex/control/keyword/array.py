@@ -8,35 +8,27 @@ import collections
 import yex
 import string
 import logging
-from yex.control import Unexpandable, Register, Array
+from yex.control import Unexpandable, Register, Array, PackedArray
 from yex.value import *
 from yex.box import Box as ybBox
 from yex.font import Font
 
 logger = logging.getLogger('yex.general')
 
-class Count(Array):
+class Count(PackedArray):
     our_type = Number
 
-    def __setitem__(self, index, v):
-
-        if isinstance(v, int):
-            v = Number(v)
-
-        try:
-            if v.value<-2**31 or v.value>2**31:
-                raise ValueError(
-                        f"Assignment is out of range: {v.value}")
-        except (TypeError, AttributeError):
-            # This isn't the right type for us, but the superclass
-            # can deal with that.
-            pass
-
-        super().__setitem__(index, v)
+    def _check_range(self, n):
+        if n<-2**31 or n>2**31:
+            raise ValueError(
+                    f"Assignment is out of range: {n}")
 
-class Dimen(Array):
+class Dimen(PackedArray):
     our_type = Dimen
 
+    def _from_int(self, n):
+        return yex.value.Dimen(n, 'sp')
+
 class Skip(Array):
     our_type = Glue
 
@@ -116,14 +108,22 @@ class Copy(Box):
     destroy_on_read = False
 
     def __init__(self, doc):
-        self.doc = doc
-        self.contents = doc[r'\box'].contents
+        super().__init__(doc,
+                contents = doc[r'\box'].contents,
+                )
 
 class Catcode(Array):
     our_type = int
 
     max_value = 15
 
+    # Bumped whenever any code changes, so that anyone who classified
+    # a string earlier can tell their classification is now stale.
+    changes = 0
+
+    # Cache for categories_of(); None when it needs rebuilding.
+    _categories_table = None
+
     @classmethod
     def _default_contents(cls):
         result = {
@@ -172,6 +172,33 @@ class Catcode(Array):
                     f"Assignment is out of range: {value}")
         super().__setitem__(index, value)
 
+        self.changes += 1
+        self._categories_table = None
+
+    def categories_of(self, s):
+        """
+        Finds the category codes of every character in a string at once.
+
+        Args:
+            s (str): the string to classify.
+
+        Returns:
+            `bytes` as long as `s`, each of which is the category code
+            of the corresponding character in `s`. If `s` contains any
+            characters above 255, returns None; you'll have to look
+            those up one at a time.
+        """
+        if self._categories_table is None:
+            # str.translate() leaves alone any character whose
+            # ordinal is past the end of the table.
+            self._categories_table = ''.join(
+                    [chr(self.contents[i]) for i in range(256)])
+
+        try:
+            return s.translate(self._categories_table).encode('latin-1')
+        except UnicodeEncodeError:
+            return None
+
     @classmethod
     def _check_index(cls, index):
         if isinstance(index, str):
@@ -2,7 +2,11 @@
 Debugging controls.
 """
 
+import logging
 from yex.control.control import Unexpandable
+import yex
+
+logger = logging.getLogger('yex.general')
 
 class Debugging(Unexpandable): pass
 
@@ -19,5 +23,31 @@ class Errorstopmode(Error_handling_mode):
     pass
 
 class Dump(Unexpandable):
+    r"""
+    Writes a format file, and ends the job.
+
+    The format file is named after \jobname, with the extension ".fmt";
+    if \jobname is empty, it's "texput.fmt", as in TeX. You can load it
+    again using the "--format" option. See `Document.dump_format`
+    for details.
+
+    You can only use this outside all groups.
+    """
     horizontal = 'vertical'
     vertical = True
+
+    def __call__(self, tokens):
+        doc = tokens.doc
+
+        if doc.groups:
+            raise yex.exception.DumpInsideGroupError()
+
+        filename = str(doc[r'\jobname']) or 'texput'
+        filename += '.fmt'
+
+        logger.debug(r"\dump: writing format to %s", filename)
+
+        with open(filename, 'wb') as f:
+            doc.dump_format(f)
+
+        tokens.end()
@@ -93,7 +93,7 @@ class Font(Unexpandable):
         del s['setter']
 
         font = yex.font.Font.from_serial(s)
-        result = FontSetter(font=font, name=s)
+        result = FontSetter(font=font, name=setter)
 
         return result
 
@@ -75,6 +75,11 @@ class TracingFilter(TracingParameter):
 
     initial_value = 0
 
+    @property
+    def enabled(self):
+        "True if this kind of tracing is switched on."
+        return self._value>=1
+
     def info(self, s):
         if self._value>=1:
             print(s)
@@ -12,54 +12,97 @@ import string
 
 logger = logging.getLogger('yex.general')
 
-class _Store_Call(yex.parse.token.Internal):
+class _Store_Return(yex.parse.token.Internal):
     """
-    Pushes a call frame onto the call stack.
+    Pops a frame from the call stack, and goes back to where the call was.
+
+    There's only ever one of these at each depth of the call stack
+    at a time, so we make one for each depth and reuse it;
+    see `at_depth()`.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args)
-        self.record = yex.document.Callframe(
-                **kwargs,
-                )
+    __slots__ = ('depth', )
 
-    def __call__(self, tokens):
-        tokens.doc.call_stack.append(self.record)
-        logger.debug(
-                "call stack: push: %s",
-                tokens.doc.call_stack)
+    _by_depth = []
 
-    def __repr__(self):
-        return f'[call: {self.record}]'
+    def __init__(self, depth, *args):
+        super().__init__(*args)
+        self.depth = depth
 
-class _Store_Return(yex.parse.token.Internal):
-    """
-    Pops a frame from the call stack.
-    """
+    @classmethod
+    def at_depth(cls, depth):
+        """
+        Returns the _Store_Return for a call made at the given depth.
 
-    def __init__(self, beginner, *args, **kwargs):
-        super().__init__(*args)
-        self.expected = beginner.record
+        Args:
+            depth (`int`): the depth of the call stack before the call.
+
+        Returns:
+            `_Store_Return`
+        """
+        try:
+            return cls._by_depth[depth]
+        except IndexError:
+            while len(cls._by_depth)<=depth:
+                cls._by_depth.append(cls(len(cls._by_depth)))
+            return cls._by_depth[depth]
 
     def __call__(self, tokens):
-        found = tokens.doc.call_stack.pop()
-        logger.debug(
-                "call stack: pop : %s",
-                found)
+        call_stack = tokens.doc.call_stack
 
-        if found != self.expected:
+        if call_stack.depth!=self.depth+1:
             logger.critical(
-                    "call stack mismatch!! expected %s, but found %s",
-                    self.expected, found,
+                    "call stack mismatch!! expected depth %s, but found %s",
+                    self.depth+1, call_stack.depth,
                     )
 
             raise yex.exception.MismatchedMacroRecordsError()
 
-        found.jump_back(tokens)
+        location = call_stack.pop()
+        logger.debug(
+                "call stack: pop : %s",
+                location)
+
+        tokens.location = location
 
     def __repr__(self):
         return f'[return]'
 
+class _Delimiter:
+    """
+    A series of tokens which marks the end of a macro's argument.
+
+    We work out a Knuth-Morris-Pratt failure table when we're created,
+    so that when part of the delimiter turns out not to be the delimiter
+    after all, we know straight away how much of it could still be
+    the start of the real one. We never need to read any tokens twice.
+
+    Attributes:
+        tokens (list): the tokens of the delimiter.
+        fallback (list of int): the KMP failure table. fallback[k] is the
+            length of the longest proper prefix of tokens[:k+1] which is
+            also a suffix of it.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.fallback = [0]*len(tokens)
+
+        k = 0
+        for i in range(1, len(tokens)):
+            while k and tokens[i]!=tokens[k]:
+                k = self.fallback[k-1]
+            if tokens[i]==tokens[k]:
+                k += 1
+            self.fallback[i] = k
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __repr__(self):
+        return '[delimiter;%s]' % (
+                ''.join([str(t) for t in self.tokens]),)
+
 class Macro(Expandable):
     r"""
     Any macro defined using \def.
@@ -83,6 +126,42 @@ class Macro(Expandable):
         self.parameter_text = parameter_text
         self.starts_at = starts_at
 
+    @property
+    def parameter_text(self):
+        return self._parameter_text
+
+    @parameter_text.setter
+    def parameter_text(self, v):
+        self._parameter_text = v
+
+        # Worked out by _part1_find_arguments() when it first needs it.
+        self._delimiters = None
+
+    @property
+    def definition(self):
+        return self._definition
+
+    @definition.setter
+    def definition(self, v):
+        # We keep the shared versions of the tokens (see Token.get()),
+        # which don't know where they came from. So we keep their
+        # locations separately, packed, in step with the definition.
+        self._definition = []
+        self._locations = []
+
+        for t in v:
+            if isinstance(t, yex.parse.Token):
+                self._locations.append(t.packed_location)
+                t = t.without_location()
+            else:
+                self._locations.append(None)
+
+            self._definition.append(t)
+
+        # Worked out by _part2_interpolate() when it first needs it.
+        self._body = None
+        self._has_arguments = None
+
     def __call__(self, tokens):
 
         logger.debug('%s: delimiters=%s', self, self.parameter_text)
@@ -97,21 +176,21 @@ class Macro(Expandable):
         interpolated = self._part2_interpolate(arguments)
         logger.debug('%s: result=%s', self, interpolated)
 
-        beginner = _Store_Call(
+        call_stack = tokens.doc.call_stack
+        depth = call_stack.push(
             callee = self.name,
+            location = tokens.packed_location,
             args = arguments,
-            location = tokens.location,
             )
-        ender = _Store_Return(
-                beginner = beginner,
-                )
+        logger.debug(
+                "call stack: push: %s",
+                call_stack)
 
-        # Push store and return back to front, because these tokens
+        # Push the return back to front, because these tokens
         # are retrieved first-in-first-out.
 
-        tokens.push(ender, is_result=True)
+        tokens.push(_Store_Return.at_depth(depth), is_result=True)
         tokens.push(interpolated, is_result=True)
-        tokens.push(beginner, is_result=True)
 
         tokens.location = self.starts_at
 
@@ -141,119 +220,26 @@ class Macro(Expandable):
                         name = self.name,
                         )
 
+        if self._delimiters is None:
+            self._delimiters = [
+                    _Delimiter(p) if p else None
+                    for p in self.parameter_text[1:]]
+
         # Now the actual parameters...
-        for i, p in enumerate(self.parameter_text[1:]):
+        for i, delimiter in enumerate(self._delimiters):
 
             tokens.eat_optional_spaces()
 
-            if p:
-                # We're expecting some series of tokens
-                # to delimit this argument.
-
-                logger.debug(
-                        "%s: argument %s is delimited by %s",
-                        self, i, p,
-                        )
-
-                looking_for_par = (isinstance(p[0], yex.parse.Control)
-                        and p[0].ch==r'\par')
-
-                e = tokens.another(
-                    no_outer=True,
-                    level='deep',
-                    on_eof = 'raise',
-                    )
-
-                seen = []
-                depth = 0
-                balanced = True
-                arguments[i] = []
-
-                for j, t in enumerate(self.check_for_par(
-                    expander = e,
-                    unless = looking_for_par,
-                    )):
-
-                    logger.debug(
-                            "%s: finding argument %s; token %s is %s",
-                            self, i, j, t,
-                            )
-
-                    matches = p[len(seen)]==t
-
-                    if isinstance(t, yex.parse.BeginningGroup):
-                        if depth==0 and matches:
-                            # Special case. If the delimiter itself is {,
-                            # we shouldn't count it as starting a new group,
-                            # because otherwise we wouldn't match it!
-                            beginning_group = False
-                        else:
-                            beginning_group = True
-                    else:
-                        beginning_group = False
-
-                    if j==0:
-                        # First character in the arguments.
-                        if beginning_group:
-                            depth = 1
-                        else:
-                            # First character wasn't an opening brace.
-                            # So this text can't be balanced.
-                            balanced = False
-                    else:
-                        # Not the first character.
-                        if beginning_group:
-                            if depth==0:
-                                # Starting a new group from ground level
-                                # part-way through an arguments string,
-                                # so this text isn't balanced.
-                                balanced = False
-                            depth += 1
-                        elif isinstance(t, yex.parse.EndGroup):
-                            depth -= 1
-                            if depth==0:
-                                seen = []
-
-                    if depth==0 and matches:
-                        seen.append(t)
-                        logger.debug(
-                                (
-                                    "matches delimiter for %s; "
-                                    "partial delimiter now %s"
-                                    ),
-                                self, seen)
-
-                        if len(seen)==len(p):
-                            # hurrah, done
-
-                            logger.debug(
-                                    "  -- hurrah, that's the whole thing")
-                            if balanced:
-                                arguments[i] = \
-                                        arguments[i][1:-1]
-                            break
-                    elif seen:
-                        logger.debug(
-                                "  -- not the delimiter after all; push back")
-                        e.push(t)
-                        for s in reversed(seen[1:]):
-                            e.push(s)
-                        arguments[i].append(seen[0])
-                        seen = []
-                    else:
-                        arguments[i].append(t)
+            if delimiter is not None:
+                arguments[i] = self._find_delimited_argument(
+                        tokens, i, delimiter)
             else:
                 logger.debug(
                         "%s: argument %s is not delimited",
                         self, i,
                         )
 
-                arguments[i] = list(self.check_for_par(tokens.another(
-                        bounded='single',
-                        on_eof='exhaust',
-                        no_outer=True,
-                        level='deep',
-                        )))
+                arguments[i] = self._find_undelimited_argument(tokens)
 
         logger.debug(
                 "%s: arguments found: %s",
@@ -262,20 +248,189 @@ class Macro(Expandable):
 
         return arguments
 
+    def _find_delimited_argument(self, tokens, i, delimiter):
+
+        p = delimiter.tokens
+
+        logger.debug(
+                "%s: argument %s is delimited by %s",
+                self, i, p,
+                )
+
+        looking_for_par = (isinstance(p[0], yex.parse.Control)
+                and p[0].ch==r'\par')
+
+        e = tokens.another(
+            no_outer=True,
+            level='deep',
+            on_eof = 'raise',
+            )
+
+        # The tokens which have matched the start of the delimiter so far.
+        seen = []
+        depth = 0
+        balanced = True
+        result = []
+
+        for j, t in enumerate(self.check_for_par(
+            expander = e,
+            unless = looking_for_par,
+            )):
+
+            logger.debug(
+                    "%s: finding argument %s; token %s is %s",
+                    self, i, j, t,
+                    )
+
+            matches = p[len(seen)]==t
+
+            if isinstance(t, yex.parse.BeginningGroup):
+                if depth==0 and matches:
+                    # Special case. If the delimiter itself is {,
+                    # we shouldn't count it as starting a new group,
+                    # because otherwise we wouldn't match it!
+                    beginning_group = False
+                else:
+                    beginning_group = True
+            else:
+                beginning_group = False
+
+            if j==0:
+                # First character in the arguments.
+                if beginning_group:
+                    depth = 1
+                else:
+                    # First character wasn't an opening brace.
+                    # So this text can't be balanced.
+                    balanced = False
+            else:
+                # Not the first character.
+                if beginning_group:
+                    if depth==0:
+                        # Starting a new group from ground level
+                        # part-way through an arguments string,
+                        # so this text isn't balanced.
+                        balanced = False
+                    depth += 1
+                elif isinstance(t, yex.parse.EndGroup):
+                    depth -= 1
+
+            if seen and not (depth==0 and matches):
+                # Not the delimiter after all. The delimiter can only
+                # contain { at the very end, so if t opened a group,
+                # none of what we've seen can still be part of it.
+                # Otherwise, the failure table tells us how much can.
+                logger.debug(
+                        "  -- not the delimiter after all")
+
+                while seen:
+                    if depth==0:
+                        keep = delimiter.fallback[len(seen)-1]
+                    else:
+                        keep = 0
+
+                    result.extend(seen[:len(seen)-keep])
+                    del seen[:len(seen)-keep]
+
+                    if p[len(seen)]==t:
+                        matches = depth==0
+                        break
+
+            if depth==0 and matches:
+                seen.append(t)
+                logger.debug(
+                        (
+                            "matches delimiter for %s; "
+                            "partial delimiter now %s"
+                            ),
+                        self, seen)
+
+                if len(seen)==len(p):
+                    # hurrah, done
+
+                    logger.debug(
+                            "  -- hurrah, that's the whole thing")
+                    if balanced:
+                        result = result[1:-1]
+                    break
+            else:
+                result.append(t)
+
+        return result
+
+    def _find_undelimited_argument(self, tokens):
+
+        items = iter(self.check_for_par(tokens))
+
+        try:
+            t = next(items)
+        except StopIteration:
+            return []
+
+        if not isinstance(t, yex.parse.BeginningGroup):
+            return [t]
+
+        result = []
+        depth = 1
+
+        for t in items:
+            if isinstance(t, yex.parse.BeginningGroup):
+                depth += 1
+            elif isinstance(t, yex.parse.EndGroup):
+                depth -= 1
+                if depth==0:
+                    break
+
+            result.append(t)
+
+        return result
+
     def _part2_interpolate(self, arguments):
+        """
+        Fills in our definition with the arguments we were called with.
+
+        Args:
+            arguments (dict): the arguments, as found by
+                _part1_find_arguments().
+
+        Returns:
+            `Segment`. If the definition doesn't use any arguments,
+            this is the same Segment every time.
+        """
+
+        if self._body is None:
+            self._body = yex.parse.Segment(self.definition,
+                    locations = self._locations,
+                    )
+            self._has_arguments = any([
+                isinstance(t, yex.parse.Argument)
+                for t in self.definition])
+
+        if not self._has_arguments:
+            return self._body
 
         interpolated = []
+        locations = []
 
-        for t in self.definition:
+        for t, location in zip(self.definition, self._locations):
 
             if isinstance(t, yex.parse.Argument):
-                interpolated.extend(
-                        arguments[int(t.ch)-1],
-                        )
+                argument = arguments[int(t.ch)-1]
+                interpolated.extend(argument)
+
+                # The tokens of the arguments know their own locations,
+                # if anyone does.
+                locations.extend([None]*len(argument))
             else:
                 interpolated.append(t)
+                locations.append(location)
 
-        return interpolated
+        # Arguments are always balanced, so they don't change
+        # the group depth.
+        return yex.parse.Segment(interpolated,
+                group_delta = self._body.group_delta,
+                locations = locations,
+                )
 
     def __repr__(self):
         try:
@@ -8,6 +8,7 @@ import yex.value
 import yex.mode
 import yex.exception
 import yex.font
+import yex.util
 from yex.control.control import Unexpandable
 import datetime
 import logging
@@ -44,6 +45,9 @@ class Parameter(Unexpandable):
         do_not_initialise (bool): if True, _value will not be initialised.
             If False (the default), _value will be initialised with a new
             instance of our_type (or our_type[0] if our_type is a tuple).
+        changed (bool): True if the value has ever been set since we
+            were created. `Document.items` uses this to skip parameters
+            which can't differ from their initial values.
 
         is_outer: not applicable, and always False
         is_queryable: not applicable, and always True
@@ -54,6 +58,7 @@ class Parameter(Unexpandable):
     is_outer = False
     do_not_initialise = False
     is_queryable = True
+    changed = False
 
     def __init__(self, value=None, **kwargs):
 
@@ -80,6 +85,7 @@ class Parameter(Unexpandable):
     @value.setter
     def value(self, v):
         self._set_value(v)
+        self.changed = True
 
     def _get_value(self):
         return self._value
@@ -93,6 +99,22 @@ class Parameter(Unexpandable):
 
         self._value = n
 
+    def set_from_serial(self, state):
+        """
+        Sets the value from its serialised form, as found in
+        the 'value' field of our `__getstate__`.
+        """
+        our_type = self.our_type
+        if isinstance(our_type, tuple):
+            our_type = our_type[0]
+
+        if isinstance(state, our_type):
+            self.value = state
+        elif hasattr(our_type, 'from_serial'):
+            self.value = our_type.from_serial(state)
+        else:
+            self.value = our_type(state)
+
     def set_from(self, tokens):
         """
         Sets the value from a token stream.
@@ -134,11 +156,7 @@ class Parameter(Unexpandable):
                 }
         value = self._get_value()
         if value != self.initial_value:
-
-            if hasattr(value, '__getstate__'):
-                value = value.__getstate__()
-
-            result['value'] = value
+            result['value'] = yex.util.serialise(value)
 
         return result
 
@@ -1,3 +1,4 @@
+import array
 import logging
 import yex
 from yex.value import *
@@ -83,7 +84,7 @@ class Register(Unexpandable):
         return self.parent.our_type
 
     def __iadd__(self, other):
-        self.value += other
+        self.parent._add_to(self.index, other)
         return self
 
     def __imul__(self, other):
@@ -136,7 +137,8 @@ class Array(Unexpandable):
     Array.
 
     The Register class is a wrapper which accesses one particular item
-    in our array.
+    in our array. We only make one Register for each item, and hand
+    out the same one every time we're asked.
 
     This is an abstract class.
 
@@ -161,6 +163,9 @@ class Array(Unexpandable):
         else:
             self.contents = contents
 
+        # Maps indexes to their Registers.
+        self._registers = {}
+
     def get_directly(self, index):
         index = self._check_index(index)
 
@@ -180,14 +185,27 @@ class Array(Unexpandable):
 
     def get_element(self, index):
         try:
-            index = self._check_index(index)
+            return self._registers[index]
+        except (KeyError, TypeError):
+            pass
+
+        try:
+            if not isinstance(index, (int, str)):
+                # An index read from tokens may be a Number,
+                # or even a Register, as in "\count\count1".
+                index = int(index)
+
+            checked = self._check_index(index)
         except (KeyError, TypeError):
             return self._empty_register()
 
-        return Register(
+        result = Register(
             parent = self,
-            index = index,
+            index = checked,
             )
+        self._registers[index] = result
+
+        return result
 
     def get_element_from_tokens(self, tokens):
         index = Value.get_value_from_tokens(tokens)
@@ -218,6 +236,21 @@ class Array(Unexpandable):
         else:
             self.contents[index] = value
 
+    def _add_to(self, index, other):
+        """
+        Adds `other` to the element at `index`.
+
+        Subclasses may be able to do this more cheaply.
+
+        Args:
+            index (int): the index into this array; must already be checked
+            other (our_type): the value to add
+
+        Returns:
+            None
+        """
+        self.__setitem__(index, self.get_directly(index) + other)
+
     def set_from_tokens(self, index, tokens):
 
         logger.debug("%s: set_from_tokens begins.",
@@ -280,6 +313,17 @@ class Array(Unexpandable):
     def _default_contents(cls):
         return {}
 
+    @classmethod
+    def defaults(cls):
+        """
+        Like `_default_contents`, except that the result is shared
+        between all callers, so it's only built once. Don't modify it.
+        """
+        if '_defaults' not in cls.__dict__:
+            cls._defaults = cls._default_contents()
+
+        return cls._defaults
+
     @property
     def _type_to_parse(self):
         return self.our_type
@@ -298,7 +342,7 @@ class Array(Unexpandable):
                 The second element is the value.
         """
 
-        default = self._default_contents()
+        default = self.defaults()
 
         # This design is necessary because "default" could
         # be dict or defaultdict, and the "in" test doesn't work well
@@ -348,6 +392,92 @@ class Array(Unexpandable):
                     "  -- further, is_array is not set on this array!")
         raise NotImplementedError()
 
+class PackedArray(Array):
+    r"""
+    An array of registers whose values are integers underneath,
+    such as \count (which holds Numbers) and \dimen (which holds
+    Dimens, as integers of sp).
+
+    Rather than keeping an object for each register, we keep the
+    integers in an `array.array`, and only make an object of `our_type`
+    when someone reads a register. Adding to a register doesn't
+    make any objects at all.
+
+    Empty registers are zero, so contents doesn't distinguish
+    between a register which was never set and one which was set to zero.
+
+    Fields:
+        typecode - the typecode of the `array.array`.
+        size - the number of registers.
+    """
+
+    typecode = 'q'
+    size = 256
+
+    @classmethod
+    def _default_contents(cls):
+        return array.array(cls.typecode, [0])*cls.size
+
+    def get_directly(self, index):
+        if 0<=index<self.size:
+            return self._from_int(self.contents[index])
+
+        raise KeyError(index)
+
+    def _value_for_repr(self, index):
+        return str(self.get_directly(index))
+
+    def __setitem__(self, index, value):
+        index = self._check_index(index)
+
+        if isinstance(value, int):
+            n = value
+        elif value is None:
+            n = 0
+        else:
+            n = self._to_int(self._check_value(value))
+
+        self._check_range(n)
+        self.contents[index] = n
+
+    def _add_to(self, index, other):
+        if not isinstance(other, self.our_type):
+            return super()._add_to(index, other)
+
+        n = self.contents[index] + other.value
+        self._check_range(n)
+        self.contents[index] = n
+
+    def _from_int(self, n):
+        """
+        Returns the integer n as our_type.
+        """
+        return self.our_type(n)
+
+    def _to_int(self, value):
+        """
+        Returns a value of our_type as an integer.
+        """
+        if isinstance(value, int):
+            return value
+
+        return value.value
+
+    def _check_range(self, n):
+        """
+        Raises ValueError if n is out of range. By default,
+        anything goes.
+        """
+        pass
+
+    def items(self):
+        for i, n in enumerate(self.contents):
+            if n!=0:
+                yield (
+                        fr"\{self.name}{i}",
+                        self._from_int(n),
+                        )
+
 class Defined_by_chardef(Unexpandable):
 
     is_queryable = True
@@ -388,6 +518,10 @@ class Defined_by_chardef(Unexpandable):
 
         return result
 
+    @classmethod
+    def from_serial(cls, state):
+        return cls(char=chr(state['char']))
+
     def __eq__(self, other):
         try:
             other = other.value
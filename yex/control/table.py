@@ -15,11 +15,64 @@ class ControlsTable:
 
     Initially the set is empty; you can add to it either using
     the `insert` method, or the `|=` operator.
+
+    Attributes:
+        contents (dict): maps names to controls, or to the classes
+            of controls which haven't been instantiated yet.
+        dispatch (dict): a cache of lookups made through
+            `Document.lookup`, mapping identifiers to the controls
+            they resolved to (or to None, if they resolved to nothing).
+            Anything which changes `contents` must keep this
+            up to date; the methods of this class do that for you.
+        changed (set of str): the names of all controls which have been
+            assigned or deleted since we were filled using `|=`.
+            `Document.items` uses this to find what might differ from
+            a new Document without looking at everything.
     """
 
     def __init__(self, **kwargs):
         self.contents = {}
+        self.dispatch = {}
         self.kwargs = kwargs
+        self.changed = set()
+
+        # See the "unskippable" property. None means "work it out again".
+        self._unskippable = None
+
+    @property
+    def unskippable(self):
+        r"""
+        The names of the controls which must run even inside a false
+        conditional block.
+
+        These are the conditionals themselves, such as \iftrue, \else,
+        and \fi, plus anything which says it must run even if we're not
+        expanding, such as \message. An Expander skipping a false block
+        only needs to stop at these. It can drop anything else unseen.
+
+        Returns:
+            `set` of `str`
+        """
+        if self._unskippable is None:
+            self._unskippable = set([
+                field for field, value in self.contents.items()
+                if self._is_unskippable(value)])
+
+        return self._unskippable
+
+    @staticmethod
+    def _is_unskippable(value):
+        return getattr(value, 'conditional', False) or \
+                getattr(value, 'even_if_not_expanding', False)
+
+    def _note_unskippable(self, field, value):
+        if self._unskippable is None:
+            return
+
+        if value is not None and self._is_unskippable(value):
+            self._unskippable.add(field)
+        else:
+            self._unskippable.discard(field)
 
     def __getitem__(self, field):
         return self.get(field=field)
@@ -47,23 +100,28 @@ class ControlsTable:
             raise KeyError(field)
 
         result = self._get_and_maybe_instantiate(field)
+        debugging = logger.isEnabledFor(logging.DEBUG)
 
         if isinstance(result, Parameter):
 
             if param_control:
-                logger.debug(
-                        "get parameter control %s==%s (rather than its value)",
-                        field, result)
+                if debugging:
+                    logger.debug(
+                            ("get parameter control %s==%s "
+                            "(rather than its value)"),
+                            field, result)
                 return result
             else:
-                logger.debug(
-                        "get value of parameter %s==%s",
-                        field, result)
+                if debugging:
+                    logger.debug(
+                            "get value of parameter %s==%s",
+                            field, result)
                 return result.value
         else:
-            logger.debug(
-                    "get control %s==%s",
-                    field, str(result))
+            if debugging:
+                logger.debug(
+                        "get control %s==%s",
+                        field, str(result))
             return result
 
     def _get_and_maybe_instantiate(self, field):
@@ -85,6 +143,30 @@ class ControlsTable:
 
         return result
 
+    def _deserialise_control(self, value):
+        r"""
+        Finds the control described by a serialised dict with a 'control'
+        field. This is a helper for `__setitem__`.
+
+        If we already have a control with that name, we use it, just as
+        \let would; otherwise we construct a new one. Either way, if
+        the dict has a 'value' field, we set the control's value from it.
+        """
+        name = '\\' + value['control']
+
+        if name not in self.contents:
+            return yex.control.Control.from_serial(value)
+
+        result = self._get_and_maybe_instantiate(name)
+
+        if 'value' in value:
+            if isinstance(result, Parameter):
+                result.set_from_serial(value['value'])
+            else:
+                result.value = value['value']
+
+        return result
+
     def __setitem__(self, field, value):
         """
         If "value" is a dict, use it to set the value of the control
@@ -119,20 +201,36 @@ class ControlsTable:
             one more string than there are parameters, because there may
             be delimiters between the macro name and its first parameter.
 
+        Otherwise, if v['char'] exists, this was defined by \\chardef,
+        and v['char'] is the codepoint of the character.
+
+        Otherwise, if v['register'] exists, this was defined by something
+        like \\countdef, and v['register'] names the register, such as
+        "\\count23".
+
         Otherwise, we raise ValueError.
 
         We may also raise KeyError if, for example, v['control'] is not
         the name of a control.
         """
 
+        self.dispatch.pop(field, None)
+        self.changed.add(field)
+
         if isinstance(value, dict):
 
             if 'control' in value:
-                item = yex.control.Control.from_serial(value)
+                item = self._deserialise_control(value)
             elif 'font' in value:
-                item = yex.control.Font.from_serial(value)
+                item = yex.control.keyword.Font.from_serial(value)
             elif 'macro' in value:
                 item = yex.control.Macro.from_serial(value)
+            elif 'char' in value:
+                item = yex.control.register.Defined_by_chardef.from_serial(
+                        value)
+            elif 'register' in value:
+                item = self.kwargs['doc'].get(value['register'],
+                        param_control=True)
             else:
                 raise ValueError(
                         "Don't know how to deserialise this: %s" % (
@@ -143,6 +241,7 @@ class ControlsTable:
                 )
 
             self.contents[field] = item
+            self._note_unskippable(field, item)
 
             return
 
@@ -153,6 +252,7 @@ class ControlsTable:
                 raise yex.exception.RemovingNonexistentControlError(
                         field = field,
                         )
+            self._note_unskippable(field, None)
             return
 
         if field in self.contents:
@@ -182,9 +282,13 @@ class ControlsTable:
                     current)
 
         self.contents[field] = value
+        self._note_unskippable(field, value)
 
     def __delitem__(self, field):
+        self.dispatch.pop(field, None)
+        self.changed.add(field)
         del self.contents[field]
+        self._note_unskippable(field, None)
 
     def __ior__(self, to_merge):
         """
@@ -195,6 +299,8 @@ class ControlsTable:
             to_merge = to_merge.contents
 
         self.contents |= to_merge
+        self.dispatch.clear()
+        self._unskippable = None
         return self
 
     def __contains__(self, field):
@@ -3,6 +3,7 @@ from yex.document.document import *
 from yex.document.group import *
 
 __all__ = [
+        'CallStack',
         'Callframe',
         'Document',
         'Group',
@@ -1,17 +1,20 @@
 import logging
+import yex
 
 logger = logging.getLogger('yex.general')
 
 class Callframe:
-    """
+    r"""
     Description of a macro call.
 
     Only used for tracebacks; the macros take care of themselves.
-    Stored in the list Document.call_stack.
+    CallStack makes these when someone asks for them.
 
     Attributes:
         callee (`Token`): the name of the macro that made the call.
-        args (list of lists of `Token`): the arguments to the call.
+        args (dict of lists of `Token`, or None): the arguments to the call.
+            These are only kept if \tracingmacros was positive, or
+            we were logging debug messages, when the call was made.
         location (`yex.parse.Location`): where the call was made
             (as a named tuple of filename, line, and column).
     """
@@ -25,11 +28,119 @@ class Callframe:
         self.location = location
 
     def __repr__(self):
-        args = ','.join([
-            ''.join([str(c) for c in v])
-            for (f,v) in sorted(self.args.items())])
+        if self.args is None:
+            args = '...'
+        else:
+            args = ','.join([
+                ''.join([str(c) for c in v])
+                for (f,v) in sorted(self.args.items())])
         return f'{self.callee}({args}):{self.location}'
 
-    def jump_back(self, tokens):
-        logger.debug("%s: jumping back", self)
-        tokens.location = self.location
+class CallStack:
+    r"""
+    The macro calls which are currently being expanded.
+
+    Every macro call pushes a frame here, but we only look at the frames
+    when we're reporting an error. So we keep them as cheaply as we can:
+    a frame is the name of the macro and the location it was called from,
+    packed into an int by `yex.parse.Location.pack()`. These live in
+    lists which only ever grow, so a call doesn't make any new objects
+    unless it's deeper than any call before it.
+
+    The arguments are only kept if \tracingmacros is positive, or
+    we're logging debug messages.
+
+    Indexing the stack gives you a `Callframe`, and iterating over it
+    goes from the outermost call to the innermost.
+
+    Attributes:
+        depth (`int`): the number of calls on the stack.
+    """
+
+    def __init__(self, doc):
+        self.depth = 0
+
+        self._callees = []
+        self._locations = []
+        self._args = []
+
+        self._tracingmacros = doc.get(r'\tracingmacros', param_control=True)
+        self._debugging = logger.isEnabledFor(logging.DEBUG)
+
+    def push(self, callee, location, args):
+        """
+        Adds a call to the top of the stack.
+
+        Args:
+            callee (`str`): the name of the macro.
+            location (`int`, `yex.parse.Location`, or None): where
+                the call was made. Preferably packed.
+            args (dict): the arguments to the call. We only keep these
+                if we're tracing.
+
+        Returns:
+            `int`, the depth of the stack before the push.
+        """
+        depth = self.depth
+
+        if not self._debugging and not self._tracingmacros.enabled:
+            args = None
+
+        if depth==len(self._callees):
+            self._callees.append(callee)
+            self._locations.append(location)
+            self._args.append(args)
+        else:
+            self._callees[depth] = callee
+            self._locations[depth] = location
+            self._args[depth] = args
+
+        self.depth = depth+1
+
+        return depth
+
+    def pop(self):
+        """
+        Removes the call at the top of the stack.
+
+        Returns:
+            where the call was made, as it was passed to `push()`.
+        """
+        if self.depth==0:
+            raise IndexError('pop from empty call stack')
+
+        self.depth -= 1
+        self._args[self.depth] = None
+
+        return self._locations[self.depth]
+
+    def __len__(self):
+        return self.depth
+
+    def __getitem__(self, index):
+        if index<0:
+            index += self.depth
+
+        if index<0 or index>=self.depth:
+            raise IndexError(index)
+
+        location = self._locations[index]
+        if isinstance(location, int):
+            location = yex.parse.Location.from_packed(location)
+
+        return Callframe(
+                callee = self._callees[index],
+                args = self._args[index],
+                location = location,
+                )
+
+    def __iter__(self):
+        for i in range(self.depth):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in reversed(range(self.depth)):
+            yield self[i]
+
+    def __repr__(self):
+        return repr(list(self))
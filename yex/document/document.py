@@ -3,9 +3,12 @@ r"`Document` holds a document while it's being processed."
 import datetime
 import yex
 import yex.control.keyword
+import yex.util
 import re
 import functools
-from yex.document.callframe import Callframe
+import json
+import zlib
+from yex.document.callframe import CallStack
 from yex.document.group import Group, ASSIGNMENT_LOG_RECORD
 import logging
 
@@ -15,6 +18,16 @@ KEYWORD_WITH_INDEX = re.compile(r'^([^;]+?);?(-?[0-9]+)$')
 
 FORMAT_VERSION = 1
 
+# Cache for Document._baseline(), keyed by class.
+_baselines = {}
+
+# The first few bytes of every format file; see Document.dump_format().
+FORMAT_MAGIC = b'yexfmt'
+
+# Fields in our serialised state which describe the serialisation itself,
+# rather than anything which should be restored.
+STATE_CRUFT = ['_format', '_full', '_created', '_inputlineno']
+
 class Document:
     r"""A document, while it's being processed.
 
@@ -68,7 +81,9 @@ class Document:
         output (:obj:`Output`): the output driver. For example,
             the PDF driver or the SVG driver.
         contents (list of :obj:`Box`): the rendered contents
-            waiting to go to the output driver.
+            waiting to go to the output driver. Drivers which
+            write out each page as soon as it's finished don't
+            leave their pages here.
         next_assignment_is_global (bool): if True, the next
             use of `__setitem__` will apply until further notice.
             Otherwise, it applies until the end of the
@@ -100,7 +115,7 @@ class Document:
         self.parshape = None
 
         self.ifdepth = _Ifdepth_List([True])
-        self.call_stack = []
+        self.call_stack = CallStack(doc=self)
 
         self.font = yex.font.Font.from_name(
                 name=None,
@@ -114,6 +129,9 @@ class Document:
         self.output = None
         self.contents = []
 
+        # The output driver whose begin() we've called; see _begin_output()
+        self._output_begun = None
+
         self.controls |= {
                 '_inputs': yex.io.StreamsTable(doc=self,
                 our_type=yex.io.InputStream),
@@ -231,9 +249,9 @@ class Document:
                     ASSIGNMENT_LOG_RECORD,
                     '', field, repr(value))
 
-            if self.groups:
-                # XXX This is rather inefficient, because
-                # we parse the fieldname twice
+            if self.groups and field not in self.groups[-1].restores:
+                # The group only remembers the first value it sees
+                # for each field, so we only look it up the first time.
                 previous = self.get(field, default=None)
                 self.groups[-1].remember_restore(field,
                         previous)
@@ -329,8 +347,13 @@ class Document:
             if k not in ['default']:
                 raise TypeError(f'{k} is an invalid keyword for get()')
 
-        logger.debug("doc[%s], index=%s: getting value",
-                repr(field), index)
+        # Checked once per call rather than once per log line:
+        # this method is called very often, and is usually not traced.
+        debugging = logger.isEnabledFor(logging.DEBUG)
+
+        if debugging:
+            logger.debug("doc[%s], index=%s: getting value",
+                    repr(field), index)
 
         item, index = self._find_control_and_index(
                 field = field,
@@ -341,19 +364,22 @@ class Document:
             if index is not None:
                 index = int(index)
                 result = item.get_element(index)
-                logger.debug("doc[%s]:  -- %s[%s] == %s",
-                        field, item, index, result)
+                if debugging:
+                    logger.debug("doc[%s]:  -- %s[%s] == %s",
+                            field, item, index, result)
             else:
                 result = item
 
         elif 'default' in kwargs:
             result = kwargs['default']
-            logger.debug("doc[%s]:  -- not found; returning default: %s",
-                    field, result)
+            if debugging:
+                logger.debug("doc[%s]:  -- not found; returning default: %s",
+                        field, result)
 
         else:
-            logger.debug("doc[%s]:  -- not found",
-                    field)
+            if debugging:
+                logger.debug("doc[%s]:  -- not found",
+                        field)
             raise KeyError(field)
 
         if (hasattr(result, 'is_queryable') and
@@ -363,17 +389,63 @@ class Document:
             t = result # save it for the log message
             result = result.query(tokens=None)
 
-            logger.debug("%s:    -- the answer is the value of %s, == %s",
-                    self, t, result)
+            if debugging:
+                logger.debug("%s:    -- the answer is the value of %s, == %s",
+                        self, t, result)
 
         else:
-            logger.debug("%s:    -- the answer is: %s (which is a %s)",
-                    self, result, type(result))
+            if debugging:
+                logger.debug("%s:    -- the answer is: %s (which is a %s)",
+                        self, result, type(result))
 
         return result
 
     get = __getitem__
 
+    def lookup(self, identifier):
+        r"""
+        Finds the control with the given identifier, for dispatching.
+
+        This is equivalent to
+        ``get(identifier, default=None, param_control=True)``,
+        but the result is cached in `controls.dispatch`, so that
+        looking up the same name again costs one dict hit. The
+        ControlsTable drops cached entries whenever the names they
+        refer to are assigned or deleted, which includes assignments
+        made when a group ends.
+
+        Names which refer to array elements, such as ``\count23``,
+        are not cached, because the result is a fresh `Register`
+        each time.
+
+        Args:
+            identifier (`str`): the name of the control, such as
+                ``\def``, or a single character for an active character.
+
+        Returns:
+            the control, or `None` if there's no such control.
+        """
+        dispatch = self.controls.dispatch
+
+        try:
+            return dispatch[identifier]
+        except KeyError:
+            pass
+
+        item, index = self._find_control_and_index(
+                field = identifier,
+                index = None,
+                )
+
+        if index is None:
+            dispatch[identifier] = item
+            return item
+
+        return self.get(identifier,
+                default = None,
+                param_control = True,
+                )
+
     def __delitem__(self, field,
             index = None,
             ):
@@ -427,10 +499,12 @@ class Document:
                 return None
 
         item = get_control(field)
+        debugging = logger.isEnabledFor(logging.DEBUG)
 
         if item is not None:
-            logger.debug("%s[%s]: found in controls table",
-                    self, repr(field))
+            if debugging:
+                logger.debug("%s[%s]: found in controls table",
+                        self, repr(field))
             return (item, None)
 
         m = re.match(KEYWORD_WITH_INDEX, field)
@@ -445,8 +519,9 @@ class Document:
 
             item = get_control(prefix)
 
-            logger.debug("%s[%s]: prefix==%s, index==%s, giving %s",
-                    self, repr(field), prefix, index, item)
+            if debugging:
+                logger.debug("%s[%s]: prefix==%s, index==%s, giving %s",
+                        self, repr(field), prefix, index, item)
 
         return (item, index)
 
@@ -599,9 +674,9 @@ class Document:
         """
         Sends a box, or multiple boxes, to the output queue.
 
-        Anything passed to this method will be stored, rather than
-        rendered immediately. It will be rendered when the `save` method
-        is called.
+        Anything passed to this method goes to the page builder.
+        Each page is passed to the output driver's `page` method
+        as soon as it's finished.
 
         Args:
             box (`Box`, or list of `Box`): a box or boxes to be rendered.
@@ -684,17 +759,45 @@ class Document:
             print("note: there was no output driver")
             return
 
-        self.output.render()
+        self._begin_output()
+        self.output.end()
+        self._output_begun = None
         logger.debug("%s:   -- done!", self)
 
+    def _begin_output(self):
+        """
+        Calls the output driver's begin(), unless we already have.
+
+        Any pages finished before there was an output driver are
+        sent to it now.
+        """
+        if self._output_begun is self.output:
+            return
+
+        logger.debug("%s: beginning output to %s", self, self.output)
+
+        self._output_begun = self.output
+        self.output.begin()
+
+        waiting, self.contents = self.contents, []
+        for page in waiting:
+            self.output.page(page)
+
     @property
     @functools.cache
     def paragraphs(self):
 
         def _produce_page(page):
-            logger.debug("%s: adding page to contents: %s",
-                    self, page)
-            self.contents.append(page)
+            if not self.output:
+                logger.debug("%s: adding page to contents: %s",
+                        self, page)
+                self.contents.append(page)
+                return
+
+            logger.debug("%s: sending page to %s: %s",
+                    self, self.output, page)
+            self._begin_output()
+            self.output.page(page)
 
         return yex.wrap.Paragraphs(doc=self,
                 produce_page = _produce_page,
@@ -718,31 +821,119 @@ class Document:
 
         state = dict(state) # take a copy
 
-        for cruft in [
-                '_format', '_full', '_created', '_inputlineno',
-                ]:
+        for cruft in STATE_CRUFT:
             if cruft in state:
                 del state[cruft]
 
         for field, value in sorted(state.items()):
             logger.debug("doc.__setstate__: %s=%s", field, value)
-            self[field] = value
+
+            if isinstance(value, dict):
+                # A serialised control. Going through self[...] would
+                # try to assign the dict as the value of whatever
+                # control already has this name.
+                self.controls[field] = value
+            else:
+                self[field] = value
 
         logger.debug("doc.__setstate__: done!")
 
+    def dump_format(self, f):
+        r"""
+        Writes a format file: everything about this Document which differs
+        from a new Document, such as the macros, registers, catcodes,
+        and fonts.
+
+        This is the equivalent of TeX's ``\dump``. A format file
+        written after reading plain.tex can be loaded again with
+        `load_format` much faster than plain.tex itself can be read.
+
+        The file is the JSON form of `__getstate__`, compressed with zlib,
+        after a short header. Fonts are stored by name, and loaded again
+        from their files.
+
+        Args:
+            f (file-like): where to write the format. It must be opened
+                in binary mode.
+
+        Returns:
+            `None`
+        """
+        state = self.__getstate__(full=False)
+
+        for cruft in STATE_CRUFT:
+            if cruft in state:
+                del state[cruft]
+
+        logger.debug("%s: dumping format with %d fields",
+                self, len(state))
+
+        f.write(FORMAT_MAGIC + bytes([FORMAT_VERSION]))
+        f.write(zlib.compress(
+            json.dumps(state, sort_keys=True).encode('UTF-8'),
+            ))
+
+    def load_format(self, f):
+        r"""
+        Reads a format file written by `dump_format`.
+
+        Anything in this Document is lost: afterwards, it's as if
+        we were a new Document which had just read whatever was read
+        before the format was dumped.
+
+        Args:
+            f (file-like): the format file. It must be opened
+                in binary mode.
+
+        Raises:
+            `ValueError`: if `f` isn't a format file, or if it was
+                written by an incompatible version of yex.
+
+        Returns:
+            `None`
+        """
+        header = f.read(len(FORMAT_MAGIC)+1)
+
+        if header[:-1]!=FORMAT_MAGIC:
+            raise ValueError("This is not a format file")
+
+        state = json.loads(zlib.decompress(f.read()).decode('UTF-8'))
+        state['_format'] = header[-1]
+
+        logger.debug("%s: loading format with %d fields",
+                self, len(state))
+
+        self.__setstate__(state)
+
     def __repr__(self):
         return '[doc]'
 
+    @classmethod
+    def _baseline(cls):
+        r"""
+        The full state of a new Document of this class, so that
+        we know what's changed.
+
+        Every new Document starts out the same, so we only build this
+        once per class. Don't modify the result.
+
+        Returns:
+            `dict`
+        """
+        result = _baselines.get(cls)
+
+        if result is None:
+            result = dict(cls().items(full=True))
+            _baselines[cls] = result
+
+        return result
+
     def items(self, full=False, raw=False):
         if full:
             # we don't need anything to compare against
             blank = {}
         else:
-            # get ourselves a fresh version of this class, so that
-            # we know what's changed
-            blank = dict(
-                    [(k,v) for k,v in self.__class__().items(full=True)]
-                    )
+            blank = self._baseline()
 
         return DocumentIterator(
                 doc = self,
@@ -773,10 +964,8 @@ class DocumentIterator:
 
             if self.raw:
                 return v
-            elif hasattr(v, '__getstate__'):
-                return v.__getstate__()
             else:
-                return v
+                return yex.util.serialise(v)
 
         def should_be_included(k, munged):
 
@@ -794,7 +983,25 @@ class DocumentIterator:
 
             return True
 
-        for k in self.doc.controls.keys():
+        controls = self.doc.controls
+
+        def might_have_changed(k, v):
+
+            if self.full or k in controls.changed:
+                return True
+
+            if hasattr(v, '__subclasses__'):
+                # It's never been instantiated, so it's never been used.
+                return False
+
+            # Parameters know whether they've been set. Anything else
+            # might have changed, so we must look at it.
+            return getattr(v, 'changed', True)
+
+        for k, v in list(controls.items()):
+
+            if not might_have_changed(k, v):
+                continue
 
             # Look up v separately, rather than finding it via
             # controls.items(), to force instantiation.
@@ -803,10 +1010,7 @@ class DocumentIterator:
             if hasattr(v, 'items'):
 
                 for k2, v2 in v.items():
-                    if hasattr(v2, '__getstate__'):
-                        v2 = v2.__getstate__()
-
-                    yield (k2, v2)
+                    yield (k2, yex.util.serialise(v2))
 
             else:
 
@@ -134,6 +134,9 @@ class RemovingNonexistentControlError(YexControlError):
             "because it doesn't exist anyway."
             )
 
+class DumpInsideGroupError(YexControlError):
+    form = r"You can't \dump inside a group."
+
 ##############################
 
 class YexParseError(YexError):
@@ -2,6 +2,7 @@ from yex.font.font import *
 from yex.font.tfm import *
 from yex.font.nullfont import *
 from yex.font.default import *
+import yex.font.bundle
 
 __all__ = [
         'Font',
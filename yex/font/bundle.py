@@ -0,0 +1,438 @@
+r"""
+Precompiled font metrics for all our bundled fonts, in a single file.
+
+Parsing a .tfm file means decoding every length it contains, and
+running its ligature/kern program to find out which pairs of characters
+have kerns and ligatures. The results never change, so we can do all
+that once, when yex is built, and store the answers in a bundle.
+
+The bundle lives at yex/res/metrics.bundle. You can rebuild it with
+
+    python -m yex.font.bundle
+
+At runtime, the bundle is memory-mapped, so processes running yex
+at the same time share the same pages. Nothing is decoded until
+someone asks for it.
+
+The format is little-endian throughout, and every field is four bytes
+long, or a multiple of four bytes, so that everything stays aligned.
+
+    header:
+        MAGIC (8 bytes)
+        number of fonts (uint32)
+
+    index, once for each font:
+        filename, such as "cmr10.tfm" (32 bytes, NUL-padded)
+        offset of the font's record from the start of the file (uint32)
+
+    record, once for each font:
+        RECORD_HEADER, as described below
+        char info words, as in the .tfm file (uint32 each)
+        width table, in sp (int32 each)
+        height table, in sp (int32 each)
+        depth table, in sp (int32 each)
+        italic correction table, in sp (int32 each)
+        kern table, in sp (int32 each)
+        dimens, in sp (int32 each)
+        kerns (uint32 each): first char << 24 | second char << 16 |
+            index into the kern table
+        ligatures (uint32 each): first char << 24 | second char << 16 |
+            the resulting char
+"""
+import argparse
+import glob
+import importlib.resources
+import io
+import logging
+import mmap
+import os
+import struct
+import yex
+from yex.font.tfm import Metrics, CharacterMetric
+
+logger = logging.getLogger('yex.general')
+
+MAGIC = b'yexfnt1\0'
+
+BUNDLE_FILENAME = 'metrics.bundle'
+
+HEADER = struct.Struct('<8sI')
+INDEX_ENTRY = struct.Struct('<32sI')
+
+# checksum, design size, first char, last char, seven_bit_safe,
+# parc_face_byte, then the lengths of each of the tables in the
+# order they appear, then the coding scheme and the font identifier.
+RECORD_HEADER = struct.Struct('<Ii' + 'i'*4 + 'I'*9 + '40s20s')
+
+TABLES = [
+        'width_table',
+        'height_table',
+        'depth_table',
+        'italic_correction_table',
+        'kern_table',
+        ]
+
+class BundledMetrics(Metrics):
+    """
+    Font metrics, from a bundle.
+
+    These act just like `Metrics` which were loaded from a .tfm file.
+    But each table is only decoded when someone first looks at it.
+    """
+
+    def __init__(self, buffer, offset):
+
+        (
+            self.checksum,
+            design_size,
+            self.first_char,
+            self.last_char,
+            seven_bit_safe,
+            self.parc_face_byte,
+            charcount,
+            *table_lengths,
+            self.param_count,
+            kern_count,
+            ligature_count,
+            self.character_coding_scheme,
+            self.font_identifier,
+            ) = RECORD_HEADER.unpack_from(buffer, offset)
+
+        self.design_size = yex.value.Dimen(design_size, 'sp')
+        self.seven_bit_safe = seven_bit_safe!=0
+        self.character_coding_scheme = \
+                self.character_coding_scheme.rstrip(b'\0')
+        self.font_identifier = self.font_identifier.rstrip(b'\0')
+
+        self._buffer = buffer
+
+        # Where each part of the record lives: (format, offset).
+        self._parts = {}
+        offset += RECORD_HEADER.size
+
+        for name, length, code in [
+                ('char_info', charcount, 'I'),
+                ] + [
+                (table, length, 'i')
+                for table, length in zip(TABLES, table_lengths)
+                ] + [
+                ('dimens', self.param_count, 'i'),
+                ('kerns', kern_count, 'I'),
+                ('ligatures', ligature_count, 'I'),
+                ]:
+            self._parts[name] = (f'<{length}{code}', offset)
+            offset += length*4
+
+    def _unpack(self, name):
+        part, offset = self._parts[name]
+        return struct.unpack_from(part, self._buffer, offset)
+
+    def _dimens_of(self, name):
+        result = self.__dict__.get(name)
+
+        if result is None:
+            result = [yex.value.Dimen(n, 'sp') for n in self._unpack(name)]
+            self.__dict__[name] = result
+
+        return result
+
+    @property
+    def width_table(self):
+        return self._dimens_of('width_table')
+
+    @property
+    def height_table(self):
+        return self._dimens_of('height_table')
+
+    @property
+    def depth_table(self):
+        return self._dimens_of('depth_table')
+
+    @property
+    def italic_correction_table(self):
+        return self._dimens_of('italic_correction_table')
+
+    @property
+    def kern_table(self):
+        return self._dimens_of('kern_table')
+
+    @property
+    def char_table(self):
+        result = self.__dict__.get('char_table')
+
+        if result is None:
+            result = dict([
+                (charcode, CharacterMetric.from_word(
+                    charcode, value, parent=self))
+                for charcode, value in enumerate(
+                    self._unpack('char_info'),
+                    start = self.first_char,
+                    )])
+            self.__dict__['char_table'] = result
+
+        return result
+
+    @property
+    def dimens(self):
+        result = self.__dict__.get('dimens')
+
+        if result is None:
+            result = dict([
+                (i+1, yex.value.Dimen(n, 'sp'))
+                for i, n in enumerate(self._unpack('dimens'))
+                ])
+            self.__dict__['dimens'] = result
+
+        return result
+
+    @property
+    def kerns(self):
+        result = self.__dict__.get('kerns')
+
+        if result is None:
+            kern_table = self.kern_table
+            result = dict([
+                (chr(n>>24) + chr((n>>16) & 0xFF), kern_table[n & 0xFFFF])
+                for n in self._unpack('kerns')
+                ])
+            self.__dict__['kerns'] = result
+
+        return result
+
+    @property
+    def ligatures(self):
+        result = self.__dict__.get('ligatures')
+
+        if result is None:
+            result = dict([
+                (chr(n>>24) + chr((n>>16) & 0xFF), chr(n & 0xFFFF))
+                for n in self._unpack('ligatures')
+                ])
+            self.__dict__['ligatures'] = result
+
+        return result
+
+class Bundle:
+    """
+    A set of precompiled font metrics.
+
+    Attributes:
+        index (dict): maps filenames, such as "cmr10.tfm", to the offsets
+            of their records in the buffer.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._metrics = {}
+
+        magic, count = HEADER.unpack_from(buffer, 0)
+
+        if magic!=MAGIC:
+            raise ValueError("This is not a font metrics bundle")
+
+        self.index = {}
+        for i in range(count):
+            name, offset = INDEX_ENTRY.unpack_from(buffer,
+                    HEADER.size + i*INDEX_ENTRY.size)
+            self.index[name.rstrip(b'\0').decode('ascii')] = offset
+
+    def __contains__(self, filename):
+        return filename in self.index
+
+    def metrics(self, filename):
+        """
+        Returns the metrics of the given font.
+
+        Args:
+            filename (`str`): the filename of the font, such as "cmr10.tfm".
+
+        Returns:
+            `BundledMetrics`
+
+        Raises:
+            `KeyError`: if there's no such font in this bundle.
+        """
+        result = self._metrics.get(filename)
+
+        if result is None:
+            result = BundledMetrics(self._buffer, self.index[filename])
+            self._metrics[filename] = result
+
+        return result
+
+    @classmethod
+    def from_file(cls, f):
+        """
+        Loads a bundle from a file.
+
+        We memory-map the file if we can, and read it if we can't.
+
+        Args:
+            f (file-like): the bundle, opened for binary reading.
+        """
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError,
+                io.UnsupportedOperation):
+            buffer = f.read()
+
+        return cls(buffer)
+
+# The Bundle loaded by get_bundle(), so we only load it once.
+_bundle = None
+
+def get_bundle():
+    """
+    Returns the bundle of our resource fonts.
+
+    Returns:
+        `Bundle`, or None if the bundle hasn't been built or
+            can't be loaded.
+    """
+    global _bundle
+
+    if _bundle is not None:
+        return _bundle
+
+    try:
+        with (importlib.resources.files(yex) / "res" / BUNDLE_FILENAME
+                ).open('rb') as f:
+            _bundle = Bundle.from_file(f)
+    except (OSError, ValueError, struct.error) as e:
+        # Don't remember the failure: the bundle may turn up later.
+        logger.debug("font metrics bundle couldn't be loaded: %s", e)
+        return None
+
+    logger.debug("font metrics bundle loaded, with %d fonts",
+            len(_bundle.index))
+
+    return _bundle
+
+def write(filenames, f):
+    """
+    Builds a bundle from some .tfm files.
+
+    Files which can't be parsed are left out, with a warning.
+
+    Args:
+        filenames (list of `str`): the .tfm files to include.
+        f (file-like): where to write the bundle, opened for
+            binary writing.
+
+    Returns:
+        the number of fonts written.
+    """
+
+    records = []
+
+    for filename in sorted(filenames):
+        try:
+            with open(filename, 'rb') as tfm:
+                metrics = Metrics(tfm)
+        except (ValueError, struct.error) as e:
+            logger.warning("%s: not bundled, because: %s", filename, e)
+            continue
+
+        records.append((os.path.basename(filename), _record(metrics)))
+
+    f.write(HEADER.pack(MAGIC, len(records)))
+
+    offset = HEADER.size + INDEX_ENTRY.size*len(records)
+    for name, record in records:
+        f.write(INDEX_ENTRY.pack(name.encode('ascii'), offset))
+        offset += len(record)
+
+    for name, record in records:
+        f.write(record)
+
+    return len(records)
+
+def _record(metrics):
+
+    def sp(table):
+        return [d.value for d in table]
+
+    char_info = [
+            metrics.char_table[code].word
+            for code in range(metrics.first_char, metrics.last_char+1)
+            ]
+
+    kern_indexes = dict([(id(d), i)
+        for i, d in enumerate(metrics.kern_table)])
+
+    kerns = [
+            ord(pair[0])<<24 | ord(pair[1])<<16 | kern_indexes[id(kern)]
+            for pair, kern in metrics.kerns.items()
+            ]
+
+    ligatures = [
+            ord(pair[0])<<24 | ord(pair[1])<<16 | ord(result)
+            for pair, result in metrics.ligatures.items()
+            ]
+
+    dimens = [metrics.dimens[i+1] for i in range(len(metrics.dimens))]
+
+    tables = [sp(getattr(metrics, table)) for table in TABLES]
+
+    # If the .tfm file's header was truncated, these are left as
+    # the defaults, which aren't the types we store.
+    design_size = metrics.design_size or yex.value.Dimen()
+
+    def as_bytes(s):
+        if isinstance(s, str):
+            return s.encode('ascii')
+        return s
+
+    result = RECORD_HEADER.pack(
+            metrics.checksum,
+            design_size.value,
+            metrics.first_char,
+            metrics.last_char,
+            int(metrics.seven_bit_safe),
+            metrics.parc_face_byte,
+            len(char_info),
+            *[len(table) for table in tables],
+            len(dimens),
+            len(kerns),
+            len(ligatures),
+            as_bytes(metrics.character_coding_scheme),
+            as_bytes(metrics.font_identifier),
+            )
+
+    result += struct.pack(f'<{len(char_info)}I', *char_info)
+
+    for table in tables:
+        result += struct.pack(f'<{len(table)}i', *table)
+
+    result += struct.pack(f'<{len(dimens)}i', *sp(dimens))
+    result += struct.pack(f'<{len(kerns)}I', *kerns)
+    result += struct.pack(f'<{len(ligatures)}I', *ligatures)
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(
+            prog = 'yex-font-bundle',
+            description='precompile the metrics of our fonts',
+            )
+
+    resources = importlib.resources.files(yex) / "res"
+
+    parser.add_argument('--fonts-dir', '-f',
+            default=str(resources / "fonts"),
+            help='directory of .tfm files to bundle')
+    parser.add_argument('--output', '-o',
+            default=str(resources / BUNDLE_FILENAME),
+            help='bundle filename')
+
+    args = parser.parse_args()
+
+    filenames = glob.glob(os.path.join(args.fonts_dir, '*.tfm'))
+
+    with open(args.output, 'wb') as f:
+        count = write(filenames, f)
+
+    print(f'{args.output}: bundled {count} of {len(filenames)} fonts')
+
+if __name__=='__main__':
+    main()
@@ -1,5 +1,5 @@
 import yex
-from yex.font.tfm import Tfm, CharacterMetric
+from yex.font.tfm import Tfm, CharacterMetric, lig_kern_table
 from yex.value import Dimen
 from yex.filename import Filename
 
@@ -507,6 +507,8 @@ class DefaultMetrics:
          yex.value.Dimen(50973, 'sp'),
         ]
 
+        self.lig_kern = lig_kern_table(self.kerns, self.ligatures)
+
     def get_character(self, code):
         return self.char_table.get(code)
 
@@ -2,6 +2,8 @@ import logging
 import appdirs
 import os
 import glob
+import io
+import functools
 import importlib.resources
 import yex
 from yex.control.control import Control
@@ -10,6 +12,61 @@ logger = logging.getLogger('yex.general')
 
 APPNAME = 'yex'
 
+# Font files we've already parsed, shared by every Document in this
+# process. See parse_once().
+_parsed = {}
+
+def parse_once(f, parser):
+    """
+    Parses a font file, unless we've parsed the same file before.
+
+    Files are identified by their real path and modification time, so if
+    a file changes, it will be parsed again. Files with no name, such as
+    `io.BytesIO`, are parsed every time.
+
+    The result is shared, so nobody should modify it.
+
+    Args:
+        f (file-like): the font file, open for binary reading.
+        parser (callable): given `f`, returns the parsed form.
+            For example, `yex.font.tfm.Metrics`.
+
+    Returns:
+        whatever `parser` returned.
+    """
+    try:
+        key = (
+                parser,
+                os.path.realpath(f.name),
+                os.fstat(f.fileno()).st_mtime_ns,
+                )
+    except (AttributeError, TypeError, OSError, io.UnsupportedOperation):
+        return parser(f)
+
+    result = _parsed.get(key)
+
+    if result is None:
+        logger.debug("parsing %s", f.name)
+        result = parser(f)
+        _parsed[key] = result
+    else:
+        logger.debug("%s was already parsed", f.name)
+
+    return result
+
+@functools.cache
+def _resource_fonts():
+    """
+    The filenames of the fonts in our resources directory.
+
+    The directory doesn't change while we're running, so we only
+    list it once.
+    """
+    return frozenset([
+        x.name for x in
+        (importlib.resources.files(yex) / "res" / "fonts").iterdir()
+        ])
+
 class Font:
 
     DIMEN_SLANT_PER_PT = 1
@@ -67,6 +124,8 @@ class Font:
             self.name = name
         elif f is not None:
             self.name = os.path.splitext(os.path.basename(f.name))[0]
+        elif source is not None:
+            self.name = os.path.splitext(os.path.basename(source))[0]
         else:
             raise yex.exception.NamelessFontError()
 
@@ -284,7 +343,10 @@ class Font:
             else:
                 raise KeyError(name)
         else:
-            result = get_font_from_name(name)
+            result = cls.from_name(
+                    name = name,
+                    source = state.get('source', name),
+                    )
 
         if 'source' in state:
             result.source = state['source']
@@ -369,16 +431,18 @@ class Font:
                     "  -- checking resources",
                     )
 
-            in_res = [x for x in
-                    (importlib.resources.files(yex) / "res" / "fonts"
-                            ).iterdir()
-                    if x.name==n
-                    ]
-            if in_res:
+            if n in _resource_fonts():
+                bundle = yex.font.bundle.get_bundle()
+                if bundle is not None and n in bundle:
+                    # no need to open it: Tfm will use the bundle instead
+                    logger.debug("    -- found in the metrics bundle")
+                    return (n, None)
+
                 logger.debug("    -- found in resources")
+                in_res = importlib.resources.files(yex) / "res" / "fonts" / n
                 return (
-                        os.path.basename(in_res[0].name),
-                        in_res[0].open('rb'),
+                        os.path.basename(in_res.name),
+                        in_res.open('rb'),
                         )
 
             name_in_font_dir = os.path.join(
@@ -408,17 +472,22 @@ class Font:
             source = os.path.splitext(filename)[0]
             if filename.endswith('.tfm'):
                 from yex.font.tfm import Tfm
+
+                if f is None:
+                    metrics = yex.font.bundle.get_bundle().metrics(filename)
+                else:
+                    metrics = None
+
                 return Tfm(
                         f = f,
                         name = name,
                         source = source,
                         filename = filename,
+                        metrics = metrics,
                         )
             elif filename.endswith('.pk'):
                 from yex.font.pk import Glyphs
-                return Glyphs(
-                        f = f,
-                        )
+                return parse_once(f, Glyphs)
             else:
                 raise ValueError(f"Unknown font format: {filename}")
 
@@ -14,6 +14,22 @@ PK_ID = 89
 
 POINTS_PER_INCH = 72.27
 
+# The number of bytes in each kind of character preamble which follow
+# the character code; packet lengths are counted from after that.
+PREAMBLE_LENGTHS = {
+        'short': 8,
+        'extended': 13,
+        'long': 28,
+        }
+
+# For splitting each byte of a raster into its two nibbles, or its
+# eight bits, using bytes.translate().
+HIGH_NIBBLES = bytes([n>>4 for n in range(256)])
+LOW_NIBBLES = bytes([n & 0xF for n in range(256)])
+BITS = [
+        bytes([0xFF if n & (0x80>>i) else 0x00 for i in range(8)])
+        for n in range(256)]
+
 class _Source:
     """
     Helper class for reading in .pk files.
@@ -100,15 +116,13 @@ class Char:
 
         black = bool(flags & 0x8)
         dyn_f = flags >> 4
-        if dyn_f==14:
-            raise ValueError("bitmap")
 
         preamble_format = flags & 0x7
 
         if preamble_format<4:
             # Short format
 
-            packet_length = s.one_byte_int() + (flags&0x2)<<8
+            packet_length = ((flags&0x3)<<8) + s.one_byte_int()
             self.charcode = s.one_byte_int()
             tfm_width = s.read(3)
             self.dx = 0
@@ -117,11 +131,12 @@ class Char:
             self.height = s.one_byte_int()
             self.h_offset = s.one_byte_int() # XXX signed
             self.v_offset = s.one_byte_int() # XXX signed
+            preamble_length = PREAMBLE_LENGTHS['short']
 
         elif preamble_format<7:
             # Extended short format
 
-            packet_length = s.two_byte_int() + (flags&0x2)<<16
+            packet_length = ((flags&0x3)<<16) + s.two_byte_int()
             self.charcode = s.one_byte_int()
             tfm_width = s.read(3)
             self.dx = 0
@@ -130,8 +145,9 @@ class Char:
             self.height = s.two_byte_int()
             self.h_offset = s.two_byte_int() # XXX signed
             self.v_offset = s.two_byte_int() # XXX signed
+            preamble_length = PREAMBLE_LENGTHS['extended']
         else:
-            # Extended short format
+            # Long format
 
             packet_length = s.four_byte_int()
             self.charcode = s.four_byte_int()
@@ -142,24 +158,60 @@ class Char:
             self.height = s.four_byte_int()
             self.h_offset = s.four_byte_int() # XXX signed
             self.v_offset = s.four_byte_int() # XXX signed
+            preamble_length = PREAMBLE_LENGTHS['long']
+
+        # Read the whole raster at once, and decode it from memory.
+        raster = s.read(packet_length - preamble_length)
+
+        if dyn_f==14:
+            self.glyph = self._unpack_bitmap(raster)
+        else:
+            self.glyph = self._unpack_runs(raster, dyn_f, black)
+
+        s.go_to_byte_boundary()
+
+    def _unpack_bitmap(self, raster):
+        """
+        Decodes a raster which is a plain bitmap.
+
+        Rows aren't padded, so a row may begin in the middle of a byte.
+        """
+        size = self.width*self.height
+
+        if len(raster)*8 < size:
+            raise ValueError("bitmap is too short")
+
+        return b''.join([BITS[b] for b in raster])[:size]
+
+    def _unpack_runs(self, raster, dyn_f, black):
+        """
+        Decodes a raster which is run-length encoded.
+
+        Each run is expanded in one go, rather than pixel by pixel.
+        """
+
+        nibbles = bytearray(len(raster)*2)
+        nibbles[0::2] = raster.translate(HIGH_NIBBLES)
+        nibbles[1::2] = raster.translate(LOW_NIBBLES)
+        nibble = iter(nibbles).__next__
 
         def no_repeat_repeats(n):
             if n[0]!=0:
                 raise ValueError("file contains repeat repeats!")
             return n[1]
 
-        def pk_packed_num():
-            """
-            returns a tuple: (repeat_count, run_count)
+        def pk_packed_num(a):
             """
-            a = s.one_nibble_int()
+            Given the first nibble of a packed number, reads the rest.
 
+            Returns a tuple: (repeat_count, run_count)
+            """
             if a==0:
                 # large run count
 
                 width = 1
                 while True:
-                    j = s.one_nibble_int()
+                    j = nibble()
                     if j==0:
                         width += 1
                     else:
@@ -167,80 +219,82 @@ class Char:
 
                 for i in range(width):
                     j <<= 4
-                    j |= s.one_nibble_int()
+                    j |= nibble()
 
-                result = (0,
-                        (j-15)+(13-dyn_f)*16+dyn_f,
-                        'A',
-                        )
+                return (0, (j-15)+(13-dyn_f)*16+dyn_f)
 
             elif a<=dyn_f:
-                result = (0, a, 'B')
+                return (0, a)
             elif a==14:
-                x1 = pk_packed_num() # s.one_nibble_int()
-                x2 = pk_packed_num()
-                result = (
+                x1 = pk_packed_num(nibble())
+                x2 = pk_packed_num(nibble())
+                return (
                         no_repeat_repeats(x1),
                         no_repeat_repeats(x2),
-                        '4'+x1[2]+x2[2],
                         )
             elif a==15:
-                x2 = pk_packed_num()
-
-                result = (
-                        1,
-                        no_repeat_repeats(x2),
-                        '5'+x2[2],
-                        )
+                x2 = pk_packed_num(nibble())
+                return (1, no_repeat_repeats(x2))
             else:
-                r = s.one_nibble_int()
-                result = (
-                        0,
-                        ((a-dyn_f-1) << 4) +\
-                        r + dyn_f + 1,
-                        'X',
-                        )
-
-            return result
+                r = nibble()
+                return (0, ((a-dyn_f-1) << 4) + r + dyn_f + 1)
 
-        x = y = 0
-        line_repeat_count = 0
-        self.glyph = b''
-        line = b''
+        width = self.width
+        size = width*self.height
 
-        while y<self.height:
-            repeat_count, run_count, v = pk_packed_num()
+        pixel = {True: b'\xFF', False: b'\x00'}
+        glyph = bytearray()
 
-            if run_count>1000000:
-                raise ValueError(f"ludicrously huge run count ({run_count})")
+        # If a row is to be repeated, this is how many extra copies
+        # we need, and the index just past the end of that row.
+        line_repeat_count = 0
+        line_end = 0
+
+        try:
+            while len(glyph)+line_repeat_count*width<size:
+                a = nibble()
+
+                # The usual cases, handled here because it's quicker
+                if 0<a<=dyn_f:
+                    repeat_count, run_count = 0, a
+                elif dyn_f<a<14:
+                    repeat_count = 0
+                    run_count = ((a-dyn_f-1) << 4) + nibble() + dyn_f + 1
+                else:
+                    repeat_count, run_count = pk_packed_num(a)
 
-            if repeat_count!=0:
-                if line_repeat_count!=0:
+                if run_count>1000000:
                     raise ValueError(
+                            f"ludicrously huge run count ({run_count})")
+
+                if repeat_count!=0:
+                    if line_repeat_count!=0:
+                        raise ValueError(
                             "repeat count specified twice on the same line")
-                line_repeat_count = repeat_count
+                    line_repeat_count = repeat_count
+                    line_end = (len(glyph)//width + 1) * width
 
-            for i in range(run_count):
-                if black:
-                    line += b'\xFF'
-                else:
-                    line += b'\x00'
+                glyph += pixel[black]*run_count
 
-                if len(line)>=self.width:
-                    self.glyph += (line * (line_repeat_count+1))
-                    y += line_repeat_count+1
+                if line_repeat_count!=0 and len(glyph)>=line_end:
+                    if line_end+line_repeat_count*width>size:
+                        raise ValueError(
+                            "repeat count was too high "
+                            f"({line_end//width+line_repeat_count}, "
+                            f"needed {self.height})")
 
+                    glyph[line_end:line_end] = \
+                            glyph[line_end-width:line_end] * line_repeat_count
                     line_repeat_count = 0
-                    line = b''
 
-            black = not black
+                black = not black
 
-        if y>self.height:
-            raise ValueError(
-                    "repeat count was too high "
-                    f"({y}, needed {self.height})")
+        except StopIteration:
+            raise ValueError("raster ended early")
 
-        s.go_to_byte_boundary()
+        del glyph[size:]
+
+        return bytes(glyph)
 
     def ascii_art(self):
         def _symbol(b):
@@ -265,22 +319,13 @@ class Char:
                 data=self.glyph,
                 )
 
-        black = Image.new(
-                mode='RGBA',
-                size=(self.width, self.height),
-                color = (0, 0, 0, 255),
-                )
-
+        # Black, wherever the letter is.
         result = Image.new(
                 mode='RGBA',
                 size=(self.width, self.height),
-                color = (0, 255, 0, 0),
-                )
-
-        result.paste(
-                im = black,
-                mask = letter,
+                color = (0, 0, 0, 0),
                 )
+        result.putalpha(letter)
 
         return result
 
@@ -3,7 +3,7 @@ import os
 import math
 import warnings
 from collections import namedtuple
-from yex.font.font import Font
+from yex.font.font import Font, parse_once
 import logging
 import yex.value
 import yex.font.pk
@@ -30,6 +30,7 @@ class Tfm(Font):
             f,
             size = None,
             scale = None,
+            metrics = None,
             *args, **kwargs,
             ):
 
@@ -37,7 +38,12 @@ class Tfm(Font):
 
         self.size = size
         self.scale = scale
-        self.metrics = Metrics(f)
+
+        if metrics is None:
+            self.metrics = parse_once(f, Metrics)
+        else:
+            # precompiled; see yex.font.bundle
+            self.metrics = metrics
         self._glyphs = None
 
     @property
@@ -56,6 +62,42 @@ class CharacterMetric(namedtuple(
     "parent",
     )):
 
+    @classmethod
+    def from_word(cls, codepoint, word, parent):
+        """
+        Decodes a char_info word, as found in a .tfm file.
+
+        Args:
+            codepoint (`int`): the character this word describes.
+            word (`int`): the word itself.
+            parent (`Metrics`): the metrics holding the tables
+                which the word indexes.
+        """
+        return cls(
+                codepoint,
+                (word & 0xFF000000) >> 24,
+                (word & 0x00F00000) >> 20,
+                (word & 0x000F0000) >> 16,
+                (word & 0x0000FD00) >> 10,
+                (word & 0x00000300) >> 8,
+                (word & 0x000000FF),
+                parent = parent,
+                )
+
+    @property
+    def word(self):
+        """
+        The char_info word this metric was decoded from.
+        """
+        return (
+                self.width_idx << 24 |
+                self.height_idx << 20 |
+                self.depth_idx << 16 |
+                self.char_ic_idx << 10 |
+                self.tag_code << 8 |
+                self.remainder
+                )
+
     @property
     def tag(self):
         return [
@@ -93,6 +135,45 @@ class CharacterMetric(namedtuple(
                        'tag': self.tag,
                        }
 
+def lig_kern_table(kerns, ligatures):
+    """
+    Indexes a font's kerns and ligatures by character code.
+
+    The result is a list with an entry for each of the 256 possible
+    left-hand characters. Each entry is either None, if that character
+    begins no kerns or ligatures, or a dict mapping the code of each
+    right-hand character to a pair `(kern, ligature)`. One of those is
+    a Dimen or a str, and the other is None.
+
+    This is much like the per-character instructions in the lig/kern
+    program of a .tfm file, but it's already been run. If a pair has
+    both a kern and a ligature, the kern wins, just as it does in
+    `WordBox`.
+
+    Args:
+        kerns (dict): maps two-character strings to Dimens.
+        ligatures (dict): maps two-character strings to the
+            character which replaces them.
+
+    Returns:
+        `list`
+    """
+    result = [None] * 256
+
+    for table, make_entry in [
+            (ligatures, lambda v: (None, v)),
+            (kerns, lambda v: (v, None)),
+            ]:
+        for pair, v in table.items():
+            left, right = ord(pair[0]), ord(pair[1])
+
+            if result[left] is None:
+                result[left] = {}
+
+            result[left][right] = make_entry(v)
+
+    return result
+
 class Metrics:
     """
     Font metrics, from .tfm files.
@@ -101,6 +182,8 @@ class Metrics:
     for details of the format.
     """
 
+    _lig_kern = None
+
     def __init__(self, f):
 
         def unfix(n, em_size=10.0):
@@ -208,16 +291,7 @@ class Metrics:
 
         self.char_table = dict([
             (charcode,
-            CharacterMetric(
-                charcode,
-                (value & 0xFF000000) >> 24,
-                (value & 0x00F00000) >> 20,
-                (value & 0x000F0000) >> 16,
-                (value & 0x0000FD00) >> 10,
-                (value & 0x00000300) >> 8,
-                (value & 0x000000FF),
-                parent = self,
-                    ))
+            CharacterMetric.from_word(charcode, value, parent = self))
             for charcode, value in
             enumerate(
                 finfo,
@@ -309,6 +383,18 @@ class Metrics:
                     f.read(self.param_count*4)))
                 ])
 
+    @property
+    def lig_kern(self):
+        """
+        The kerns and ligatures, indexed by character code.
+
+        See `lig_kern_table` for the details.
+        """
+        if self._lig_kern is None:
+            self._lig_kern = lig_kern_table(self.kerns, self.ligatures)
+
+        return self._lig_kern
+
     def print_char_table(self):
         for f,v in self.char_table.items():
             if f>31 and f<127:
@@ -2,13 +2,13 @@ import logging
 import copy
 import collections
 import base64
+from html import escape
 import io
 import string
 import os
 import importlib.resources
 import yex
 from yex.output import Output
-from bs4 import BeautifulSoup
 
 logger = logging.getLogger('yex.general')
 
@@ -17,6 +17,12 @@ SP_PER_PIXEL = (72*65536)/96 # exactly 49152
 
 WIDTH_OF_MAIN_IN_SP = 350.0 * SP_PER_PIXEL
 
+# Where the pages go in base.html: just after this...
+MAIN_OPENING = '<main role="main">'
+
+# ...and where the styles go: just before this.
+BODY_CLOSING = '</body>'
+
 class Html(Output):
 
     filename_extension = 'html'
@@ -38,9 +44,22 @@ class Html(Output):
         with (importlib.resources.files(
                 yex) / "res" / "output" / "html" / "base.html"
                 ).open('r') as base:
-            self.result = BeautifulSoup(base,
-            features="lxml",
-                    )
+            base = base.read()
+
+        # We write the output as we go, rather than building it all
+        # in memory first. So base.html gets split into the part before
+        # the pages, and the part after them.
+        opening = base.index(MAIN_OPENING) + len(MAIN_OPENING)
+        closing = base.rindex(BODY_CLOSING)
+
+        self.prologue = base[:opening]
+        self.between = base[opening:closing]
+        self.epilogue = base[closing:]
+
+        # True once begin() has opened the file. After that, the pages
+        # have gone to the file rather than to doc.contents, so render()
+        # mustn't start the file again.
+        self.begun = False
 
         logger.debug("html: loaded base from base.html")
 
@@ -49,16 +68,41 @@ class Html(Output):
         return file_extension in ['html', 'htm']
 
     def render(self):
+        if self.begun:
+            logger.debug(
+                    "html: not rendering, because we've already begun "
+                    "writing to %s", self.filename)
+            return
 
-        self.main_block = self.result.find(role='main')
-        self.responsive_para = None
+        self.begin()
 
         for page in self.doc.contents:
-            for thing in page:
-                self._handle(thing, self.main_block, depth=0)
+            self.page(page)
+
+        self.end()
+
+    def begin(self):
+        self.responsive_para = None
+
+        logger.debug("html: writing to %s", self.filename)
+
+        self.begun = True
+        self.out = open(self.filename, 'w')
+        self.out.write(self.prologue)
+
+    def page(self, page):
+        logger.debug("html: writing page: %s", page)
+
+        for thing in page:
+            self._handle(thing, self.out, depth=0)
 
-        self._add_styles()
-        self._write_out()
+    def end(self):
+        self.out.write(self.between)
+        self.out.write(self._styles())
+        self.out.write(self.epilogue)
+        self.out.close()
+
+        self._copy_extras()
 
     @classmethod
     def _generate_written_words(cls, lines,
@@ -186,7 +230,7 @@ class Html(Output):
 
         return result
 
-    def _handle(self, item, html_container, depth):
+    def _handle(self, item, out, depth):
 
         logger.debug("html: %20s %*srendering: %s",
                 self.current_line_lengths, depth, '', item)
@@ -200,85 +244,81 @@ class Html(Output):
                     f"Don't know how to handle {item} "
                     f"(which is a {item.__class__.__name__})")
 
-        handler(item, html_container, depth)
+        handler(item, out, depth)
 
-    def _handle_vbox(self, item, html_container, depth):
-        new_block = self.result.new_tag('p')
-        new_block['class'] = 'vbox'
-        html_container.append(new_block)
+    def _handle_vbox(self, item, out, depth):
+        out.write(start_tag('p', cls='vbox'))
 
         written_words = self._generate_written_words(item)
 
         width_boxes = self._generate_width_boxes(written_words)
 
-        logger.debug("html: %*spopulating vbox: %s", depth, '', new_block)
+        logger.debug("html: %*spopulating vbox: %s", depth, '', item)
         for width_box in width_boxes:
-            html_width_box = self.result.new_tag('span')
-            html_width_box['class'] = width_box.css_class
-            new_block.append(html_width_box)
+            out.write(start_tag('span', cls=width_box.css_class))
 
             logger.debug("html: %*spopulating width box: %s",
-                    depth+1, '', html_width_box)
+                    depth+1, '', width_box)
 
             for word in width_box:
-                self._handle(word.word, html_width_box, depth+2)
+                self._handle(word.word, out, depth+2)
+
+            out.write('</span>')
 
             for eol in width_box.end_of_line_breaks(html=self):
-                new_block.append(eol)
+                out.write(eol)
 
-    def _handle_page(self, item, html_container, depth):
-        self._handle_vbox(item, html_container, depth)
+        out.write('</p>')
 
-    def _handle_hbox(self, item, html_container, depth):
-        new_block = self.result.new_tag('span')
-        new_block['class'] = 'yex_hbox'
-        html_container.append(new_block)
+    def _handle_page(self, item, out, depth):
+        self._handle_vbox(item, out, depth)
+
+    def _handle_hbox(self, item, out, depth):
+        out.write(start_tag('span', cls='yex_hbox'))
 
         for thing in item.contents:
-            self._handle(thing, new_block, depth+1)
+            self._handle(thing, out, depth+1)
 
-    def _handle_box(self, item, html_container, depth):
-        new_block = self.result.new_tag('span')
-        new_block['class'] = 'yex_box'
+        out.write('</span>')
 
+    def _handle_box(self, item, out, depth):
         style = (
                 'display:inline-block;'
                 f'width:{px(item.width)};'
                 f'height:{px(item.height)};'
                 )
 
-        new_block['style'] = style
-
-        html_container.append(new_block)
+        out.write(start_tag('span', cls='yex_box', style=style))
+        out.write('</span>')
 
-    def _handle_wordbox(self, item, html_container, depth):
-        word = self.result.new_tag('span')
-        word['class'] = 'word'
-        word['style'] = 'max-width: '+str(item.width)
-        word.append(item.ch)
+    def _handle_wordbox(self, item, out, depth):
+        out.write(start_tag('span',
+            cls='word',
+            style='max-width: '+str(item.width),
+            ))
+        out.write(escape(item.ch, quote=False))
+        out.write('</span>')
 
         self.current_line_lengths = [
                 w+item.width for w in self.current_line_lengths]
 
-        html_container.append(word)
-
-    def _handle_leader(self, item, html_container, depth):
+    def _handle_leader(self, item, out, depth):
         return
 
-        spacer = self.result.new_tag('u')
-        spacer['class'] = 'b'
-        spacer['style'] = 'width: '+str(item.space)
-        spacer.append('\n') # some actual whitespace, in case of no CSS
-
-        html_container.append(spacer)
+        out.write(start_tag('u',
+            cls='b',
+            style='width: '+str(item.space),
+            ))
+        out.write('\n') # some actual whitespace, in case of no CSS
+        out.write('</u>')
 
-    def _handle_discretionarybreak(self, item, html_container, depth):
+    def _handle_discretionarybreak(self, item, out, depth):
         pass
 
-    def _handle_penalty(self, item, html_container, depth):
+    def _handle_penalty(self, item, out, depth):
         pass
 
-    def _handle_whatsit(self, item, html_container, depth):
+    def _handle_whatsit(self, item, out, depth):
         result = item()
 
         if result is None:
@@ -301,7 +341,12 @@ class Html(Output):
             logger.debug("html: ignoring special that isn't for us: %s",
                     result)
 
-    def _add_styles(self):
+    def _styles(self):
+        """
+        Returns a <style> element for the CSS classes we've used.
+
+        This can only be known once all the pages have been written.
+        """
 
         style = ''
         DEBUG_COLOURS = ['red', 'green', 'yellow', 'blue', 'magenta',
@@ -338,15 +383,9 @@ class Html(Output):
 {WidthBox.styles_for_all_classes(i)}
         '''
 
-        style_tag = self.result.new_tag('style')
-        style_tag.append(style)
-        self.result.find('head').append(style_tag)
-
-    def _write_out(self):
-        logger.debug("html: writing to %s", self.filename)
-        with open(self.filename, 'w') as out:
-            out.write(str(self.result))
+        return '<style>' + style + '</style>\n'
 
+    def _copy_extras(self):
         base_dir = os.path.dirname(self.filename)
         for extra in [
                 'cmr10.ttf',
@@ -363,6 +402,29 @@ class Html(Output):
 
         logger.debug("html: done!")
 
+def start_tag(name, cls=None, style=None):
+    """
+    Returns the start tag of an HTML element.
+
+    Args:
+        name (`str`): the name of the element, such as "span".
+        cls (`str` or `None`): the value of the "class" attribute.
+        style (`str` or `None`): the value of the "style" attribute.
+
+    Returns:
+        `str`
+    """
+    result = '<' + name
+
+    for attr, value in [
+            ('class', cls),
+            ('style', style),
+            ]:
+        if value is not None:
+            result += f' {attr}="{escape(value)}"'
+
+    return result + '>'
+
 def px(width):
     if isinstance(width, yex.value.Dimen):
         width = width.value
@@ -536,8 +598,7 @@ class WidthBox:
             total_length = html.widths[i]
             current_length = html.current_line_lengths[i]
 
-            br = html.result.new_tag('br')
-            br['class'] = f'b{i}'
+            br = start_tag('br', cls=f'b{i}')
             html.current_line_lengths[i] = yex.value.Dimen()
 
             logger.debug('      -- created end-of-line br: %s',
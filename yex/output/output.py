@@ -22,6 +22,36 @@ class Output:
         """
         raise NotImplementedError()
 
+    def begin(self):
+        """
+        Called before the first page is sent to this driver.
+
+        By default, this does nothing.
+        """
+        pass
+
+    def page(self, page):
+        """
+        Called with each page, as soon as it's finished.
+
+        By default, the page is kept in the document's `contents`,
+        so that `render()` can write them all out at the end. Drivers
+        which can write pages one at a time should override this,
+        so that the pages needn't all be kept in memory.
+
+        Args:
+            page (`Box`): the page.
+        """
+        self.doc.contents.append(page)
+
+    def end(self):
+        """
+        Called when the document is saved, after the last page.
+
+        By default, this calls `render()`.
+        """
+        self.render()
+
     @classmethod
     def can_handle(cls, format):
         """
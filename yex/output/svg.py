@@ -7,6 +7,7 @@ import logging
 import copy
 import collections
 import base64
+import functools
 import io
 import string
 
@@ -14,6 +15,33 @@ logger = logging.getLogger('yex.general')
 
 SCALED_PTS_PER_PIXEL = 1.333 * 65536.0 # yes, but why?
 
+# How many encoded glyph images we keep, across all documents.
+GLYPH_CACHE_SIZE = 1024
+
+@functools.lru_cache(maxsize=GLYPH_CACHE_SIZE)
+def _encode_glyph(glyph):
+    """
+    Renders a glyph as a PNG, in a data URL.
+
+    Glyphs are shared between fonts loaded from the same .pk file,
+    so each glyph only gets rendered once, however many documents use it.
+
+    Args:
+        glyph (`yex.font.pk.Char`): the glyph.
+
+    Returns:
+        a tuple of the URL, the width, and the height.
+    """
+    image = glyph.image
+
+    with io.BytesIO() as b:
+        image.save(b, format='PNG')
+        result = b'data:image/png;base64,'+base64.b64encode(
+                b.getbuffer())
+        result = result.decode('ASCII')
+
+    return result, image.width, image.height
+
 class Svg(Output):
 
     filename_extension = 'svg'
@@ -35,12 +63,17 @@ class Svg(Output):
                 }
 
         self.document = _Document(driver=self)
-        self.page = _Page(driver=self)
+        self.current_page = _Page(driver=self)
 
-        self.document.add_another(self.page)
+        self.document.add_another(self.current_page)
 
         self.names = collections.Counter()
 
+        # Maps each glyph we've used to the params of its <symbol>.
+        # Each <symbol> is written once, and every character which
+        # uses that glyph refers to it.
+        self.symbols = {}
+
     @classmethod
     def can_handle(cls, file_extension):
         return file_extension in ['svg']
@@ -55,7 +88,7 @@ class Svg(Output):
 
         svgclass = yexbox.__class__.__name__.lower()
 
-        parent = parent or self.page
+        parent = parent or self.current_page
 
         x = x or Dimen()
         y = y or self.params['pageheight']
@@ -65,7 +98,7 @@ class Svg(Output):
         box_x = x+self.params['gutter']*2
         box_y = (y-yexbox.height)+self.params['gutter']*2
 
-        if parent==self.page:
+        if parent==self.current_page:
             self.params['pagewidth'] = max(
                     self.params['pagewidth'],
                     yexbox.width,
@@ -84,6 +117,7 @@ class Svg(Output):
                     x = box_x,
                     y = box_y,
                     ch = yexbox.ch,
+                    font = yexbox.font,
                     width=yexbox.width,
                     height=yexbox.height+yexbox.depth,
                     )
@@ -112,7 +146,7 @@ class Svg(Output):
             else:
                 x = x + unless_inherit(yexanother.width)
 
-        if parent==self.page:
+        if parent==self.current_page:
             self.params['pageheight'] += yexbox.height+yexbox.depth
 
         logger.debug("%*sdone: %s",
@@ -124,16 +158,33 @@ class Svg(Output):
         self.names[base] += 1
         return '%s%d' % (base, self.names[base])
 
-    def glyph(self, ch):
-        image = self.doc['_font'][ch].glyph.image
+    def glyph(self, font, ch):
+        """
+        Finds the <symbol> for a character, creating it if need be.
+
+        Args:
+            font (`Font`): the font the character is in.
+            ch (`str`): the character.
+
+        Returns:
+            the id of the <symbol>.
+        """
+        glyph = font[ch].glyph
 
-        with io.BytesIO() as b:
-            image.save(b, format='PNG')
-            result = b'data:image/png;base64,'+base64.b64encode(
-                    b.getbuffer())
-            result = result.decode('ASCII')
+        result = self.symbols.get(glyph)
 
-        return result, image.width, image.height
+        if result is None:
+            href, width, height = _encode_glyph(glyph)
+
+            result = {
+                    'id': self.name('glyph'),
+                    'href': href,
+                    'cwidth': width,
+                    'cheight': height,
+                    }
+            self.symbols[glyph] = result
+
+        return result['id']
 
     def render(self):
 
@@ -142,7 +193,7 @@ class Svg(Output):
                 self.add_box(box)
 
         # good grief, this is hacky
-        the_hbox = self.page.anotherren[0]
+        the_hbox = self.current_page.anotherren[0]
 
         edges = self.params['gutter']*4
 
@@ -213,6 +264,9 @@ class _Document(_Element):
     def params(self, others):
 
         result = others | {
+                'defs': ''.join([
+                    yex.output.svg_template.SYMBOL % symbol
+                    for symbol in self.driver.symbols.values()]),
                 'docwidth': others['pagewidth']*len(self.anotherren) + \
                         others['gutter']*2,
                 'docheight': others['pageheight'] + others['gutter']*2,
@@ -272,16 +326,13 @@ class _Char(_Element):
             driver,
             svgclass,
             ch,
+            font,
             **kwargs):
         super().__init__(driver)
         self._params = copy.deepcopy(kwargs)
         self._params['class'] = svgclass
         self._params['letter'] = ch
-
-        # TODO Later, we should implement subsequent uses of the same
-        # character using clones.
-        self._params['href'], self._params['cwidth'], \
-                self._params['cheight'] = driver.glyph(ch)
+        self._params['glyph'] = driver.glyph(font, ch)
 
     def params(self, others):
         parent_x = others['x']
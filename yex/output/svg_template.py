@@ -54,6 +54,9 @@ DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
         fill-opacity: 1;
     }
     </style>
+  <defs>
+%(defs)s
+  </defs>
   <g>
 %(contents)s
   </g>
@@ -72,8 +75,16 @@ BOX = """
 
 CHAR = """
     <rect id="%(id)s" class="%(class)s" width="%(width)s" height="%(height)s" x="%(x)s" y="%(y)s" />
-    <image id="i%(id)s" class="%(class)s" width="%(width)s" height="%(height)s" x="%(x)s" y="%(y)s"
-        xlink:href="%(href)s"
+    <use id="i%(id)s" class="%(class)s" width="%(width)s" height="%(height)s" x="%(x)s" y="%(y)s"
+        xlink:href="#%(glyph)s"
         />
 
 """
+
+SYMBOL = """
+    <symbol id="%(id)s" viewBox="0 0 %(cwidth)s %(cheight)s">
+      <image width="%(cwidth)s" height="%(cheight)s"
+        xlink:href="%(href)s"
+        />
+    </symbol>
+"""
@@ -28,4 +28,5 @@ __all__ = [
         'Location',
         'Afterwards',
         'Pushback',
+        'Segment',
         ]
@@ -176,6 +176,10 @@ class Expander:
                 raise ValueError(
                         'unless bounded is "no", on_eof must be "exhaust"')
 
+        # Checked once, here, rather than on every call to next().
+        # Most runs aren't tracing, and we're called for every token.
+        self._debugging = logger.isEnabledFor(logging.DEBUG)
+
         self.bounded = bounded
         self.level = _runlevel_by_name(level)
         self.on_eof = on_eof
@@ -186,6 +190,9 @@ class Expander:
         self.doc = doc
         self.pushback = pushback
 
+        # Expanders we've made with another(); see there.
+        self._variants = {}
+
         if isinstance(source, Tokeniser):
             self.source = source
 
@@ -218,10 +225,11 @@ class Expander:
                 ]:
             setattr(self, name, getattr(self.source, name))
 
-        logger.debug("%s: ready; called from %s",
-                self,
-                yex.util.show_caller,
-                )
+        if self._debugging:
+            logger.debug("%s: ready; called from %s",
+                    self,
+                    yex.util.show_caller,
+                    )
 
     def __iter__(self):
         return _ExpanderIterator(self)
@@ -239,9 +247,49 @@ class Expander:
         `bounded` will revert to `'no'` unless it's specified in `kwargs`.
         All other settings will be copied from this Expander.
 
+        Unbounded Expanders on the same source keep no state of their own,
+        apart from a delegate. So if we're asked for one of those, and
+        we've made one just like it before which is still on our source
+        and has no delegate, we return that rather than making another.
+        Controls ask for these all the time, so this saves a lot of work.
+
         Returns:
             `Expander`
         """
+        if not kwargs:
+            return self
+
+        if kwargs.keys() <= self._VARIANT_PARAMS and \
+                kwargs.get('bounded', 'no')=='no':
+
+            key = (
+                    kwargs.get('level', self.level),
+                    kwargs.get('on_eof', self.on_eof),
+                    kwargs.get('no_outer', self.no_outer),
+                    )
+
+            if key==(self.level, self.on_eof, self.no_outer):
+                return self
+
+            result = self._variants.get(key)
+
+            if result is not None and result.source is self.source and \
+                    result.delegate is None:
+                return result
+
+            result = self._another(kwargs)
+            self._variants[key] = result
+            return result
+
+        return self._another(kwargs)
+
+    # Parameters which another() can find among self._variants.
+    # Not on_push, because that's usually a new object every time.
+    _VARIANT_PARAMS = frozenset([
+        'level', 'on_eof', 'no_outer', 'bounded',
+        ])
+
+    def _another(self, kwargs):
         our_params = {
                 'source': self.source,
                 'bounded': 'no',
@@ -257,21 +305,23 @@ class Expander:
             new_params['pushback'] = self.pushback.another()
 
         if our_params==new_params:
-            logger.debug(
-                    ( "%s: not spawning another Expander; no changes "
-                    "requested (called from %s)"),
-                    self,
-                    yex.util.show_caller,
-                    )
+            if self._debugging:
+                logger.debug(
+                        ( "%s: not spawning another Expander; no changes "
+                        "requested (called from %s)"),
+                        self,
+                        yex.util.show_caller,
+                        )
             return self
         else:
-            logger.debug(
-                    ("%s: spawning another Expander with changes: %s; "
-                    "called from %s"),
-                    self,
-                    kwargs,
-                    yex.util.show_caller,
-                    )
+            if self._debugging:
+                logger.debug(
+                        ("%s: spawning another Expander with changes: %s; "
+                        "called from %s"),
+                        self,
+                        kwargs,
+                        yex.util.show_caller,
+                        )
             result = Expander(**new_params)
             return result
 
@@ -306,8 +356,9 @@ class Expander:
         else:
             assert False, f'unknown runlevel: {source.level}'
 
-        logger.debug("%s:     -- found %s",
-                self, result)
+        if self._debugging:
+            logger.debug("%s:     -- found %s",
+                    self, result)
 
         if self.bounded!='no' and self._bounded_limit is None:
             # This must be the first next() since we started.
@@ -317,9 +368,11 @@ class Expander:
                 # we need to read a balanced pair.
                 self._bounded_limit = self.pushback.group_depth
 
-                logger.debug(
-                        "%s:        -- opens bounded expansion, read again",
-                        self)
+                if self._debugging:
+                    logger.debug(
+                            ("%s:        -- opens bounded expansion, "
+                            "read again"),
+                            self)
                 result = self.next()
             elif self.bounded=='balanced':
                 # First result wasn't a BeginningGroup,
@@ -329,35 +382,41 @@ class Expander:
             else:
                 # First result wasn't a BeginningGroup,
                 # so we handle it and then stop.
-                logger.debug("%s:  -- the only symbol in a bounded expansion",
-                        self)
+                if self._debugging:
+                    logger.debug(
+                            "%s:  -- the only symbol in a bounded expansion",
+                            self)
                 self.source = None
 
         if self._bounded_limit is not None:
             if self.pushback.group_depth < self._bounded_limit:
-                logger.debug(
-                        ('%s: end of bounded expansion: group depth is %s, '
-                        'which is below the starting limit, %s'
-                            ),
-                        self, self.pushback.group_depth,
-                        self._bounded_limit,
-                        )
+                if self._debugging:
+                    logger.debug(
+                            ('%s: end of bounded expansion: '
+                            'group depth is %s, '
+                            'which is below the starting limit, %s'
+                                ),
+                            self, self.pushback.group_depth,
+                            self._bounded_limit,
+                            )
                 self.source = None
                 result = None
 
         if result is None:
 
             if self.delegate is not None:
-                logger.debug(
-                        ('%s: delegate %s is all done; '
-                        'carrying on with our own stuff'),
-                        self, self.delegate,
-                        )
+                if self._debugging:
+                    logger.debug(
+                            ('%s: delegate %s is all done; '
+                            'carrying on with our own stuff'),
+                            self, self.delegate,
+                            )
                 self.delegate = None
                 return self.next(**kwargs)
 
             if source.on_eof=="raise":
-                logger.debug("%s: unexpected EOF", self)
+                if self._debugging:
+                    logger.debug("%s: unexpected EOF", self)
                 raise yex.exception.UnexpectedEOFError()
             elif source.on_eof=="exhaust":
                 raise StopIteration
@@ -368,14 +427,16 @@ class Expander:
 
         assert self.delegate is not None
 
-        logger.debug("%s: delegating to %s, with kwargs %s",
-                self, self.delegate, kwargs)
+        if self._debugging:
+            logger.debug("%s: delegating to %s, with kwargs %s",
+                    self, self.delegate, kwargs)
 
         result = self.delegate.next(**kwargs)
 
         if result is None:
-            logger.debug("%s: delegate %s is exhausted",
-                    self, self.delegate)
+            if self._debugging:
+                logger.debug("%s: delegate %s is exhausted",
+                        self, self.delegate)
             self.delegate = None
             return self.next(**kwargs)
 
@@ -399,15 +460,12 @@ class Expander:
 
             # We have to enforce no_outer.
 
-            referent = self.doc.get(
-                    result.identifier,
-                    default = None,
-                    param_control = True,
-                    )
+            referent = self.doc.lookup(result.identifier)
 
             if getattr(referent, 'is_outer', False):
-                logger.debug("%s: -- which -> %s, which is outer",
-                        self, referent)
+                if self._debugging:
+                    logger.debug("%s: -- which -> %s, which is outer",
+                            self, referent)
                 raise yex.exception.OuterOutOfPlaceError(
                         problem = result.identifier,
                         )
@@ -432,8 +490,9 @@ class Expander:
             Expander
         """
         if self.delegate is not None:
-            logger.debug("%s: delegating to %s",
-                    self, self.delegate)
+            if self._debugging:
+                logger.debug("%s: delegating to %s",
+                        self, self.delegate)
 
             return self.delegate
         else:
@@ -454,18 +513,26 @@ class Expander:
             if self._bounded_limit is not None and self.source is not None:
                 if self.pushback.group_depth < self._bounded_limit:
                     self.source = None
-                    logger.debug("%s: end of bounded expansion", self)
+                    if self._debugging:
+                        logger.debug("%s: end of bounded expansion", self)
 
             if self.source is None:
-                logger.debug("%s: all done; returning None", self)
+                if self._debugging:
+                    logger.debug("%s: all done; returning None", self)
                 return None
 
             token = next(self.source)
 
-            logger.debug("%s: token: %s",
-                    self,
-                    token,
-                    )
+            if not self.doc.ifdepth[-1] and \
+                    self.level>=RunLevel.EXPANDING and \
+                    not self.no_outer:
+                token = self._skip_false_branch(token)
+
+            if self._debugging:
+                logger.debug("%s: token: %s",
+                        self,
+                        token,
+                        )
 
             if not hasattr(token, 'category'):
                 # Not a token. Could be a Control, could be some
@@ -474,79 +541,88 @@ class Expander:
                 if self.doc.ifdepth[-1]:
 
                     if hasattr(token, 'is_array') and token.is_array:
-                        logger.debug(
-                            "%s  -- not a token: %s; looking up index",
-                                self, token,)
+                        if self._debugging:
+                            logger.debug(
+                                "%s  -- not a token: %s; looking up index",
+                                    self, token,)
 
                         token = token.get_element_from_tokens(self)
-                        logger.debug("%s  -- found: %s; passing through",
-                                self, token,)
+                        if self._debugging:
+                            logger.debug("%s  -- found: %s; passing through",
+                                    self, token,)
                         self.source.eat_whitespace_after_control()
 
                     else:
-                        logger.debug("%s  -- not a token; "
-                                "passing through: %s",
-                                self, token,)
+                        if self._debugging:
+                            logger.debug("%s  -- not a token; "
+                                    "passing through: %s",
+                                    self, token,)
 
                     return token
                 else:
-                    logger.debug("%s  -- not passing %s because "
-                            "of a conditional",
-                            self, token)
+                    if self._debugging:
+                        logger.debug("%s  -- not passing %s because "
+                                "of a conditional",
+                                self, token)
                     continue
 
             if isinstance(token, (Control, yex.parse.Active)):
 
                 name = token.identifier
 
-                handler = self.doc.get(name,
-                        default=None,
-                        param_control=True)
+                handler = self.doc.lookup(name)
 
                 if handler is None:
                     if self.doc.ifdepth[-1]:
-                        logger.debug(
-                                "%s: %s is undefined; returning it",
-                                self, token)
+                        if self._debugging:
+                            logger.debug(
+                                    "%s: %s is undefined; returning it",
+                                    self, token)
                         return token
                     else:
-                        logger.debug(
-                                "%s: %s is undefined; not returning it "
-                                "because of a conditional",
-                                self, token)
+                        if self._debugging:
+                            logger.debug(
+                                    "%s: %s is undefined; not returning it "
+                                    "because of a conditional",
+                                    self, token)
                         continue
 
                 elif self.level>=RunLevel.EXPANDING and \
                         handler.is_array and \
                         self.doc.ifdepth[-1]:
 
-                    logger.debug((
-                        "%s: found control %s (which is a %s) "
-                        "and it's an array; looking up an element"),
-                        self, handler, type(handler))
+                    if self._debugging:
+                        logger.debug((
+                            "%s: found control %s (which is a %s) "
+                            "and it's an array; looking up an element"),
+                            self, handler, type(handler))
 
                     index = yex.value.Value.get_value_from_tokens(self)
 
-                    logger.debug("%s:   -- element %s",
-                        self, index)
+                    if self._debugging:
+                        logger.debug("%s:   -- element %s",
+                            self, index)
 
                     handler = handler.get_element(index=index)
 
-                    logger.debug("%s:   -- element %s found: %s",
-                        self, index, handler)
+                    if self._debugging:
+                        logger.debug("%s:   -- element %s found: %s",
+                            self, index, handler)
                     self.source.eat_whitespace_after_control()
 
                 if not isinstance(handler, yex.control.Expandable):
                     if self.doc.ifdepth[-1]:
-                        logger.debug(
-                                '%s: %s is unexpandable; returning it',
-                                self, handler)
+                        if self._debugging:
+                            logger.debug(
+                                    '%s: %s is unexpandable; returning it',
+                                    self, handler)
                         return handler
                     else:
-                        logger.debug(
-                                '%s: %s is unexpandable; not returning it '
-                                'because of a conditional',
-                                self, handler)
+                        if self._debugging:
+                            logger.debug(
+                                    '%s: %s is unexpandable; not returning it '
+                                    'because of a conditional',
+                                    self, handler)
                         continue
 
                 elif self.no_outer and getattr(handler, "is_outer", False):
@@ -560,9 +636,11 @@ class Expander:
                     # if it's a control or active character, we must
                     # raise an error if it's "outer", even if we're
                     # not expanding.
-                    logger.debug(
-                            "%s: we're not expanding; returning control: %s",
-                            self, handler)
+                    if self._debugging:
+                        logger.debug(
+                                ("%s: we're not expanding; "
+                                "returning control: %s"),
+                                self, handler)
                     return handler
 
                 elif self.doc.ifdepth[-1] or \
@@ -578,8 +656,9 @@ class Expander:
                     # See p215 of the TeXbook, and
                     # test_register_table_name_in_message().)
 
-                    logger.debug("%s: calling %s",
-                            self, handler)
+                    if self._debugging:
+                        logger.debug("%s: calling %s",
+                                self, handler)
 
                     # control exists, so run it.
 
@@ -588,48 +667,94 @@ class Expander:
                                 on_eof="none"),
                             )
 
-                    logger.debug("%s: finished calling %s (%s)",
-                            self, handler, type(handler))
+                    if self._debugging:
+                        logger.debug("%s: finished calling %s (%s)",
+                                self, handler, type(handler))
 
                     if received is not None:
-                        logger.debug('%s:   -- received: %s',
-                                self, received)
+                        if self._debugging:
+                            logger.debug('%s:   -- received: %s',
+                                    self, received)
                         return received
 
                 else:
-                    logger.debug("%s: not executing %s because "+\
-                            "we're inside a conditional block",
-                            self,
-                            handler,
-                            )
+                    if self._debugging:
+                        logger.debug("%s: not executing %s because "+\
+                                "we're inside a conditional block",
+                                self,
+                                handler,
+                                )
 
             elif isinstance(token, Internal):
-                logger.debug("%s:  -- running internal token: %s",
-                        self,
-                        token,
-                        )
+                if self._debugging:
+                    logger.debug("%s:  -- running internal token: %s",
+                            self,
+                            token,
+                            )
                 token(self)
 
             elif self.level<RunLevel.EXPANDING:
-                logger.debug(
-                        "%s: we're not expanding; returning %s",
-                        self,
-                        token,
-                        )
+                if self._debugging:
+                    logger.debug(
+                            "%s: we're not expanding; returning %s",
+                            self,
+                            token,
+                            )
                 return token
 
             elif self.doc.ifdepth[-1]:
-                logger.debug("%s:  -- returning: %s",
-                        self,
-                        token,
-                        )
+                if self._debugging:
+                    logger.debug("%s:  -- returning: %s",
+                            self,
+                            token,
+                            )
                 return token
             else:
-                logger.debug(
-                        "%s:  -- dropping because of conditional: %s",
-                        self,
-                        token,
-                        )
+                if self._debugging:
+                    logger.debug(
+                            "%s:  -- dropping because of conditional: %s",
+                            self,
+                            token,
+                            )
+
+    def _skip_false_branch(self, token):
+        r"""
+        Skips over tokens in a false conditional block.
+
+        Most things in a false conditional block would be dropped
+        anyway. So rather than look up each control we find, we only
+        check whether its name is one which must run even here; see
+        `ControlsTable.unskippable`. Everything else is thrown away
+        unseen.
+
+        Only use this at levels where we'd be expanding, and not when
+        no_outer is set: \outer controls raise an error even in false
+        blocks, and we can't tell which they are without looking them up.
+
+        Args:
+            token: the token we just read.
+
+        Returns:
+            the first token, starting with `token`, which needs the usual
+            handling. That's an unskippable control, an Internal token,
+            or anything which isn't a Token at all, including None.
+        """
+        unskippable = self.doc.controls.unskippable
+        source = self.source
+
+        while True:
+            if isinstance(token, (Control, yex.parse.Active)):
+                if token.identifier in unskippable:
+                    return token
+            elif isinstance(token, Internal) or \
+                    not isinstance(token, Token):
+                return token
+
+            if self._debugging:
+                logger.debug("%s: skipping %s in a false conditional",
+                        self, token)
+
+            token = next(source)
 
     def _next_at_executing_or_querying(self):
 
@@ -638,16 +763,18 @@ class Expander:
         while True:
             name = None
             item = self._source_for_next._next_at_reading_or_expanding()
-            logger.debug(
-                    "%s: considering %s for executing or querying",
-                    self, item)
+            if self._debugging:
+                logger.debug(
+                        "%s: considering %s for executing or querying",
+                        self, item)
 
             if isinstance(item, Control):
                 try:
                     v = self.doc[item.identifier]
-                    logger.debug(
-                            "%s:     -- ==%s (%s)",
-                            self, v, type(v))
+                    if self._debugging:
+                        logger.debug(
+                                "%s:     -- ==%s (%s)",
+                                self, v, type(v))
                     name = item
                     item = v
                 except KeyError:
@@ -660,17 +787,20 @@ class Expander:
                     # original item was an array. Otherwise it's the
                     # original item itself.
 
-                    logger.debug("%s:     -- a queryable control", self)
+                    if self._debugging:
+                        logger.debug("%s:     -- a queryable control", self)
 
                     result = item.query(tokens=self)
 
-                    logger.debug("%s:  -- == %s (%s); returning that",
-                            self, result, type(result))
+                    if self._debugging:
+                        logger.debug("%s:  -- == %s (%s); returning that",
+                                self, result, type(result))
                     return result
 
                 else:
 
-                    logger.debug("%s:     -- an executable control", self)
+                    if self._debugging:
+                        logger.debug("%s:     -- an executable control", self)
 
                     try:
                         received = item(
@@ -678,29 +808,36 @@ class Expander:
                                     on_eof="none"),
                                 )
                     except yex.exception.YexError as ye:
-                        logger.debug("%s:       -- it raised %s",
-                                self, ye.__class__.__name__)
+                        if self._debugging:
+                            logger.debug("%s:       -- it raised %s",
+                                    self, ye.__class__.__name__)
                         if item.is_queryable:
                             ye.mark_as_possible_rvalue(item)
                         raise
 
                 if received is not None:
-                    logger.debug(
-                            '%s:   -- received: %s; returning that directly',
-                            self, received)
+                    if self._debugging:
+                        logger.debug(
+                                ('%s:   -- received: %s; '
+                                'returning that directly'),
+                                self, received)
                     return received
 
-                logger.debug("%s: done calling %s; going round again",
-                        self, item)
+                if self._debugging:
+                    logger.debug("%s: done calling %s; going round again",
+                            self, item)
 
             elif self.doc.ifdepth[-1]:
-                logger.debug("%s:     -- not a control; returning it", self)
+                if self._debugging:
+                    logger.debug("%s:     -- not a control; returning it",
+                            self)
                 return item
 
             else:
-                logger.debug((
-                    "%s:     -- not a control; not returning it, "
-                    "because we're in a False conditional"), self)
+                if self._debugging:
+                    logger.debug((
+                        "%s:     -- not a control; not returning it, "
+                        "because we're in a False conditional"), self)
 
                 # and round we go again
 
@@ -733,6 +870,20 @@ class Expander:
         else:
             raise ValueError("can't set location without a source")
 
+    @property
+    def packed_location(self):
+        """
+        Like `location`, but packed into an int. See
+        `Tokeniser.packed_location`.
+
+        Returns:
+            `int`, or None if we don't know.
+        """
+        if self.source:
+            return self.source.packed_location
+        else:
+            return None
+
     @property
     def is_expanding(self):
         r"""
@@ -780,7 +931,8 @@ class Expander:
                 If this is a string, or specifically a list, it
                 will be split into its members and pushed in reverse order.
                 For example, pushing 'cat' is the same as pushing 't',
-                then pushing 'a', then pushing 'c'.
+                then pushing 'a', then pushing 'c'. A `Segment` works
+                like a list, but is much cheaper to push if it's long.
 
             clean_char_tokens (`bool`): if True, all bare characters
                 will be converted to the Tokens for those characters.s
@@ -816,7 +968,7 @@ class Expander:
         if self.on_push is not None:
             self.on_push(tokens=self, thing=thing, is_result=is_result)
 
-        if not isinstance(thing, (str, list)):
+        if not isinstance(thing, (str, list, yex.parse.Segment)):
             thing = [thing]
 
         if clean_char_tokens:
@@ -825,7 +977,6 @@ class Expander:
                 if isinstance(c, str):
                     return Token.get(
                             ch=c,
-                            location=self.source.location,
                             )
                 else:
                     return c
@@ -836,10 +987,11 @@ class Expander:
 
         if self._bounded_limit is not None:
             if self.pushback.group_depth < self._bounded_limit:
-                logger.debug(
-                        '%s: group_depth is %d, but bounded_limit is %d',
-                        self, self.pushback.group_depth,
-                        self._bounded_limit)
+                if self._debugging:
+                    logger.debug(
+                            '%s: group_depth is %d, but bounded_limit is %d',
+                            self, self.pushback.group_depth,
+                            self._bounded_limit)
                 raise yex.exception.GoneBeforeTheBeginningError()
 
     def eat_optional_spaces(self, level='deep'):
@@ -1,4 +1,23 @@
+# Sources find out where they are for every character they read,
+# but hardly anyone ever asks. So they keep their positions as packed
+# integers, and we only turn them into Locations when we must.
+# A packed location holds a filename ID, a line, and a column, each in
+# its own bit field; the IDs are handed out by Location.filename_id().
+PACKED_FIELD_BITS = 32
+PACKED_FIELD_MASK = (1<<PACKED_FIELD_BITS)-1
+
 class Location:
+    r"""
+    Where something is in the input.
+
+    Attributes:
+        filename (`str`): the name of the file.
+        line (`int`): the line number, counting from 1.
+        column (`int`): the column number.
+    """
+
+    _filenames = []
+    _filename_ids = {}
 
     def __init__(self,
             filename, line, column):
@@ -48,6 +67,80 @@ class Location:
                 self._line==other._line and \
                 self._column==other._column
 
+    @classmethod
+    def filename_id(cls, filename):
+        r"""
+        Returns a number standing for a filename, for use with `pack()`.
+
+        The same filename always gets the same number.
+
+        Args:
+            filename (`str` or `None`): the filename
+
+        Returns:
+            `int`
+        """
+        try:
+            return cls._filename_ids[filename]
+        except KeyError:
+            result = len(cls._filenames)
+            cls._filenames.append(filename)
+            cls._filename_ids[filename] = result
+            return result
+
+    @staticmethod
+    def pack(filename_id, line, column):
+        r"""
+        Packs a position into an integer.
+
+        Args:
+            filename_id (`int`): the result of `filename_id()`
+            line (`int`): the line number
+            column (`int`): the column number
+
+        Returns:
+            `int`, which you can pass to `from_packed()` to get
+                a Location.
+        """
+        return (
+                (((filename_id << PACKED_FIELD_BITS) | line)
+                    << PACKED_FIELD_BITS) | column)
+
+    def packed(self):
+        r"""
+        Packs this Location into an integer, as `pack()` does.
+
+        Returns:
+            `int`
+        """
+        return self.pack(
+                self.filename_id(self._filename),
+                self._line or 0,
+                self._column or 0,
+                )
+
+    @classmethod
+    def from_packed(cls, packed):
+        r"""
+        Creates a Location from the result of `pack()`.
+
+        Args:
+            packed (`int`): the packed location
+
+        Returns:
+            `Location`
+        """
+        column = packed & PACKED_FIELD_MASK
+        packed >>= PACKED_FIELD_BITS
+        line = packed & PACKED_FIELD_MASK
+        filename_id = packed >> PACKED_FIELD_BITS
+
+        return cls(
+                filename = cls._filenames[filename_id],
+                line = line,
+                column = column,
+                )
+
     @classmethod
     def _parse_serial(cls, serial):
         filename, line, column = serial.split(':')
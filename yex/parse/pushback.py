@@ -3,6 +3,93 @@ import yex.parse.token
 
 logger = logging.getLogger('yex.general')
 
+class Segment:
+    """
+    A sequence of items to be pushed back all at once.
+
+    Pushing a Segment costs the same however long it is: the Pushback
+    doesn't copy the items, but reads through them as they're popped.
+    The change in group depth is worked out when the Segment is created,
+    so if you push the same Segment many times, you only pay for that once.
+
+    Because the items aren't copied, you mustn't change them while
+    the Segment is in a Pushback.
+
+    Attributes:
+        items (list): the items. None is not allowed.
+        group_delta (int): the number of BeginningGroup tokens in `items`,
+            less the number of EndGroup tokens. That is, how much the group
+            depth changes when all the items have been read.
+        locations (list, or None): if this isn't None, it's in step with
+            `items`, and says where each item came from: a packed
+            Location, or None to let the item speak for itself.
+            This is for shared tokens, which can't know their own
+            locations. When an item is popped, its location is
+            available as `Pushback.popped_location`.
+    """
+
+    __slots__ = ('items', 'group_delta', 'locations')
+
+    def __init__(self, items, group_delta=None, locations=None):
+        self.items = items
+        self.locations = locations
+
+        if group_delta is None:
+            group_delta = self.group_delta_of(items)
+
+        self.group_delta = group_delta
+
+    @staticmethod
+    def group_delta_of(items):
+        """
+        Works out how much reading some items changes the group depth.
+
+        Args:
+            items (iterable): the items
+
+        Returns:
+            `int`. See `group_delta` in the class docstring.
+        """
+        result = 0
+        for item in items:
+            if isinstance(item, yex.parse.Token):
+                category = item.category
+                if category==yex.parse.Token.BEGINNING_GROUP:
+                    result += 1
+                elif category==yex.parse.Token.END_GROUP:
+                    result -= 1
+
+        return result
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f'[segment;{self.group_delta};{self.items}]'
+
+class _Cursor:
+    """
+    How far a Pushback has read through a list of items.
+
+    Pushback.stack holds these for any list pushed back all at once.
+    They're never empty: as soon as the last item is popped, the cursor
+    is removed from the stack.
+    """
+
+    __slots__ = ('items', 'index', 'length', 'locations')
+
+    def __init__(self, items, locations=None):
+        self.items = items
+        self.index = 0
+        self.length = len(items)
+        self.locations = locations
+
+    def remaining(self):
+        return self.items[self.index:]
+
 class Pushback:
     """
     Stores items from a Tokeniser which have been pushed back.
@@ -18,21 +105,60 @@ class Pushback:
     Pushbacks also keep count of group depth.
 
     Attributes:
-        items (list of objects): the items stored. They will be returned
-            last in, first out. The next item to be returned is
-            the last one in the list.
+        stack (list): what's been pushed. Single items are stored as
+            themselves; lists and Segments are stored as one entry each,
+            which is read through as the items are popped.
+            The next item to be returned comes from the last entry.
+            If this is empty, there's nothing to pop. Don't change it
+            yourself: use push() and pop().
 
         group_depth (int): the level of nesting of groups.
+
+        popped_location (int or None): where the item which pop()
+            returned most recently came from, if it came from a Segment
+            which kept track of that. Otherwise, None.
     """
 
     def __init__(self):
-        self.items = []
+        self.stack = []
         self._group_depth = 0
+        self.popped_location = None
+
+        # Checked once, here, because push() and pop() run for almost
+        # every token, and most runs aren't tracing.
+        self._debugging = logger.isEnabledFor(logging.DEBUG)
 
     @property
     def group_depth(self):
         return self._group_depth
 
+    @property
+    def items(self):
+        """
+        All the items stored, as a list.
+
+        They will be returned last in, first out: the next item to be
+        returned is the last one in the list. This builds a new list
+        every time you ask, so it's meant for tests and debugging.
+        If you only want to know whether there are any items,
+        check `stack` instead.
+        """
+        result = list(self.pending())
+        result.reverse()
+        return result
+
+    def pending(self):
+        """
+        Yields the items stored, in the order they'll be popped.
+
+        Nothing is removed.
+        """
+        for entry in reversed(self.stack):
+            if entry.__class__ is _Cursor:
+                yield from entry.remaining()
+            else:
+                yield entry
+
     def push(self, thing):
         """
         Pushes back a token or a character (or anything else).
@@ -46,7 +172,8 @@ class Pushback:
         If you supply a list (not just any iterable!) the
         contents of the list will be pushed as if you'd
         pushed them individually. Multi-character strings
-        work similarly.
+        work similarly. So do Segments, except that we don't copy
+        their items or look through them for changes in group depth.
 
         Pushing None does nothing.
 
@@ -56,30 +183,57 @@ class Pushback:
             thing (anything): what to push.
         """
         if thing is None:
-            logger.debug("%s: not pushing back eof",
-                    self)
+            if self._debugging:
+                logger.debug("%s: not pushing back eof",
+                        self)
             return
 
-        if not isinstance(thing, (list, str)):
-            thing = [thing]
-        elif isinstance(thing, list):
-            thing = [x for x in thing if x is not None]
-
-        if not thing:
-            logger.debug("%s: nothing to push", self)
-            return
+        locations = None
 
-        for t in thing:
-            self.adjust_group_depth(t,
+        if isinstance(thing, Segment):
+            items = thing.items
+            group_delta = thing.group_delta
+            locations = thing.locations
+        elif isinstance(thing, str):
+            items = thing
+            group_delta = 0
+        elif isinstance(thing, list):
+            items = [x for x in thing if x is not None]
+            group_delta = Segment.group_delta_of(items)
+        else:
+            self.stack.append(thing)
+            self.adjust_group_depth(thing,
                     reverse=True,
                     why='on push',
                     )
 
-        self.items.extend(reversed([c for c in thing]))
+            if self._debugging:
+                logger.debug("%s: pushed: %s",
+                        self, thing)
+            return
+
+        if not items:
+            if self._debugging:
+                logger.debug("%s: nothing to push", self)
+            return
+
+        if isinstance(items, str):
+            self.stack.extend(reversed(items))
+        elif len(items)==1 and locations is None:
+            self.stack.append(items[0])
+        else:
+            self.stack.append(_Cursor(items, locations))
+
+        if group_delta:
+            self._group_depth -= group_delta
 
-        logger.debug("%s: pushed: %s",
-                self, thing)
+            if self._debugging:
+                logger.debug("%s: _group_depth %+d on push; now %s",
+                        self, -group_delta, self._group_depth)
 
+        if self._debugging:
+            logger.debug("%s: pushed: %s",
+                    self, thing)
 
     def pop(self):
         """
@@ -95,13 +249,35 @@ class Pushback:
             in any other circumstance.
         """
 
-        if self.items:
-            result = self.items.pop()
-            logger.debug("%s: popped: %s", self, repr(result))
+        stack = self.stack
+
+        if not stack:
+            self.popped_location = None
+            return None
 
-            return result
+        result = stack[-1]
 
-        return None
+        if result.__class__ is _Cursor:
+            cursor = result
+            index = cursor.index
+            result = cursor.items[index]
+
+            if cursor.locations is None:
+                self.popped_location = None
+            else:
+                self.popped_location = cursor.locations[index]
+
+            cursor.index = index+1
+            if cursor.index==cursor.length:
+                stack.pop()
+        else:
+            self.popped_location = None
+            stack.pop()
+
+        if self._debugging:
+            logger.debug("%s: popped: %s", self, repr(result))
+
+        return result
 
     def adjust_group_depth(self, c, why = '', reverse=False):
         """
@@ -139,12 +315,13 @@ class Pushback:
 
         self._group_depth += delta
 
-        where = f'{delta}'
-        if delta>0:
-            where = f'+{where}'
+        if self._debugging:
+            where = f'{delta}'
+            if delta>0:
+                where = f'+{where}'
 
-        logger.debug("%s: _group_depth %s %s; now %s",
-                self, where, why, self._group_depth)
+            logger.debug("%s: _group_depth %s %s; now %s",
+                    self, where, why, self._group_depth)
 
     def another(self):
         return self.__class__()
@@ -158,7 +335,7 @@ class Pushback:
         Raises:
             ValueError: if the checks fail.
         """
-        if self.items:
+        if self.stack:
             raise ValueError(
                     f'{self}: there are items still on the stack: '
                     f'{self.items}'
@@ -174,19 +351,19 @@ class Pushback:
         """
         Clears the pushback of items.
         """
-        if self.items:
+        if self.stack:
             logger.debug("%s: clearing; dropping %s", self, self.items)
         else:
             logger.debug("%s: clearing", self)
 
-        self.items = []
+        self.stack = []
 
     def __repr__(self):
         result = '[pushback;%04x' % (id(self) % 0xFFFF)
 
         try:
             result += f';{self._group_depth}'
-            if self.items:
+            if self.stack:
                 result += f';{self.items}'
         except:
             result += ';inchoate'
@@ -1,4 +1,5 @@
 import yex
+import collections
 import logging
 
 logger = logging.getLogger('yex.general')
@@ -8,6 +9,52 @@ NEWLINE = chr(13)
 
 SPIN_LIMIT = 1000
 
+# How many of the most recent lines a Source remembers, for error messages.
+LINE_WINDOW = 100
+
+class RecentLines:
+    r"""
+    The most recent lines which a Source has read.
+
+    You index this by line number, just as if it was a list of every
+    line so far. But only the last few lines are kept; asking for any line
+    older than that raises IndexError, just as asking for a line we haven't
+    read yet does. This means memory use stays flat however long the
+    input is.
+
+    Attributes:
+        size (int): the maximum number of lines we keep.
+    """
+
+    def __init__(self, size = LINE_WINDOW):
+        self.size = size
+        self._lines = collections.deque(maxlen=size)
+        self._count = 0
+
+    def append(self, line):
+        self._lines.append(line)
+        self._count += 1
+
+    def __getitem__(self, number):
+        if number<0:
+            number += self._count
+
+        first = self._count - len(self._lines)
+
+        if number<first or number>=self._count:
+            raise IndexError(number)
+
+        return self._lines[number-first]
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return '[RecentLines;%d of %d]' % (
+                len(self._lines),
+                self._count,
+                )
+
 class Source:
     def __init__(self,
             name = None):
@@ -20,9 +67,19 @@ class Source:
         self.exhaust_at_eol = False
         self.line_number_setter = None
 
+        # Checked once, here, so that reading each character doesn't
+        # have to pay for a logging call which is going to do nothing.
+        self._debugging = logger.isEnabledFor(logging.DEBUG)
+
         # Start with a dummy blank line, because lines in a file are
         # counted from 1.
-        self.lines = ['']
+        self.lines = RecentLines()
+        self.lines.append('')
+
+        # See packed_location, below.
+        self._filename_id = yex.parse.Location.filename_id(name)
+        self._packed_line = yex.parse.Location.pack(
+                self._filename_id, 0, 0)
 
         self._iterator = self._read()
 
@@ -54,8 +111,9 @@ class Source:
 
         result = self.current_line[self.column_number]
         self.column_number += 1
-        logger.debug("%s: returning %s",
-                self, repr(result))
+        if self._debugging:
+            logger.debug("%s: returning %s",
+                    self, repr(result))
         return result
 
     def _get_next_line(self):
@@ -73,6 +131,8 @@ class Source:
 
             if self.line_number is not None:
                 self.line_number += 1
+                self._packed_line = yex.parse.Location.pack(
+                        self._filename_id, self.line_number, 0)
                 if self.line_number_setter is not None:
                     self.line_number_setter(self.line_number)
 
@@ -104,6 +164,16 @@ class Source:
                 column = self.column_number or 0,
                 )
 
+    @property
+    def packed_location(self):
+        r"""
+        Like `location`, but packed into an int by `Location.pack()`.
+
+        This is much cheaper to find than `location`, so use it if you
+        need to remember a position but probably won't need to report it.
+        """
+        return self._packed_line | (self.column_number or 0)
+
     def _read(self):
         raise NotImplementedError()
 
@@ -129,7 +199,9 @@ class FileSource(Source):
     def _read(self):
         self.line_number = 0
 
-        for line in self.f.readlines():
+        # Iterating over the file, rather than calling readlines(),
+        # means we only hold one line of it at a time.
+        for line in self.f:
 
             logger.debug("%s read line: %s",
                     self, line)
@@ -34,6 +34,13 @@ class Token:
 
         location (Location, or None): where we found the character
             which we turned into this Token. Used for error messages.
+            This may be given as a Location packed into an int,
+            in which case we only unpack it when someone asks.
+            Tokens returned by `get()` without a location are shared
+            between everyone who asks for the same character and
+            category, so their location is always None. Anyone who
+            keeps such tokens, such as a Macro, must keep track of
+            where they came from for themselves.
 
     Specification of the serialisation format:
 
@@ -79,6 +86,11 @@ class Token:
 
     DISAPPEARS_AFTER_CONTROL = (SPACE, END_OF_LINE)
 
+    __slots__ = ('ch', '_location')
+
+    # Tokens made by get() with no location, keyed on (ch, category).
+    _interned = {}
+
     def __init__(self,
             ch,
             location = None):
@@ -87,7 +99,51 @@ class Token:
             raise yex.exception.ConstructorError()
 
         self.ch = ch
-        self.location = location
+        self._location = location
+
+    @property
+    def location(self):
+        if isinstance(self._location, int):
+            self._location = yex.parse.Location.from_packed(self._location)
+
+        return self._location
+
+    @location.setter
+    def location(self, v):
+        self._location = v
+
+    @property
+    def packed_location(self):
+        r"""
+        Like `location`, but packed into an int by `Location.pack()`.
+
+        Returns:
+            `int`, or None if we don't know.
+        """
+        result = getattr(self, '_location', None)
+
+        if isinstance(result, yex.parse.Location):
+            result = result.packed()
+
+        return result
+
+    def without_location(self):
+        r"""
+        Returns a token just like this one, but with no location.
+
+        For character tokens, this is the shared token which `get()`
+        returns. Tokens which already have no location return themselves.
+
+        Returns:
+            `Token`
+        """
+        if getattr(self, '_location', None) is None:
+            return self
+
+        return Token.get(
+                ch = self.ch,
+                category = self.category,
+                )
 
     @property
     def category(self):
@@ -171,7 +227,7 @@ class Token:
             See the docstring for this class for the format specification.
         """
 
-        defaults = yex.control.keyword.Catcode._default_contents()
+        defaults = yex.control.keyword.Catcode.defaults()
         result = []
 
         for item in tokens:
@@ -189,9 +245,6 @@ class Token:
 
             if isinstance(item, Control):
                 addendum = [ item.identifier ]
-                result.append( [
-                    item.identifier,
-                    ])
 
             elif isinstance(item, Argument):
                 addendum = f'#{item.ch}'
@@ -250,7 +303,7 @@ class Token:
             a list of Tokens, as represented by the "state" argument.
         """
 
-        defaults = yex.control.keyword.Catcode._default_contents()
+        defaults = yex.control.keyword.Catcode.defaults()
         result = []
 
         if isinstance(state, str):
@@ -295,10 +348,7 @@ class Token:
                                 ))
                 elif len(item)==1:
                     result.append(
-                            cls.get(
-                                category = cls.CONTROL,
-                                ch = item[0],
-                                ))
+                            Control.from_identifier(item[0]))
                 else:
                     raise ValueError(
                             'Lists representing Tokens must have '
@@ -333,7 +383,12 @@ class Token:
             location = None,
             ):
         r"""
-        Creates and returns a token.
+        Returns a token for the given character and category.
+
+        If you don't supply a location, the token may be one we've
+        handed out before: there's only ever one such token for each
+        pair of character and category. Tokens are immutable, so
+        this is safe, and it saves a lot of memory.
 
         Args:
             ch (`str`): The character represented by the token. Must be a
@@ -344,10 +399,25 @@ class Token:
                 If this is None, the category is 10 for spaces (ASCII 32)
                 and 10 for everything else.
                 This rule is from p213 of the TeXbook.
-            location (`yex.parse.Location` or `None`): the location
-                this token was read from.
+            location (`yex.parse.Location`, `int`, or `None`): the location
+                this token was read from, perhaps packed by
+                `Location.pack()`. If this isn't None, the
+                result will be a new Token.
         """
 
+        try:
+            shared = Token._interned[(ch, category)]
+        except KeyError:
+            pass
+        else:
+            if location is None:
+                return shared
+
+            return shared.__class__(
+                    ch = ch,
+                    location = location,
+                    )
+
         if ord(ch)<0 or ord(ch)>255:
             raise ValueError(
                     f"Codepoints must be between 0 and 255 (was {ord(ch)})")
@@ -370,11 +440,15 @@ class Token:
                 location = location
                 )
 
+        if location is None:
+            Token._interned[(ch, category)] = result
+
         return result
 
 class Escape(Token):
 
     _category = Token.ESCAPE
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -385,6 +459,7 @@ class BeginningGroup(Token):
     A character that begins groups. By default, this is {.
     """
     _category = Token.BEGINNING_GROUP
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -395,6 +470,7 @@ class EndGroup(Token):
     A character that ends groups. By default, this is }.
     """
     _category = Token.END_GROUP
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -407,6 +483,7 @@ class MathShift(Token):
     By default, this is $.
     """
     _category = Token.MATH_SHIFT
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -419,6 +496,7 @@ class AlignmentTab(Token):
     By default, this is &.
     """
     _category = Token.ALIGNMENT_TAB
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -435,6 +513,7 @@ class Parameter(Token):
     It can only appear in macro parameters or macro definitions.
     """
     _category = Token.PARAMETER
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -469,6 +548,7 @@ class Superscript(Token):
     By default, this is ^.
     """
     _category = Token.SUPERSCRIPT
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -481,6 +561,7 @@ class Subscript(Token):
     By default, this is _.
     """
     _category = Token.SUBSCRIPT
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -495,6 +576,7 @@ class Space(Token):
     We might also represent this as ␣.
     """
     _category = Token.SPACE
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -507,6 +589,7 @@ class Letter(Token):
     By default, this covers A to Z and a to z.
     """
     _category = Token.LETTER
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -519,6 +602,7 @@ class Other(Token):
     By default, this includes all punctuation and all digits.
     """
     _category = Token.OTHER
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -527,6 +611,7 @@ class Other(Token):
 class Active(Token):
 
     _category = Token.ACTIVE
+    __slots__ = ()
 
     @property
     def meaning(self):
@@ -542,6 +627,7 @@ class Active(Token):
 class Control(Token):
 
     _category = Token.CONTROL
+    __slots__ = ('name', 'doc')
 
     def __init__(self, name,
             doc,
@@ -551,6 +637,10 @@ class Control(Token):
         self.doc = doc
         self.location = location
 
+    def without_location(self):
+        # Controls aren't shared, so there's nothing to gain.
+        return self
+
     def __str__(self):
         return self.identifier
 
@@ -572,6 +662,29 @@ class Control(Token):
     def __repr__(self):
         return self.identifier
 
+    @classmethod
+    def from_identifier(cls, identifier):
+        r"""
+        Makes a Control from its identifier; the reverse of `identifier`.
+
+        Args:
+            identifier (`str`): the identifier, such as ``\wombat``
+                or ``\^M``.
+
+        Returns:
+            `Control`. It belongs to no Document, and has no location.
+        """
+        name = identifier[1:]
+
+        if len(name)==2 and name[0]=='^':
+            name = chr(ord(name[1])-64)
+
+        return cls(
+                name = name,
+                doc = None,
+                location = None,
+                )
+
 class Internal(Token):
     """
     Special tokens which are part of yex's infrastructure.
@@ -581,6 +694,7 @@ class Internal(Token):
     """
 
     _category = Token.INTERNAL
+    __slots__ = ()
 
     def __init__(self, *args):
         self.ch = self.identifier
@@ -607,6 +721,7 @@ class Paragraph(Token):
     """
 
     _category = Token.PARAGRAPH
+    __slots__ = ()
 
     def __init__(self, *args):
         self.ch = self.identifier
@@ -623,6 +738,7 @@ class Paragraph(Token):
 
 class Argument(Token):
     _category = Token.ARGUMENT
+    __slots__ = ()
 
     @property
     def index(self):
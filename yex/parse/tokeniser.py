@@ -16,6 +16,24 @@ class Tokeniser:
     MIDDLE_OF_LINE = 'M'
     SKIPPING_BLANKS = 'S'
 
+    # Categories which _read() can turn straight into tokens.
+    SIMPLE_CATEGORIES = frozenset([
+        Token.BEGINNING_GROUP,
+        Token.END_GROUP,
+        Token.MATH_SHIFT,
+        Token.ALIGNMENT_TAB,
+        Token.PARAMETER,
+        Token.SUBSCRIPT,
+        Token.LETTER,
+        Token.OTHER,
+        Token.ACTIVE,
+        ])
+
+    GROUPING_CATEGORIES = frozenset([
+        Token.BEGINNING_GROUP,
+        Token.END_GROUP,
+        ])
+
     # Set with setattr() in __init__(); we define it here for the
     # benefit of anything trying to interpret the code automatically.
     push = None
@@ -30,6 +48,15 @@ class Tokeniser:
 
         self.line_status = self.BEGINNING_OF_LINE
 
+        # Categories of the source's current line; see _classify_line().
+        self._categories = None
+        self._classified_line = None
+        self._classified_changes = None
+
+        # Checked once, here, rather than for every character we read.
+        # If you want tracing, turn it on before you create us.
+        self._debugging = logger.isEnabledFor(logging.DEBUG)
+
         self.pushback = pushback or yex.parse.Pushback()
 
         setattr(self,
@@ -63,11 +90,15 @@ class Tokeniser:
         # For convenience, we allow direct access to some of
         # the source's methods.
         for name in [
-                'location',
                 'exhaust_at_eol',
                 ]:
             setattr(self, name, getattr(self.source, name))
 
+        # Where the most recent token came from. This is either a
+        # Location, or a Location packed into an int, or None.
+        # See the "location" property.
+        self._location = self.source.packed_location
+
         self.source.line_number_setter = doc.get(
                 field = r'\inputlineno',
                 param_control = True,
@@ -82,14 +113,82 @@ class Tokeniser:
     def __iter__(self):
         return self
 
+    @property
+    def location(self):
+        r"""
+        Where the most recent token came from.
+
+        We keep track of this for every token, but it's only rarely
+        needed, so we only build the Location when you ask.
+
+        Returns:
+            `Location`, or None if we don't know.
+        """
+        if isinstance(self._location, int):
+            self._location = yex.parse.Location.from_packed(self._location)
+
+        return self._location
+
+    @location.setter
+    def location(self, v):
+        self._location = v
+
+    @property
+    def packed_location(self):
+        r"""
+        Like `location`, but packed into an int by `Location.pack()`.
+
+        This is cheaper than `location` if you need to remember
+        where we are but probably won't need to report it.
+        You can set `location` to the result.
+
+        Returns:
+            `int`, or None if we don't know.
+        """
+        result = self._location
+
+        if isinstance(result, yex.parse.Location):
+            result = result.packed()
+
+        return result
+
     def __next__(self):
         result = next(self._iterator)
-        try:
-            self.location = result.location
-        except AttributeError:
-            pass
+
+        # Tokens which know where they came from tell us here.
+        # Shared tokens don't, but if they were pushed back in a Segment
+        # which kept track of their locations, the Pushback knows.
+        location = getattr(result, '_location', None)
+        if location is None:
+            location = self.pushback.popped_location
+        if location is not None:
+            self._location = location
+
         return result
 
+    def _classify_line(self, line):
+        """
+        Finds the categories of all the characters in `line` at once.
+
+        The results go into self._categories, which is None if `line`
+        can't be classified this way (for example, if it's a list).
+        They're only good while `line` is still the source's current line,
+        and nobody has changed any catcodes, so we note both.
+
+        Args:
+            line (str): the line.
+
+        Returns:
+            `None`.
+        """
+        if isinstance(line, str):
+            self._categories = self.catcodes.categories_of(line)
+        else:
+            self._categories = None
+
+        self._classified_line = line
+        self._classified_changes = self.catcodes.changes
+
     def _get_catcode(self, c):
         if not isinstance(c, str):
             return None
@@ -122,44 +221,101 @@ class Tokeniser:
     def _read(self):
         # See p46ff of the TeXbook for this algorithm.
 
-        logger.debug("%s: tokeniser ready",
-                self)
+        if self._debugging:
+            logger.debug("%s: tokeniser ready",
+                    self)
+
+        source = self.source
+        pushback = self.pushback
+        by_category = Token.by_category
+
+        while True:
+
+            # While nothing's been pushed back, we can take characters
+            # straight from the source's current line, using categories
+            # worked out for the whole line at once. Anything unusual
+            # goes round the long way, below.
+            while not pushback.stack:
+
+                line = source.current_line
+                if line is not self._classified_line or \
+                        self.catcodes.changes!=self._classified_changes:
+                    self._classify_line(line)
+
+                column = source.column_number
+                if self._categories is None or column is None or \
+                        column>=len(self._categories):
+                    break
+
+                category = self._categories[column]
+
+                if category in self.SIMPLE_CATEGORIES:
+                    source.column_number = column+1
+
+                    # Every token gets a new object here, because
+                    # it has its own location; so we needn't ask get().
+                    self._location = source.packed_location
+                    new_token = by_category[category](
+                        line[column], self._location)
+
+                    if self._debugging:
+                        logger.debug("%s:   -- yield %s (from line)",
+                                self, new_token)
+
+                    if category in self.GROUPING_CATEGORIES:
+                        pushback.adjust_group_depth(c=new_token,
+                                why = 'tokenised',
+                                )
+
+                    yield new_token
+
+                    self.line_status = self.MIDDLE_OF_LINE
+
+                elif category==Token.SPACE:
+                    source.column_number = column+1
+
+                    if self.line_status==self.MIDDLE_OF_LINE:
+                        self._location = source.packed_location
+                        yield Token.get(
+                                ch = chr(32), # in spec
+                                category = Token.SPACE,
+                                location = self._location,
+                                )
+                        self.line_status = self.SKIPPING_BLANKS
+
+                else:
+                    break
 
-        for c in self.incoming: # never exhausts
+            c = next(self.incoming) # never exhausts
 
             if not isinstance(c, str):
-                logger.debug(
-                        "%s: received %s (which is %s); passing it through",
-                        self, repr(c), c.__class__.__name__)
+                if self._debugging:
+                    logger.debug(
+                            ("%s: received %s (which is %s); "
+                            "passing it through"),
+                            self, repr(c), c.__class__.__name__)
 
                 yield c
                 continue
 
             category = self._get_catcode(c)
 
-            logger.debug("%s: received %s, %s",
-                    self, repr(c), category)
-
-            if category in (
-                    Token.BEGINNING_GROUP,
-                    Token.END_GROUP,
-                    Token.MATH_SHIFT,
-                    Token.ALIGNMENT_TAB,
-                    Token.PARAMETER,
-                    Token.SUBSCRIPT,
-                    Token.LETTER,
-                    Token.OTHER,
-                    Token.ACTIVE,
-                    ):
+            if self._debugging:
+                logger.debug("%s: received %s, %s",
+                        self, repr(c), category)
 
+            if category in self.SIMPLE_CATEGORIES:
+
+                self._location = self.source.packed_location
                 new_token = Token.get(
                     ch = c,
                     category = category,
-                    location = self.source.location,
+                    location = self._location,
                     )
 
-                logger.debug("%s:   -- yield %s",
-                        self, new_token)
+                if self._debugging:
+                    logger.debug("%s:   -- yield %s",
+                            self, new_token)
 
                 self.pushback.adjust_group_depth(c=new_token,
                         why = 'tokenised',
@@ -172,8 +328,9 @@ class Tokeniser:
             elif category==Token.END_OF_LINE:
 
                 if self.line_status==self.BEGINNING_OF_LINE:
-                    logger.debug("%s:   -- paragraph break",
-                            self)
+                    if self._debugging:
+                        logger.debug("%s:   -- paragraph break",
+                                self)
 
                     yield Control(
                             name = 'par',
@@ -182,17 +339,20 @@ class Tokeniser:
                             )
 
                 elif self.line_status==self.MIDDLE_OF_LINE:
-                    logger.debug("%s:   -- EOL, treated as space",
-                            self)
+                    if self._debugging:
+                        logger.debug("%s:   -- EOL, treated as space",
+                                self)
 
+                    self._location = self.source.packed_location
                     yield Token.get(
                             ch = chr(32),
                             category = Token.SPACE,
-                            location = self.source.location,
+                            location = self._location,
                             )
                 else:
-                    logger.debug("%s:   -- ignored",
-                            self)
+                    if self._debugging:
+                        logger.debug("%s:   -- ignored",
+                                self)
 
                 self.source.discard_rest_of_line()
                 self.line_status = self.BEGINNING_OF_LINE
@@ -200,29 +360,34 @@ class Tokeniser:
             elif category==Token.SPACE:
 
                 if self.line_status==self.MIDDLE_OF_LINE:
-                    logger.debug("%s:   -- space",
-                            self)
+                    if self._debugging:
+                        logger.debug("%s:   -- space",
+                                self)
 
+                    self._location = self.source.packed_location
                     yield Token.get(
                             ch = chr(32), # in spec
                             category = Token.SPACE,
-                            location = self.source.location,
+                            location = self._location,
                             )
                     self.line_status = self.SKIPPING_BLANKS
                 else:
-                    logger.debug("%s:   -- ignored",
-                            self)
+                    if self._debugging:
+                        logger.debug("%s:   -- ignored",
+                                self)
 
             elif category==Token.ESCAPE:
 
-                logger.debug("%s:   -- first char of escape: %s, %s",
-                        self, repr(c), category)
+                if self._debugging:
+                    logger.debug("%s:   -- first char of escape: %s, %s",
+                            self, repr(c), category)
 
                 name = ''
                 for c2 in self.incoming:
                     category2 = self._get_catcode(c2)
-                    logger.debug("%s:   -- and %s, %s",
-                            self, repr(c2), category2)
+                    if self._debugging:
+                        logger.debug("%s:   -- and %s, %s",
+                                self, repr(c2), category2)
 
                     if category2 in (None, Token.END_OF_LINE) and name=='':
                         break
@@ -244,8 +409,9 @@ class Tokeniser:
                     self.push([c2])
                     self.line_status = self.SKIPPING_BLANKS
 
-                logger.debug("%s:     -- so the control is named %s",
-                        self, name)
+                if self._debugging:
+                    logger.debug("%s:     -- so the control is named %s",
+                            self, name)
 
                 new_token = Control(
                         name = name,
@@ -253,8 +419,9 @@ class Tokeniser:
                         location = location,
                         )
 
-                logger.debug("%s:     -- producing %s - %s",
-                        self, new_token, type(new_token))
+                if self._debugging:
+                    logger.debug("%s:     -- producing %s - %s",
+                            self, new_token, type(new_token))
 
                 yield new_token
 
@@ -267,19 +434,22 @@ class Tokeniser:
                 self.line_status = self.MIDDLE_OF_LINE
 
             elif category==Token.INVALID:
-                logger.debug("%s:   -- invalid",
-                        self)
+                if self._debugging:
+                    logger.debug("%s:   -- invalid",
+                            self)
 
                 logger.warning("Invalid character found: %s",
                         repr(c))
 
             elif category==Token.IGNORED:
-                logger.debug("%s:   -- ignored",
-                        self)
+                if self._debugging:
+                    logger.debug("%s:   -- ignored",
+                            self)
 
             else:
-                logger.debug("%s:   -- unknown!",
-                        self)
+                if self._debugging:
+                    logger.debug("%s:   -- unknown!",
+                            self)
                 raise yex.exception.UnknownCategoryError(
                         ch = c,
                         category = category,
@@ -300,13 +470,15 @@ class Tokeniser:
             if (c is None):
                 return
             elif (self._get_catcode(c) not in Token.DISAPPEARS_AFTER_CONTROL):
-                logger.debug("%s: not whitespace, pushing back: %s",
-                        self, c);
+                if self._debugging:
+                    logger.debug("%s: not whitespace, pushing back: %s",
+                            self, c);
                 self.push(c)
                 return
             else:
-                logger.debug("%s: whitespace after control; absorbing: %s",
-                        self, c);
+                if self._debugging:
+                    logger.debug("%s: whitespace after control; absorbing: %s",
+                            self, c);
 
     def _handle_caret(self, first):
         """
@@ -344,7 +516,6 @@ class Tokeniser:
                 self.push(Token.get(
                         ch = push_token,
                         category = Token.SUPERSCRIPT,
-                        location = self.source.location,
                         ))
 
             return push_token is not None
@@ -593,7 +764,7 @@ class Incoming:
             a Location, or None.
         """
 
-        for item in reversed(self.pushback.items):
+        for item in self.pushback.pending():
             try:
                 if not hasattr(item, 'location'):
                     continue
@@ -608,7 +779,7 @@ class Incoming:
         return self.source.location
 
     def __next__(self):
-        if self.pushback.items:
+        if self.pushback.stack:
             result = self.pushback.pop()
             self.pushback.adjust_group_depth(
                     result,
@@ -616,6 +787,7 @@ class Incoming:
                     )
         else:
             result = next(self.source)
+            self.pushback.popped_location = None
 
             self.pushback.adjust_group_depth(
                     result,
@@ -625,7 +797,7 @@ class Incoming:
         return result
 
     def __repr__(self):
-        if self.pushback.items:
+        if self.pushback.stack:
             return f'[incoming;source={self.source};pb={self.pushback.items}]'
         else:
             return f'[incoming;source={self.source}]'
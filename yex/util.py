@@ -105,6 +105,27 @@ def fraction_to_str(x, p):
         if x <= delta: break
     return s
 
+def serialise(value):
+    r"""
+    The serialised form of a value, as returned by its `__getstate__`.
+
+    Since Python 3.11, every object has a `__getstate__`, but on builtin
+    types such as `int` it returns None. So we don't ask those;
+    they're already serialised.
+
+    Args:
+        value (any): the value to serialise.
+
+    Returns:
+        the serialised form of `value`.
+    """
+    if isinstance(value, (int, float, str, list, dict)):
+        return value
+    elif hasattr(value, '__getstate__'):
+        return value.__getstate__()
+    else:
+        return value
+
 def screen_width(
         default = 80,
         ):
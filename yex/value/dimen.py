@@ -98,10 +98,17 @@ class Dimen(Value):
 
         super().__init__()
         self.unit_cls = unit_cls or self.__class__
+        self.infinity = 0
+
+        if type(length) is int and (unit=='sp' or
+                (length==0 and unit is None)):
+            # The commonest cases, which need no arithmetic.
+            self._value = length
+            return
+
         unit = unit or self.unit_cls.DISPLAY_UNIT
 
         self._value = float(length)
-        self.infinity = 0
 
         if isinstance(unit, int):
             self._value *= unit
@@ -146,6 +153,33 @@ class Dimen(Value):
 
         return result
 
+    @classmethod
+    def from_sp(cls, value,
+            infinity = 0,
+            unit_cls = None,
+            ):
+        """
+        Factory method: makes a Dimen from an integer number of sp.
+
+        This is much cheaper than the constructor, so it's what
+        layout code should use when it's been working in plain integers.
+
+        Args:
+            value (int): the length, in sp; or, if infinity is nonzero,
+                in fil, fill, or filll, multiplied by 65536.
+            infinity (int): as described for the attribute of this name.
+            unit_cls: as described for the attribute of this name.
+                If this is None, we use this class.
+
+        Returns:
+            a new Dimen.
+        """
+        result = cls.__new__(cls)
+        result._value = value
+        result.infinity = infinity
+        result.unit_cls = unit_cls or cls
+        return result
+
     @classmethod
     def from_tokens(cls,
             tokens,
@@ -15,6 +15,16 @@ class Glue(Value):
 
     The specifications for Glue may be found in ch12
     of the TeXbook, beginning on page 69.
+
+    Attributes:
+        sp (tuple of int): the glue as plain integers, for code
+            which does a lot of arithmetic with it. This is
+            (space, stretch, stretch infinity, shrink, shrink infinity);
+            the lengths are in sp, and the infinities are as in
+            `Dimen.infinity`.
+
+    The space, stretch, and shrink properties are Dimens, but they're
+    only made when someone first asks for them.
     """
 
     def __init__(self,
@@ -39,62 +49,70 @@ class Glue(Value):
         for infinities.
         """
 
-        args = locals()
-        def _to_dimen(arg, can_be_infinite):
-            length = args[arg]
-            unit = args[f'{arg}_unit']
+        space = _to_sp('space', space, space_unit, False)
+        stretch = _to_sp('stretch', stretch, stretch_unit, True)
+        shrink = _to_sp('shrink', shrink, shrink_unit, True)
 
-            if isinstance(length, Dimen):
-                if unit is not None:
-                    raise ValueError(
-                            f'"{arg}" was a Dimen, '
-                            f'but {arg}_unit was not None'
-                            )
+        self._set_sp(
+                (space[0],) + stretch + shrink,
+                )
 
-                if not can_be_infinite and length.infinity!=0:
-                    raise ValueError(
-                            f'"{arg}" must be finite'
-                            )
-                return Dimen.from_another(length)
-            else:
-                try:
-                    length = float(length)
-                except TypeError:
-                    raise ValueError(
-                            f'{arg}=={length} must be numeric or Dimen '
-                            f'(and not {type(length)})'
-                            )
+    def _set_sp(self, sp):
+        self.sp = sp
+        self._space = self._stretch = self._shrink = None
+
+    @classmethod
+    def from_another(cls, another):
+        result = cls.__new__(cls)
+        result._set_sp(another.sp)
+        return result
 
-                if can_be_infinite:
-                    inf = {'can_use_fil': True}
-                else:
-                    inf = {}
+    @classmethod
+    def from_sp(cls, space,
+            stretch = 0, stretch_infinity = 0,
+            shrink = 0, shrink_infinity = 0,
+            ):
+        """
+        Factory method: makes a Glue from integers.
 
-                return Dimen(
-                        float(length),
-                        unit = unit,
-                        **inf)
+        This is much cheaper than the constructor.
 
-        self._space   = _to_dimen('space',   False)
-        self._stretch = _to_dimen('stretch', True)
-        self._shrink  = _to_dimen('shrink',  True)
+        Args:
+            space (int): the space, in sp.
+            stretch (int): the stretch, in sp (or fil, etc, times 65536).
+            stretch_infinity (int): the infinity of the stretch; see
+                `Dimen.infinity`.
+            shrink (int): the shrink, in sp (or fil, etc, times 65536).
+            shrink_infinity (int): the infinity of the shrink.
 
-    @classmethod
-    def from_another(cls, another):
+        Returns:
+            a new Glue.
+        """
         result = cls.__new__(cls)
-        result._space = Dimen.from_another(another._space)
-        result._stretch = Dimen.from_another(another._stretch)
-        result._shrink = Dimen.from_another(another._shrink)
+        result._set_sp(
+                (space, stretch, stretch_infinity, shrink, shrink_infinity),
+                )
         return result
 
     @property
     def space(self):
+        if self._space is None:
+            self._space = Dimen.from_sp(self.sp[0],
+                    unit_cls = self._dimen_units())
         return self._space
+
     @property
     def stretch(self):
+        if self._stretch is None:
+            self._stretch = Dimen.from_sp(self.sp[1], self.sp[2],
+                    unit_cls = self._dimen_units())
         return self._stretch
+
     @property
     def shrink(self):
+        if self._shrink is None:
+            self._shrink = Dimen.from_sp(self.sp[3], self.sp[4],
+                    unit_cls = self._dimen_units())
         return self._shrink
 
     @classmethod
@@ -218,17 +236,17 @@ class Glue(Value):
         # is "Dimen; inchoate" which is confusing.
 
         try:
-            result = self._space.__repr__(
+            result = self.space.__repr__(
                     show_unit=show_unit,
                     )
 
-            if self._shrink.value or self._stretch.value:
-                result += ' plus ' + self._stretch.__repr__(
+            if self.sp[3] or self.sp[1]:
+                result += ' plus ' + self.stretch.__repr__(
                         show_unit=show_unit,
                         )
 
-                if self._shrink.value:
-                    result += ' minus ' + self._shrink.__repr__(
+                if self.sp[3]:
+                    result += ' minus ' + self.shrink.__repr__(
                             show_unit=show_unit,
                             )
 
@@ -246,12 +264,10 @@ class Glue(Value):
         if not isinstance(other, self.__class__):
             return False
 
-        return self._space==other._space and \
-                self._stretch==other._stretch and \
-                self._shrink==other._shrink
+        return self.sp==other.sp
 
     def __int__(self):
-        return int(self._space) # in sp
+        return int(self.space)
 
     @property
     def length(self):
@@ -299,7 +315,7 @@ class Glue(Value):
 
     def __setstate__(self, state):
 
-        if hasattr(self, '_value'):
+        if hasattr(self, 'sp'):
             raise yex.exception.AlreadyInitialisedError()
 
         logger.debug(
@@ -318,9 +334,9 @@ class Glue(Value):
                     self.__class__.__name__, id(self),
                     state[3:5],
                     )
-            self._shrink = Dimen.from_serial(state[3:5])
+            shrink = Dimen.from_serial(state[3:5])
         else:
-            self._shrink = Dimen()
+            shrink = Dimen()
 
         if len(state)>1:
             logger.debug(
@@ -328,9 +344,9 @@ class Glue(Value):
                     self.__class__.__name__, id(self),
                     state[1:3],
                     )
-            self._stretch = Dimen.from_serial(state[1:3])
+            stretch = Dimen.from_serial(state[1:3])
         else:
-            self._stretch = Dimen()
+            stretch = Dimen()
 
         logger.debug(
                 "%s %s: __setstate__: setting space: %s",
@@ -338,13 +354,61 @@ class Glue(Value):
                 state[0:1], # this is correct; _space always has infinity=0
                 )
 
-        self._space = Dimen.from_serial([ state[0], 0 ])
+        space = Dimen.from_serial([ state[0], 0 ])
 
-        unit_cls = self._dimen_units()
-        for thing in [self.space, self.stretch, self.shrink]:
-            thing.unit_cls = unit_cls
+        self._set_sp((
+            space.value,
+            stretch.value, stretch.infinity,
+            shrink.value, shrink.infinity,
+            ))
 
         logger.debug(
                 "%s %s: __setstate__: I'm back: %s",
                 self.__class__.__name__, id(self), self,
                 )
+
+def _to_sp(name, length, unit, can_be_infinite):
+    """
+    Converts an argument of Glue's constructor to integers.
+
+    Args:
+        name (str): the name of the argument, for error messages.
+        length (Dimen or numeric): the length.
+        unit (str or None): the unit of the length, if it's numeric.
+        can_be_infinite (bool): whether the length may be infinite.
+
+    Returns:
+        a tuple: (length in sp, infinity).
+    """
+
+    if isinstance(length, Dimen):
+        if unit is not None:
+            raise ValueError(
+                    f'"{name}" was a Dimen, '
+                    f'but {name}_unit was not None'
+                    )
+
+        if not can_be_infinite and length.infinity!=0:
+            raise ValueError(
+                    f'"{name}" must be finite'
+                    )
+        return (length.value, length.infinity)
+
+    if unit is None and length==0:
+        return (0, 0)
+
+    try:
+        length = float(length)
+    except TypeError:
+        raise ValueError(
+                f'{name}=={length} must be numeric or Dimen '
+                f'(and not {type(length)})'
+                )
+
+    result = Dimen(
+            length,
+            unit = unit,
+            can_use_fil = can_be_infinite,
+            )
+
+    return (result.value, result.infinity)
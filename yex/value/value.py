@@ -52,7 +52,7 @@ class Value:
         is_negative = False
         digits = ''
 
-        us = tokens.location
+        us = tokens
 
         for c in tokens.another(on_eof='raise', level='expanding'):
             logger.debug(
@@ -28,18 +28,19 @@ class Fitting:
         else:
             bp = None
 
-        def length_in_sp(d):
+        width = size
+
+        for x in line:
+            if isinstance(x, Leader):
+                continue
+
+            d = x.width
+
             if isinstance(d, yex.value.Dimen):
-                return d.value
-            elif d=='inherit':
-                return 0
-            else:
+                width -= d.value
+            elif d!='inherit':
                 raise TypeError(d)
 
-        width = size - sum([length_in_sp(x.width) for x in line
-            if not isinstance(x, Leader)
-            ])
-
         logger.debug(
                 'fitting to %s (with %s available for glue): %s',
                 size, width, pretty_list_dump(line))
@@ -78,16 +79,17 @@ class Fitting:
         self.is_infinite = False
         for i, leader in enumerate(self.line):
             if isinstance(leader, yex.box.Leader):
-                self.line[i] = leader.glue.space.value
+                self.line[i] = leader.glue.sp[0]
 
     def _stretch_or_shrink(self, shrinking):
 
+        # Indexes into Glue.sp of the change and its infinity.
         if shrinking:
-            change_in = lambda g: g.shrink
+            change, infinity = 3, 4
             direction = -1
             verb = 'shrink'
         else:
-            change_in = lambda g: g.stretch
+            change, infinity = 1, 2
             direction = 1
             verb = 'stretch'
 
@@ -95,12 +97,11 @@ class Fitting:
             '  -- glue width=%s, so it must %s by %s',
             self.glue_width, verb, self.difference)
 
-        max_infinity = max([change_in(g).infinity for g in self.line
-            if isinstance(g, yex.box.Leader)
-            ], default=0)
-        self.changeability = sum([change_in(g).value for g in self.line
-            if isinstance(g, yex.box.Leader)
-            and change_in(g).infinity==max_infinity])
+        glue = [leader.glue.sp for leader in self.glue]
+
+        max_infinity = max([g[infinity] for g in glue], default=0)
+        self.changeability = sum([g[change] for g in glue
+            if g[infinity]==max_infinity])
 
         self.is_infinite = (max_infinity!=0)
 
@@ -119,17 +120,14 @@ class Fitting:
             if max_infinity!=0:
                 self.glue_set += 'fi' + 'l'*max_infinity
 
-        for leader in self.line:
-            if not isinstance(leader, yex.box.Leader):
-                continue
+        for leader, g in zip(self.glue, glue):
 
             if id(leader) not in self.adjusted_widths:
-                g = leader.glue
 
                 self.adjusted_widths[id(leader)] = adjusted_width(
-                        space = g.space.value,
-                        change = change_in(g).value,
-                        change_infinity = change_in(g).infinity,
+                        space = g[0],
+                        change = g[change],
+                        change_infinity = g[infinity],
                         difference = self.difference,
                         changeability = self.changeability,
                         max_infinity = max_infinity,
@@ -149,17 +147,15 @@ class Fitting:
 
         if adjust_final_glue:
 
-            for i, leader in reversed(list(enumerate([
-                thing for thing in self.line
-                if isinstance(thing, yex.box.Leader)]))):
+            for i, leader in reversed(list(enumerate(self.glue))):
 
                 adjusted = self.spaces[i] + adjust_final_glue
+                g = leader.glue.sp
 
                 if (
                         not is_shrinking
                         or
-                        (adjusted >=
-                            leader.space.value-leader.shrink.value)
+                        (adjusted >= g[0]-g[3])
                         ):
 
                         self.spaces[i] = adjusted
@@ -245,7 +241,7 @@ class Fitting:
                     '   -- badness is %s', result)
             else:
                 overall_adjustment = abs(sum([
-                        self.spaces[i]-g.space.value
+                        self.spaces[i]-g.glue.sp[0]
                         for (i,g) in enumerate(self.glue)
                         ]))
                 result = round((overall_adjustment/self.changeability)**3 * 100)
@@ -290,7 +286,7 @@ class Fitting:
     @property
     @functools.cache
     def glue_width(self):
-        return sum([leader.glue.space.value for leader in self.glue])
+        return sum([leader.glue.sp[0] for leader in self.glue])
 
     def __repr__(self):
         return ('['
@@ -1,6 +1,5 @@
 import yex
 import logging
-from yex.wrap.fitting import Fitting
 from yex.util import fraction_to_str
 
 logger = logging.getLogger('yex.general')
@@ -11,9 +10,128 @@ MACHINE_INFINITY = 2**30-1
 
 TOPSKIP = r'\topskip'
 
+# Indexes into a running total. See _PageTotal.
+NATURAL = 0
+DEPTH = 1
+STRETCH = 2 # finite stretch; fil, fill and filll follow it
+SHRINK = 6
+
+FIL_NAMES = ['', 'fil', 'fill', 'filll']
+
+def badness(t, s):
+    r"""
+    Approximately 100(t/s)**3, as TeX calculates it.
+
+    This follows tex.web, section 108, so that our results agree with
+    TeX's to the unit.
+
+    Args:
+        t (int): the amount we need to stretch or shrink by, in sp.
+        s (int): the amount we're able to stretch or shrink by, in sp.
+
+    Returns:
+        the badness, no more than ten thousand.
+    """
+    if t==0:
+        return 0
+    elif s<=0:
+        return TEN_THOUSAND
+
+    if t<=7230584:
+        r = (t*297)//s
+    elif s>=1663497:
+        r = t//(s//297)
+    else:
+        r = t
+
+    if r>1290:
+        return TEN_THOUSAND
+
+    return (r*r*r+0o400000)//0o1000000
+
+def _sp(d):
+    if isinstance(d, yex.value.Dimen):
+        return d.value
+    else:
+        return 0
+
+class _PageTotal(tuple):
+    """
+    The sizes of everything on the page up to some point, in sp.
+
+    This is a tuple of:
+        - the natural height, including the depth of the last box;
+        - the depth of the last box;
+        - the finite stretch, then the stretch in fil, fill and filll;
+        - the shrink.
+
+    These are what tex.web calls page_so_far.
+    """
+
+    def __new__(cls, values=(0,)*7):
+        return super().__new__(cls, values)
+
+    def plus(self, item, maxdepth):
+        """
+        Returns the total after adding an item.
+
+        Args:
+            item (`Gismo`): the item to add.
+            maxdepth (`int`): the greatest depth the page can have, in sp.
+
+        Returns:
+            `_PageTotal`
+        """
+        result = list(self)
+
+        if isinstance(item, yex.box.Leader):
+            glue = item.glue
+            result[NATURAL] += _sp(item.height)
+            result[DEPTH] = 0
+            result[STRETCH+glue.stretch.infinity] += glue.stretch.value
+            result[SHRINK] += glue.shrink.value
+
+        elif isinstance(item, yex.box.Penalty):
+            return self
+
+        else:
+            depth = _sp(item.depth)
+            result[NATURAL] += _sp(item.height) + depth
+            result[DEPTH] = depth
+
+            if depth>maxdepth:
+                result[DEPTH] = maxdepth
+
+        return _PageTotal(result)
+
+    @property
+    def height(self):
+        """
+        The natural height, without the depth of the last box.
+        """
+        return self[NATURAL]-self[DEPTH]
+
+    def __str__(self):
+        result = fraction_to_str(self.height, 16)
+
+        for i, name in enumerate(FIL_NAMES):
+            if self[STRETCH+i]!=0:
+                result += (
+                        f' plus {fraction_to_str(self[STRETCH+i], 16)}'
+                        f'{name}')
+
+        if self[SHRINK]!=0:
+            result += f' minus {fraction_to_str(self[SHRINK], 16)}'
+
+        return result
+
 class Paragraphs:
     """
     A sequence of paragraphs, waiting to be broken up into pages.
+
+    We keep running totals of the sizes of the items as they arrive,
+    so that deciding whether to break at any point doesn't involve
+    looking back over the whole page.
     """
 
     def __init__(self, doc,
@@ -29,7 +147,8 @@ class Paragraphs:
         self.goal = doc.get(r'\vsize')
         self.maxdepth = doc.get(r'\maxdepth')
 
-        self.total_height = None
+        # self._totals[n] is the _PageTotal of self.items[:n].
+        self._totals = [_PageTotal()]
         self.best_so_far = None
         self._must_adjust_topskip = False
 
@@ -52,14 +171,14 @@ class Paragraphs:
 
         self._add_topskip()
 
-        self.total_height += item.height
-
         if not self.items and item.discardable:
             logger.debug(r"%s: item is discardable, so let's do so: %s",
                     self, item)
             return
 
         self.items.append(item)
+        self._totals.append(
+                self._totals[-1].plus(item, self.maxdepth.value))
         self._add_topskip()
 
         if isinstance(item, yex.box.Penalty):
@@ -147,7 +266,8 @@ class Paragraphs:
         Returns:
             None.
         """
-        badness = self._calculate_badness(items)
+        totals = self._totals[len(items)]
+        badness = self._calculate_badness(totals)
         insert_penalties = 0
 
         if insert_penalties>=TEN_THOUSAND:
@@ -177,7 +297,7 @@ class Paragraphs:
 
         self.trace.info(
                 '% '
-                f't={fraction_to_str(self.total_height.value, 16)} '
+                f't={totals} '
                 f'g={fraction_to_str(self.goal.value, 16)} '
                 f'b={maybe_infinite(badness)} '
                 f'p={penalty} '
@@ -197,25 +317,50 @@ class Paragraphs:
             logger.debug("%s:     -- let's use this", self)
             self.produce_page(self.items[:len(items)])
             self.items = self.items[len(items)+1:]
+            self._recalculate_totals()
             self.best_so_far = None
             self._add_topskip()
 
-    def _calculate_badness(self, items):
-        if self.total_height>self.goal:
-            return MACHINE_INFINITY
+    def _calculate_badness(self, totals):
+        r"""
+        Works out the badness of breaking the page at a particular place.
 
-        # XXX What is page_shrink?
+        This follows tex.web, section 1007.
 
-        fitting = Fitting.fit_to(
-                size = self.goal,
-                line = items,
-                horizontal = False,
-                )
+        Args:
+            totals (`_PageTotal`): the sizes of everything which
+                would go on the page.
+
+        Returns:
+            the badness, or MACHINE_INFINITY if the page would be
+            too full even after shrinking everything.
+        """
+        goal = self.goal.value
+        height = totals.height
+
+        if height<goal:
+            if any(totals[STRETCH+1:SHRINK]):
+                return 0
+
+            return badness(goal-height, totals[STRETCH])
 
-        if fitting.is_infinite:
+        elif height-goal>totals[SHRINK]:
             return MACHINE_INFINITY
-        else:
-            return fitting.badness
+
+        return badness(height-goal, totals[SHRINK])
+
+    def _recalculate_totals(self):
+        """
+        Works out self._totals from scratch.
+
+        We only need to do this when the start of the page changes,
+        so the list is usually short.
+        """
+        maxdepth = self.maxdepth.value
+        self._totals = [_PageTotal()]
+
+        for item in self.items:
+            self._totals.append(self._totals[-1].plus(item, maxdepth))
 
     def is_void(self):
         return len(self.items)==0
@@ -240,7 +385,7 @@ class Paragraphs:
 
             self.items = [topskip]
             self._must_adjust_topskip = True
-            self.total_height = topskip.height
+            self._recalculate_totals()
 
             self._consider_breaking(items=self.items)
 
@@ -269,14 +414,15 @@ class Paragraphs:
                     shrink = topskip.shrink,
                     stretch = topskip.stretch,
                     name = TOPSKIP,
+                    vertical = True,
                     )
 
-            self.total_height += new_leader_space - topskip.height
+            self._recalculate_totals()
 
             logger.debug((
                 r"%s: added new topskip %s of height %s; "
-                "total_height is now %s"),
-                self, self.items[0], new_leader_space, self.total_height)
+                "total is now %s"),
+                self, self.items[0], new_leader_space, self._totals[-1])
 
     def __len__(self):
         if self.items:
@@ -51,32 +51,45 @@ def wrap(items, doc):
     items[0].total_demerits = 0
 
     breakpoint_count = 1
-    starting_place = 0
+
+    # Indexes of the breakpoints which could begin the next line.
+    # See p98 of the TeXbook.
+    active = []
 
     for to_i, to_bp in enumerate(items[:-1]):
         if not isinstance(to_bp, Breakpoint):
             continue
 
+        if to_i==0:
+            active.append(to_i)
+            continue
+
         logger.debug("wrap: .... %18s to %4s (%10s)",
                 '', to_i, to_bp)
 
         possibles = []
+        still_active = []
 
-        for from_i, from_bp in list(
-                enumerate(items)
-                )[starting_place:to_i]:
+        for from_i in active:
 
-            if not isinstance(from_bp, Breakpoint):
-                continue
+            from_bp = items[from_i]
+            width = widths[from_bp.line_number]
 
-            if from_bp.total_demerits is None:
+            if subsequences.is_overfull(from_i, to_i, width=width):
+                # A line from here can only get longer from now on,
+                # so this breakpoint is no use to anyone else.
+                logger.debug(
+                        "wrap: from %4s (%10s) to %4s is overfull; "
+                        "deactivating", from_i, from_bp, to_i)
                 continue
 
+            still_active.append(from_i)
+
             logger.debug("wrap: from %4s (%10s), to %4s (%10s)",
                     from_i, from_bp, to_i, to_bp)
 
             found = subsequences.lookup(from_i, to_i,
-                    width = widths[from_bp.line_number])
+                    width = width)
 
             logger.debug("%s->%s has badness %s and decency %s",
                     from_i, to_i, found.badness, found.decency)
@@ -88,6 +101,8 @@ def wrap(items, doc):
                         (from_bp, found)
                         )
 
+        active = still_active
+
         if not possibles:
             continue
 
@@ -100,6 +115,8 @@ def wrap(items, doc):
         to_bp.number = breakpoint_count
         breakpoint_count += 1
 
+        active.append(to_i)
+
     # Starting with the last breakpoint...
     best_sequence = [ [x for x in items if isinstance(x, Breakpoint)][-1] ]
 
@@ -290,6 +307,78 @@ class Subsequence_Cache:
         self.items = items
         self.cache = {}
 
+        # Running totals, so we can tell whether a line is overfull
+        # without looking at everything in it. Each list has one more
+        # entry than self.items: entry i is the total of items[:i].
+        #
+        # widths:    the width of everything but the glue
+        # spaces:    the natural width of the glue
+        # shrinks:   how far the glue can shrink, ignoring infinite shrink
+        # infinite:  how many pieces of glue can shrink infinitely
+        self.widths = [0]
+        self.spaces = [0]
+        self.shrinks = [0]
+        self.infinite = [0]
+
+        for item in items:
+            width = space = shrink = infinite = 0
+
+            if isinstance(item, Leader):
+                space = item.glue.space.value
+                if item.shrink.infinity:
+                    infinite = 1
+                else:
+                    shrink = item.shrink.value
+            elif isinstance(item.width, yex.value.Dimen):
+                width = item.width.value
+
+            self.widths.append(self.widths[-1]+width)
+            self.spaces.append(self.spaces[-1]+space)
+            self.shrinks.append(self.shrinks[-1]+shrink)
+            self.infinite.append(self.infinite[-1]+infinite)
+
+        # next_kept[i] is the index of the first item at or after i
+        # which isn't discardable, or len(items) if there isn't one.
+        self.next_kept = [len(items)]*(len(items)+1)
+
+        for i in range(len(items)-1, -1, -1):
+            if items[i].discardable:
+                self.next_kept[i] = self.next_kept[i+1]
+            else:
+                self.next_kept[i] = i
+
+    def _line_start(self, left_bp, right_bp):
+        # Discardable items after a breakpoint vanish at the start of a line.
+        return min(self.next_kept[left_bp+1], right_bp)
+
+    def is_overfull(self, left_bp, right_bp, width):
+        """
+        Checks whether a line can't possibly shrink enough to fit.
+
+        This only uses running totals, so it's much cheaper than lookup().
+        If it returns True, lookup() would give the line a badness
+        of 1000000; if it returns False, you'll have to ask lookup().
+
+        Args:
+            left_bp (int): index of the breakpoint before the line
+            right_bp (int): index of the breakpoint at the end of the line
+            width (Dimen): the width to fit the line to
+
+        Returns:
+            bool
+        """
+        left = self._line_start(left_bp, right_bp)
+        right = right_bp+1
+
+        if self.infinite[right]!=self.infinite[left]:
+            return False
+
+        available = width.value - (self.widths[right]-self.widths[left])
+        narrowest = (self.spaces[right]-self.spaces[left]) - (
+                self.shrinks[right]-self.shrinks[left])
+
+        return narrowest > available
+
     def lookup(self, left_bp, right_bp, width):
 
         # This may become a string key later, when we cache things
@@ -301,10 +390,7 @@ class Subsequence_Cache:
         except KeyError:
             pass
 
-        left_bp += 1
-
-        while self.items[left_bp].discardable and left_bp<right_bp:
-            left_bp += 1
+        left_bp = self._line_start(left_bp, right_bp)
 
         subsequence = self.items[left_bp:right_bp+1]
 